@@ -1,39 +1,94 @@
 """
 챗봇 API 엔드포인트
 POST /api/chat
+POST /api/chat/stream (SSE - 검색 결과 먼저, 답변은 토큰 단위로 전송)
 """
 
-from fastapi import APIRouter, HTTPException
-from models.schemas import ChatRequest, ChatResponse, Place
-from services.openai_client import generate_with_openai
+from contextlib import aclosing
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from models.schemas import ChatRequest, ChatResponse, DaySchedule, Place
+from services.openai_client import generate_with_openai, stream_with_openai
 from services.prompt_engine import build_chat_prompt
-from services.rag_search import rag_search
+from services.rag_search import rag_search, extract_filter_from_query
+from services.place_store import get_place_store
+from services.sse import sse_event
 
 router = APIRouter()
 
+NEARBY_KEYWORDS = ("근처", "주변", "가까운")
+
+
+def find_nearby_from_schedule(
+    message: str,
+    schedule: list[DaySchedule] | None,
+    k: int = 5,
+    radius_km: float = 5.0,
+) -> list[Place]:
+    """"OO 근처 카페"처럼 일정 속 장소를 기준으로 한 질문이면 공간 인덱스로 주변 검색"""
+    if not schedule or not any(keyword in message for keyword in NEARBY_KEYWORDS):
+        return []
+
+    anchor = None
+    for day in schedule:
+        for place in day.places:
+            if place.name and place.name in message:
+                anchor = place
+    if anchor is None:
+        return []
+
+    store = get_place_store()
+    hits = store.nearby(
+        anchor.latitude,
+        anchor.longitude,
+        radius_km=radius_km,
+        k=k,
+        category=extract_filter_from_query(message).category,
+        exclude_ids=[anchor.placeId],
+    )
+    return store.places(row for row, _ in hits)
+
+
+async def prepare_chat(request: ChatRequest) -> tuple[list[Place], str, str, str]:
+    """RAG + 주변 검색 → (장소 목록, 검색 방법 표시, 시스템 프롬프트, 사용자 프롬프트)"""
+    message = request.message
+    schedule = request.schedule
+
+    # RAG 검색으로 관련 장소 찾기
+    search_results = await rag_search(
+        query=message,
+        top_k=5,
+        enable_query_expansion=True,
+    )
+
+    # 일정 장소 기준 주변 검색 결과를 우선 배치
+    nearby = find_nearby_from_schedule(message, schedule)
+    nearby_ids = {p.id for p in nearby}
+    places = (nearby + [r.place for r in search_results if r.place.id not in nearby_ids])[:5]
+
+    # 프롬프트 생성
+    system_prompt, user_prompt = build_chat_prompt(
+        message=message,
+        schedule=[s.model_dump() if hasattr(s, 'model_dump') else s for s in schedule] if schedule else None,
+        search_results=places,
+    )
+
+    # 검색 방법 표시
+    if nearby:
+        search_method = "📍 주변 검색"
+    elif search_results:
+        search_method = "🔍 AI 검색"
+    else:
+        search_method = "💬 일반 응답"
+
+    return places, search_method, system_prompt, user_prompt
+
 
 @router.post("/chat")
 async def chat(request: ChatRequest) -> ChatResponse:
     """대화형 장소 검색 및 추천"""
     try:
-        message = request.message
-        schedule = request.schedule
-
-        # RAG 검색으로 관련 장소 찾기
-        search_results = await rag_search(
-            query=message,
-            top_k=5,
-            enable_query_expansion=True,
-        )
-
-        places = [r.place for r in search_results]
-
-        # 프롬프트 생성
-        system_prompt, user_prompt = build_chat_prompt(
-            message=message,
-            schedule=[s.model_dump() if hasattr(s, 'model_dump') else s for s in schedule] if schedule else None,
-            search_results=places,
-        )
+        places, search_method, system_prompt, user_prompt = await prepare_chat(request)
 
         # OpenAI API 호출
         reply = await generate_with_openai(
@@ -43,12 +98,6 @@ async def chat(request: ChatRequest) -> ChatResponse:
             temperature=0.7,
         )
 
-        # 검색 방법 표시
-        if search_results:
-            search_method = "🔍 AI 검색"
-        else:
-            search_method = "💬 일반 응답"
-
         return ChatResponse(
             reply=f"{search_method}\n\n{reply}",
             places=places if places else None,
@@ -57,3 +106,50 @@ async def chat(request: ChatRequest) -> ChatResponse:
     except Exception as e:
         print(f"챗봇 오류: {e}")
         raise HTTPException(status_code=500, detail=f"응답 생성에 실패했습니다: {str(e)}")
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest, http_request: Request) -> StreamingResponse:
+    """대화형 장소 검색 및 추천 (스트리밍)
+
+    이벤트:
+    - places: 검색 직후 추천 장소 + 검색 방법 표시 (searchMethod)
+    - token: 답변 텍스트 조각 (text)
+    - done: 답변 완료
+    - error: 실패 사유 (detail)
+
+    클라이언트 연결이 끊기면 OpenAI 스트림을 닫아 생성 중단
+    """
+
+    async def events():
+        try:
+            places, search_method, system_prompt, user_prompt = await prepare_chat(request)
+            yield sse_event("places", {
+                "searchMethod": search_method,
+                "places": [p.model_dump() for p in places] if places else None,
+            })
+
+            # 중간에 빠져나가도 upstream 스트림을 바로 닫도록 aclosing
+            async with aclosing(stream_with_openai(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                max_tokens=1024,
+                temperature=0.7,
+            )) as tokens:
+                async for text in tokens:
+                    if await http_request.is_disconnected():
+                        print("챗봇 스트리밍 중단: 클라이언트 연결 종료")
+                        return
+                    yield sse_event("token", {"text": text})
+
+            yield sse_event("done", {})
+
+        except Exception as e:
+            print(f"챗봇 스트리밍 오류: {e}")
+            yield sse_event("error", {"detail": f"응답 생성에 실패했습니다: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
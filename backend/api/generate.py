@@ -1,32 +1,111 @@
 """
 일정 생성 API 엔드포인트
 POST /api/generate
+POST /api/generate/stream (SSE - 일자별 최적화 결과를 생성되는 대로 전송)
 """
 
-import json
+import os
+import asyncio
+from contextlib import aclosing
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from models.schemas import (
     GenerateRequest,
     TripPlan,
     Place,
-    DaySchedule,
     SchedulePlace,
-    CostBreakdown,
 )
-from services.openai_client import generate_json_with_openai
-from services.prompt_engine import build_system_prompt, build_user_prompt, get_season_context
-from services.route_optimizer import optimize_route, analyze_schedule_efficiency
-from services.rag_search import rag_search, load_places, SearchFilter
+from services.openai_client import generate_json_with_openai, stream_with_openai, parse_json_response
+from services.prompt_engine import (
+    build_system_prompt,
+    build_user_prompt,
+    get_season_context,
+    get_trip_dates,
+)
+from services.schedule_analytics import (
+    analyze_trip_task,
+    analyze_single_day,
+    new_costs,
+    summarize_trip,
+)
+from services.schedule_stream import ScheduleStreamParser
+from services.sse import sse_event
+from services.schedule_hydration import PlaceResolver, hydrate_day, hydrate_schedule
+from services.rag_search import rag_search, embed_query, SearchFilter
+from services.place_store import get_place_store
+from services.cache import TTLCache, SingleFlight
+from services.worker_pool import run_tasks_async
+from services.generation_cache import GENERATION_CACHE_ENABLED, get_generation_cache
 
 router = APIRouter()
 
+# 카테고리별 RAG 검색 타임아웃 (초) - 초과 시 로컬 선택으로 폴백
+RAG_CATEGORY_TIMEOUT = float(os.getenv("RAG_CATEGORY_TIMEOUT", "15"))
+
+# RAG 필터링 결과 캐시 (프로필 + 데이터 버전 키)
+RAG_FILTER_CACHE_ENABLED = os.getenv("RAG_FILTER_CACHE", "true").lower() == "true"
+rag_filter_cache = TTLCache(
+    max_size=int(os.getenv("RAG_FILTER_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("RAG_FILTER_CACHE_TTL", "3600")),
+)
+rag_filter_flight = SingleFlight()
+
+
+def build_trip_profile(input_data: dict, weather: list | None = None) -> tuple:
+    """RAG 필터링에 영향을 주는 입력만 정규화한 프로필 (캐시 키)"""
+    budget = input_data.get("budget", 500000)
+    budget_bucket = "저렴한" if budget < 300000 else "고급" if budget > 800000 else ""
+
+    rainy = bool(weather) and any(
+        w.get("condition") in ["비", "폭우"] for w in weather
+    )
+
+    return (
+        input_data.get("people", "커플"),
+        tuple(sorted(set(input_data.get("styles", [])))),
+        budget_bucket,
+        rainy,
+    )
+
 
 async def rag_filter_places(
     input_data: dict,
-    places: list[Place],
+    places: list[Place] | None = None,
     weather: list | None = None,
 ) -> list[Place]:
-    """RAG를 사용하여 관련 장소 필터링"""
+    """RAG를 사용하여 관련 장소 필터링 (places가 없으면 장소 저장소에서 폴백)
+
+    장소 저장소 기준 결과는 (프로필, 데이터 버전) 키로 캐싱
+    """
+    profile = build_trip_profile(input_data, weather)
+
+    # 요청에 장소 목록이 직접 들어온 경우는 캐싱하지 않음
+    if places is not None or not RAG_FILTER_CACHE_ENABLED:
+        filtered_places, _ = await search_profile_places(profile, places)
+        return filtered_places
+
+    key = (profile, get_place_store().version)
+    cached = rag_filter_cache.get(key)
+    if cached is not None:
+        print(f"RAG 필터링 캐시 hit: {len(cached)}개 장소")
+        return list(cached)
+
+    async def compute() -> list[Place]:
+        filtered_places, complete = await search_profile_places(profile, None)
+        # 폴백이 섞인 결과는 캐싱하지 않음
+        if complete:
+            rag_filter_cache.set(key, filtered_places)
+        return filtered_places
+
+    return list(await rag_filter_flight.do(key, compute))
+
+
+async def search_profile_places(
+    profile: tuple,
+    places: list[Place] | None = None,
+) -> tuple[list[Place], bool]:
+    """프로필 기반 카테고리별 RAG 검색 → (장소 목록, 전 카테고리 성공 여부)"""
+    people, styles, budget_context, rainy = profile
 
     # 인원 유형별 컨텍스트
     people_contexts = {
@@ -35,21 +114,13 @@ async def rag_filter_places(
         "친구": "즐거운 친구 여행 액티비티",
         "가족": "가족 여행 아이 동반",
     }
-    people_context = people_contexts.get(input_data.get("people", "커플"), "")
+    people_context = people_contexts.get(people, "")
 
     # 스타일 컨텍스트
-    style_context = " ".join(input_data.get("styles", []))
-
-    # 예산 컨텍스트
-    budget = input_data.get("budget", 500000)
-    budget_context = "저렴한" if budget < 300000 else "고급" if budget > 800000 else ""
+    style_context = " ".join(styles)
 
     # 날씨 컨텍스트
-    weather_context = ""
-    if weather:
-        rainy_days = [w for w in weather if w.get("condition") in ["비", "폭우"]]
-        if rainy_days:
-            weather_context = "실내 비 올 때"
+    weather_context = "실내 비 올 때" if rainy else ""
 
     # 카테고리별 RAG 검색
     category_queries = [
@@ -75,118 +146,196 @@ async def rag_filter_places(
         },
     ]
 
-    filtered_places: list[Place] = []
-    seen_ids: set[str] = set()
-
-    for cq in category_queries:
-        try:
-            results = await rag_search(
-                query=cq["query"],
-                top_k=cq["count"],
-                filter=SearchFilter(category=cq["category"]),
-                enable_query_expansion=True,
+    # 4개 카테고리 동시 검색 (카테고리별 타임아웃)
+    results = await asyncio.gather(
+        *[
+            asyncio.wait_for(
+                rag_search(
+                    query=cq["query"],
+                    top_k=cq["count"],
+                    filter=SearchFilter(category=cq["category"]),
+                    enable_query_expansion=True,
+                ),
+                timeout=RAG_CATEGORY_TIMEOUT,
             )
+            for cq in category_queries
+        ],
+        return_exceptions=True,
+    )
 
-            for r in results:
-                if r.place.id not in seen_ids:
-                    filtered_places.append(r.place)
-                    seen_ids.add(r.place.id)
+    # 카테고리 순서대로 병합 (중복 제거 순서 고정)
+    filtered_places: list[Place] = []
+    seen_ids: set[str] = set()
+    complete = True
 
-        except Exception as e:
-            print(f"RAG 검색 실패 ({cq['category']}): {e}")
+    for cq, result in zip(category_queries, results):
+        if isinstance(result, BaseException):
+            reason = "시간 초과" if isinstance(result, asyncio.TimeoutError) else result
+            print(f"RAG 검색 실패 ({cq['category']}): {reason}")
+            complete = False
             # 폴백: 해당 카테고리에서 랜덤 선택
-            category_places = [p for p in places if p.category == cq["category"]]
+            if places is not None:
+                category_places = [p for p in places if p.category == cq["category"]]
+            else:
+                store = get_place_store()
+                rows = store.rows_by_category.get(cq["category"], [])
+                category_places = store.places(rows[: cq["count"]])
             for p in category_places[: cq["count"]]:
                 if p.id not in seen_ids:
                     filtered_places.append(p)
                     seen_ids.add(p.id)
+            continue
+
+        for r in result:
+            if r.place.id not in seen_ids:
+                filtered_places.append(r.place)
+                seen_ids.add(r.place.id)
 
     print(f"RAG 필터링 완료: {len(filtered_places)}개 장소 선택")
-    return filtered_places
-
-
-def calculate_cost_breakdown(schedule: list[dict]) -> CostBreakdown:
-    """비용 breakdown 계산"""
-    breakdown = CostBreakdown()
-
-    for day in schedule:
-        for place in day.get("places", []):
-            cost = place.get("cost", 0)
-            category = place.get("category", "")
-
-            if category == "숙소":
-                breakdown.accommodation += cost
-            elif category == "맛집":
-                breakdown.food += cost
-            elif category == "관광지":
-                breakdown.activity += cost
-            elif category == "카페":
-                breakdown.cafe += cost
-            else:
-                breakdown.etc += cost
+    return filtered_places, complete
 
-    return breakdown
+
+async def build_generation_prompts(request: GenerateRequest) -> tuple[str, str]:
+    """RAG 장소 필터링 → (시스템 프롬프트, 사용자 프롬프트)"""
+    input_data = request.input
+
+    # RAG로 장소 필터링 (요청에 장소 목록이 없으면 장소 저장소 사용)
+    filtered_places = await rag_filter_places(
+        input_data.model_dump(),
+        request.places or None,
+    )
+
+    # 프롬프트 생성
+    season = get_season_context()
+    system_prompt = build_system_prompt(input_data, season)
+    user_prompt = build_user_prompt(input_data, filtered_places)
+    return system_prompt, user_prompt
+
+
+def redate_schedule(schedule: list[dict]) -> list[dict]:
+    """캐시된 LLM 일정의 날짜를 오늘 기준으로 다시 매김"""
+    dates = get_trip_dates(len(schedule))
+    return [
+        {**day, "date": date} if isinstance(day, dict) else day
+        for day, date in zip(schedule, dates)
+    ]
 
 
 @router.post("/generate")
 async def generate_trip(request: GenerateRequest) -> TripPlan:
-    """여행 일정 생성"""
+    """여행 일정 생성
+
+    장소 목록을 직접 보낸 요청이 아니면 일정 생성 캐시를 먼저 조회
+    (hit이면 LLM 호출 없이 날짜만 다시 매기고 동선 최적화/분석은 새로 수행)
+    """
     try:
         input_data = request.input
 
-        # 장소 데이터 로드
-        if request.places:
-            places = request.places
+        use_cache = GENERATION_CACHE_ENABLED and not request.places
+        if use_cache:
+            cache = get_generation_cache()
+            season = get_season_context()["season"]
+            version = get_place_store().version
+            schedule, hit = await cache.lookup(input_data, season, version, embed_query)
         else:
-            places = load_places()
-
-        # RAG로 장소 필터링
-        filtered_places = await rag_filter_places(
-            input_data.model_dump(),
-            places,
-        )
-
-        # 프롬프트 생성
-        season = get_season_context()
-        system_prompt = build_system_prompt(input_data, season)
-        user_prompt = build_user_prompt(input_data, filtered_places)
-
-        # OpenAI API 호출
-        result = await generate_json_with_openai(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            max_tokens=4096,
-        )
-
-        # 스케줄 추출
-        schedule = result.get("schedule", [])
-
-        # 동선 최적화
-        optimized_schedule = optimize_route(schedule, input_data.hasRentcar)
-
-        # 비용 계산
-        cost_breakdown = calculate_cost_breakdown(optimized_schedule)
-        total_cost = (
-            cost_breakdown.accommodation
-            + cost_breakdown.food
-            + cost_breakdown.activity
-            + cost_breakdown.cafe
-            + cost_breakdown.transport
-            + cost_breakdown.etc
-        )
-
-        # 효율성 분석
-        efficiency = analyze_schedule_efficiency(
-            optimized_schedule, input_data.hasRentcar
-        )
-
-        return TripPlan(
-            totalCost=total_cost,
-            costBreakdown=cost_breakdown,
-            schedule=[DaySchedule(**day) for day in optimized_schedule],
-            routeEfficiency=efficiency,
-        )
+            schedule, hit = None, "miss"
+
+        if schedule is not None:
+            print(f"일정 생성 캐시 {hit} hit")
+            schedule = redate_schedule(schedule)
+        else:
+            system_prompt, user_prompt = await build_generation_prompts(request)
+
+            # OpenAI API 호출
+            result = await generate_json_with_openai(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                max_tokens=4096,
+            )
+
+            # 스케줄 추출
+            schedule = result.get("schedule", [])
+            if use_cache:
+                await cache.store(input_data, season, version, schedule, embed_query)
+
+        # 장소 ID → 장소 저장소(또는 요청 장소 목록) 정보 채우기
+        schedule = hydrate_schedule(schedule, request.places or None)
+
+        # 동선 최적화 + 시간/비용/효율성 분석 (단일 패스, CPU 작업이므로 프로세스 풀에서)
+        (plan,) = await run_tasks_async(analyze_trip_task, [(schedule, input_data.hasRentcar)])
+        if isinstance(plan, BaseException):
+            raise plan
+
+        return plan
 
     except Exception as e:
         print(f"일정 생성 오류: {e}")
         raise HTTPException(status_code=500, detail=f"일정 생성에 실패했습니다: {str(e)}")
+
+
+@router.post("/generate/stream")
+async def generate_trip_stream(request: GenerateRequest) -> StreamingResponse:
+    """여행 일정 생성 (스트리밍)
+
+    이벤트:
+    - day: 생성이 끝난 일자부터 장소 정보 채움 + 동선 최적화 + 시간 계산된 DaySchedule
+    - summary: 전체 비용 / 효율성 (totalCost, costBreakdown, routeEfficiency)
+    - error: 실패 사유 (detail)
+
+    일자는 생성되는 대로 보내므로 일자 재배치는 하지 않음 (일자 안에서만 최적화)
+    """
+
+    async def events():
+        try:
+            input_data = request.input
+            system_prompt, user_prompt = await build_generation_prompts(request)
+
+            parser = ScheduleStreamParser()
+            resolver = PlaceResolver(request.places or None)
+            dates = get_trip_dates(input_data.days)
+            costs = new_costs()
+            days = []
+            efficiencies = []
+
+            async def emit(index: int, day: dict) -> str:
+                day = hydrate_day(day, resolver, dates[index] if index < len(dates) else None)
+                day_schedule, efficiency = await asyncio.to_thread(
+                    analyze_single_day, day, input_data.hasRentcar, costs
+                )
+                days.append(day_schedule)
+                efficiencies.append(efficiency)
+                return sse_event("day", day_schedule.model_dump())
+
+            # 중간에 빠져나가도(연결 종료/취소) upstream 스트림을 바로 닫도록 aclosing
+            async with aclosing(stream_with_openai(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                max_tokens=4096,
+            )) as chunks:
+                async for chunk in chunks:
+                    for index, day in parser.feed(chunk):
+                        yield await emit(index, day)
+
+            # 스트리밍 파서가 놓치거나 파싱하지 못한 일자만 전체 응답으로 보충
+            if parser.failed or not parser.finished:
+                schedule = parse_json_response(parser.text).get("schedule", [])
+                for index, day in enumerate(schedule):
+                    if index not in parser.emitted and isinstance(day, dict):
+                        yield await emit(index, day)
+
+            analytics = summarize_trip(days, efficiencies, costs)
+            yield sse_event("summary", {
+                "totalCost": analytics.total_cost,
+                "costBreakdown": analytics.cost_breakdown.model_dump(),
+                "routeEfficiency": analytics.route_efficiency,
+            })
+
+        except Exception as e:
+            print(f"일정 스트리밍 생성 오류: {e}")
+            yield sse_event("error", {"detail": f"일정 생성에 실패했습니다: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,57 @@
+"""
+일괄 동선 최적화 API 엔드포인트
+POST /api/optimize/batch
+"""
+
+import os
+import time
+from fastapi import APIRouter, HTTPException
+from models.schemas import (
+    OptimizeBatchRequest,
+    OptimizeBatchResponse,
+    OptimizeBatchResult,
+)
+from services.schedule_analytics import analyze_trip_task
+from services.worker_pool import run_tasks_async
+
+router = APIRouter()
+
+# 요청당 최대 일정 수
+OPTIMIZE_BATCH_MAX_PLANS = int(os.getenv("OPTIMIZE_BATCH_MAX_PLANS", "100"))
+
+
+@router.post("/optimize/batch")
+async def optimize_batch(request: OptimizeBatchRequest) -> OptimizeBatchResponse:
+    """여러 일정 동선 최적화 + 분석 (저장된 일정 재채점, A/B 일정 비교)
+
+    일정마다 프로세스 풀 작업 1개, 실패한 일정은 error로 반환
+    """
+    if len(request.plans) > OPTIMIZE_BATCH_MAX_PLANS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {OPTIMIZE_BATCH_MAX_PLANS}개 일정까지 최적화할 수 있습니다.",
+        )
+
+    started = time.perf_counter()
+    # 장소는 검증된 SchedulePlace 그대로 전달 (dict로 풀었다 다시 검증하지 않음)
+    tasks = [
+        (
+            [{"day": day.day, "date": day.date, "places": day.places} for day in plan.schedule],
+            plan.hasRentcar,
+        )
+        for plan in request.plans
+    ]
+    outputs = await run_tasks_async(analyze_trip_task, tasks)
+
+    results = []
+    for plan, output in zip(request.plans, outputs):
+        if isinstance(output, BaseException):
+            print(f"일괄 최적화 오류 ({plan.id}): {output}")
+            results.append(OptimizeBatchResult(id=plan.id, error=str(output)))
+        else:
+            results.append(OptimizeBatchResult(id=plan.id, plan=output))
+
+    return OptimizeBatchResponse(
+        results=results,
+        batchMs=round((time.perf_counter() - started) * 1000, 2),
+    )
@@ -0,0 +1,62 @@
+"""
+장소 조회 API 엔드포인트
+GET /api/places/nearby
+"""
+
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from models.schemas import NearbyPlace
+from services.place_store import get_place_store
+
+router = APIRouter()
+
+# 기준 좌표 허용 범위 (제주도 + 여유)
+LAT_RANGE = (32.8, 34.0)
+LNG_RANGE = (125.8, 127.3)
+
+
+@router.get("/places/nearby")
+async def nearby_places(
+    placeId: Optional[str] = Query(default=None, description="기준 장소 ID"),
+    lat: Optional[float] = Query(
+        default=None, ge=LAT_RANGE[0], le=LAT_RANGE[1], description="기준 위도"
+    ),
+    lng: Optional[float] = Query(
+        default=None, ge=LNG_RANGE[0], le=LNG_RANGE[1], description="기준 경도"
+    ),
+    radius: Optional[float] = Query(
+        default=None, gt=0, le=100, description="반경 (km, 반경 모드 기본 3km / kNN 모드 최대 거리)"
+    ),
+    k: Optional[int] = Query(default=None, ge=1, le=100, description="kNN 개수"),
+    category: Optional[str] = Query(default=None),
+    minRating: Optional[float] = Query(default=None, ge=0, le=5),
+    exclude: Optional[str] = Query(default=None, description="제외할 장소 ID (쉼표 구분)"),
+    limit: int = Query(default=20, ge=1, le=200),
+) -> list[NearbyPlace]:
+    """주변 장소 검색 (반경 또는 kNN 모드)"""
+    store = get_place_store()
+    exclude_ids = [e for e in (exclude or "").split(",") if e]
+
+    if placeId:
+        row = store.row_of.get(placeId)
+        if row is None:
+            raise HTTPException(status_code=404, detail=f"장소를 찾을 수 없습니다: {placeId}")
+        lat, lng = float(store.latitude[row]), float(store.longitude[row])
+        exclude_ids.append(placeId)
+    elif lat is None or lng is None:
+        raise HTTPException(status_code=400, detail="placeId 또는 lat/lng가 필요합니다.")
+
+    hits = store.nearby(
+        lat,
+        lng,
+        radius_km=radius,
+        k=k,
+        category=category,
+        min_rating=minRating,
+        exclude_ids=exclude_ids,
+    )
+
+    return [
+        NearbyPlace(place=store.place(row), distance=round(dist, 2))
+        for row, dist in hits[:limit]
+    ]
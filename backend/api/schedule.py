@@ -0,0 +1,33 @@
+"""
+일정 편집 API 엔드포인트
+POST /api/schedule/patch
+"""
+
+import time
+from fastapi import APIRouter, HTTPException
+from models.schemas import SchedulePatchRequest, SchedulePatchResponse
+from services.schedule_patch import apply_schedule_edit
+
+router = APIRouter()
+
+
+@router.post("/schedule/patch")
+async def patch_schedule(request: SchedulePatchRequest) -> SchedulePatchResponse:
+    """장소 1곳 삽입/삭제/교체/이동 → 해당 일자만 증분 재최적화"""
+    started = time.perf_counter()
+    try:
+        schedule, changed_from = apply_schedule_edit(
+            request.schedule, request.edit, request.hasRentcar
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"일정 편집 오류: {e}")
+        raise HTTPException(status_code=500, detail=f"일정 편집에 실패했습니다: {str(e)}")
+
+    return SchedulePatchResponse(
+        schedule=schedule,
+        changedDays=sorted(changed_from),
+        changedFrom=changed_from,
+        patchMs=round((time.perf_counter() - started) * 1000, 2),
+    )
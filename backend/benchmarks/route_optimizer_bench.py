@@ -0,0 +1,267 @@
+"""
+동선 최적화 벤치마크 / 품질 측정
+data/places.json에서 재현 가능한 하루 일정(3~15곳)을 만들어 솔버별 속도와 경로 품질 비교
+
+- 일정 종류: random(전체 장소 균등) / skewed(한 지역 위주 + 일부 다른 지역)
+- 솔버: nearest_neighbor, two_opt(NN + 로컬 서치), regions(optimize_with_regions),
+  solve_day_order(운영 경로: 정확해/휴리스틱 자동 선택), exact(Held-Karp, 소규모만)
+- 지표: 지연 p50/p95 (ms), 총 거리(km), efficiencyScore 평균, 정확해 대비 gap(%)
+- 결과는 JSON으로 저장 → --baseline으로 이전 결과와 비교 (같은 seed/일정 수일 때만 의미 있음)
+- exact는 --exact-max-stops 이하 일정만 측정하므로 총 거리는 다른 솔버와 직접 비교하지 않음
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.route_optimizer_bench --output bench.json
+    python -m benchmarks.route_optimizer_bench --baseline bench.json
+"""
+
+import argparse
+import json
+import platform
+import time
+from datetime import datetime
+from typing import Callable
+
+import numpy as np
+
+from services.exact_solver import held_karp_path
+from services.place_store import REGIONS, PlaceStore, get_place_store
+from services.route_optimizer import (
+    _nearest_neighbor_order,
+    _path_length,
+    _region_optimized_order,
+    _two_opt_order,
+    coordinate_distance_matrix,
+    estimate_travel_times,
+    score_efficiency,
+    solve_day_order,
+)
+
+DEFAULT_SIZES = (3, 15)
+DEFAULT_PER_SIZE = 20
+# 정확해를 구할 최대 장소 수 (gap 기준)
+BENCH_EXACT_MAX_STOPS = 12
+# skewed 일정에서 주 지역 장소 비율
+SKEW_MAIN_RATIO = 0.7
+
+Solver = Callable[[np.ndarray, list[str]], list[int]]
+
+
+def _nearest_neighbor(dist: np.ndarray, regions: list[str]) -> list[int]:
+    return _nearest_neighbor_order(dist.tolist(), list(range(len(dist))))
+
+
+def _two_opt(dist: np.ndarray, regions: list[str]) -> list[int]:
+    matrix = dist.tolist()
+    return _two_opt_order(matrix, _nearest_neighbor_order(matrix, list(range(len(dist)))))
+
+
+def _regions(dist: np.ndarray, regions: list[str]) -> list[int]:
+    return _region_optimized_order(list(range(len(dist))), dist, regions)
+
+
+def _solve_day(dist: np.ndarray, regions: list[str]) -> list[int]:
+    return solve_day_order(list(range(len(dist))), dist, regions)[0]
+
+
+def _exact(dist: np.ndarray, regions: list[str]) -> list[int]:
+    return held_karp_path(dist, list(range(len(dist))))
+
+
+SOLVERS: dict[str, Solver] = {
+    "nearest_neighbor": _nearest_neighbor,
+    "two_opt": _two_opt,
+    "regions": _regions,
+    "solve_day_order": _solve_day,
+    "exact": _exact,
+}
+
+
+def generate_days(
+    store: PlaceStore, sizes: range, per_size: int, seed: int
+) -> list[dict]:
+    """재현 가능한 하루 일정 목록 → [{kind, size, rows}] (rows[0]이 출발 장소)"""
+    rng = np.random.default_rng(seed)
+    regions = [r for r in REGIONS if len(store.rows_by_region[r]) > 0]
+    days = []
+
+    for size in sizes:
+        for _ in range(per_size):
+            days.append({"kind": "random", "size": size, "rows": rng.choice(store.size, size, replace=False).tolist()})
+
+            main = store.rows_by_region[regions[rng.integers(len(regions))]]
+            n_main = min(len(main), max(1, round(size * SKEW_MAIN_RATIO)))
+            rows = rng.choice(main, n_main, replace=False).tolist()
+            while len(rows) < size:
+                row = int(rng.integers(store.size))
+                if row not in rows:
+                    rows.append(row)
+            rng.shuffle(rows)
+            days.append({"kind": "skewed", "size": size, "rows": [int(r) for r in rows]})
+
+    return days
+
+
+def _efficiency_score(dist: np.ndarray, order: list[int], regions: list[str]) -> int:
+    idx = np.asarray(order, dtype=np.int64)
+    legs = dist[idx[:-1], idx[1:]]
+    return score_efficiency(
+        float(legs.sum()),
+        int(estimate_travel_times(legs, True).sum()),
+        [regions[i] for i in order],
+        float(dist[order[0], order[-1]]),
+    ).efficiencyScore
+
+
+def run_benchmark(days: list[dict], store: PlaceStore, exact_max_stops: int) -> list[dict]:
+    """일정 × 솔버 측정 → 측정 기록 목록"""
+    records = []
+    for day in days:
+        rows = np.asarray(day["rows"], dtype=np.int64)
+        dist = coordinate_distance_matrix(store.latitude[rows], store.longitude[rows])
+        regions = [store.region_of(int(r)) for r in rows]
+
+        optimal = None
+        results = {}
+        for name, solver in SOLVERS.items():
+            if name == "exact" and day["size"] > exact_max_stops:
+                continue
+            started = time.perf_counter()
+            order = solver(dist, regions)
+            elapsed = (time.perf_counter() - started) * 1000
+            assert sorted(order) == list(range(day["size"])), f"{name}: 잘못된 순서"
+            results[name] = (order, elapsed)
+            if name == "exact":
+                optimal = _path_length(dist, order)
+
+        for name, (order, elapsed) in results.items():
+            length = _path_length(dist, order)
+            gap = None
+            if optimal is not None:
+                gap = (length - optimal) / optimal * 100 if optimal > 0 else 0.0
+            records.append({
+                "kind": day["kind"],
+                "size": day["size"],
+                "solver": name,
+                "ms": elapsed,
+                "km": length,
+                "efficiencyScore": _efficiency_score(dist, order, regions),
+                "gap": gap,
+            })
+
+    return records
+
+
+def summarize(records: list[dict]) -> dict:
+    """측정 기록 → 지표 요약"""
+    ms = np.array([r["ms"] for r in records])
+    gaps = np.array([r["gap"] for r in records if r["gap"] is not None])
+    summary = {
+        "instances": len(records),
+        "p50Ms": round(float(np.percentile(ms, 50)), 4),
+        "p95Ms": round(float(np.percentile(ms, 95)), 4),
+        "totalKm": round(sum(r["km"] for r in records), 2),
+        "meanEfficiencyScore": round(float(np.mean([r["efficiencyScore"] for r in records])), 2),
+        "gap": None,
+    }
+    if len(gaps):
+        summary["gap"] = {
+            "instances": len(gaps),
+            "meanPct": round(float(gaps.mean()), 3),
+            "p95Pct": round(float(np.percentile(gaps, 95)), 3),
+            "maxPct": round(float(gaps.max()), 3),
+            "optimalPct": round(float((gaps < 1e-6).mean() * 100), 1),
+        }
+    return summary
+
+
+def build_report(records: list[dict], meta: dict) -> dict:
+    """전체 / 일정 종류·장소 수별 요약 리포트"""
+    def by(keys: Callable[[dict], tuple]) -> dict:
+        groups: dict[tuple, list[dict]] = {}
+        for r in records:
+            groups.setdefault(keys(r), []).append(r)
+        return groups
+
+    report = {"meta": meta, "summary": {}, "bySize": {}}
+    for (solver,), group in by(lambda r: (r["solver"],)).items():
+        report["summary"][solver] = summarize(group)
+    for (kind, size, solver), group in sorted(by(lambda r: (r["kind"], r["size"], r["solver"])).items()):
+        report["bySize"].setdefault(kind, {}).setdefault(str(size), {})[solver] = summarize(group)
+    return report
+
+
+def format_report(report: dict, baseline: dict | None = None) -> str:
+    """요약 표 (baseline이 있으면 변화량 함께 표시)"""
+    lines = [
+        f"{'solver':<18}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'total km':>12}{'eff':>8}{'gap mean%':>11}{'gap max%':>10}{'optimal%':>10}"
+    ]
+    for solver, s in report["summary"].items():
+        gap = s["gap"] or {}
+        lines.append(
+            f"{solver:<18}{s['instances']:>6}{s['p50Ms']:>10.3f}{s['p95Ms']:>10.3f}{s['totalKm']:>12.1f}"
+            f"{s['meanEfficiencyScore']:>8.1f}{gap.get('meanPct', float('nan')):>11.2f}"
+            f"{gap.get('maxPct', float('nan')):>10.2f}{gap.get('optimalPct', float('nan')):>10.1f}"
+        )
+        old = (baseline or {}).get("summary", {}).get(solver)
+        if old:
+            old_gap = old["gap"] or {}
+            lines.append(
+                f"{'  Δ baseline':<18}{'':>6}{s['p50Ms'] - old['p50Ms']:>+10.3f}{s['p95Ms'] - old['p95Ms']:>+10.3f}"
+                f"{s['totalKm'] - old['totalKm']:>+12.1f}"
+                f"{s['meanEfficiencyScore'] - old['meanEfficiencyScore']:>+8.1f}"
+                f"{gap.get('meanPct', 0.0) - old_gap.get('meanPct', 0.0):>+11.2f}"
+            )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="동선 최적화 벤치마크")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--per-size", type=int, default=DEFAULT_PER_SIZE, help="장소 수·종류별 일정 수")
+    parser.add_argument("--min-stops", type=int, default=DEFAULT_SIZES[0])
+    parser.add_argument("--max-stops", type=int, default=DEFAULT_SIZES[1])
+    parser.add_argument("--exact-max-stops", type=int, default=BENCH_EXACT_MAX_STOPS)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    store = get_place_store()
+    sizes = range(args.min_stops, args.max_stops + 1)
+    days = generate_days(store, sizes, args.per_size, args.seed)
+
+    # 첫 호출 비용(지연 import, 캐시)을 측정에서 제외
+    run_benchmark(days[:2], store, args.exact_max_stops)
+
+    started = time.perf_counter()
+    records = run_benchmark(days, store, args.exact_max_stops)
+    print(f"일정 {len(days)}개 측정 완료 ({time.perf_counter() - started:.1f}s)")
+
+    report = build_report(records, {
+        "seed": args.seed,
+        "perSize": args.per_size,
+        "stops": [args.min_stops, args.max_stops],
+        "exactMaxStops": args.exact_max_stops,
+        "datasetVersion": store.version,
+        "python": platform.python_version(),
+        "createdAt": datetime.now().isoformat(timespec="seconds"),
+    })
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        old_meta = baseline.get("meta", {})
+        for key in ("datasetVersion", "seed", "perSize", "stops", "exactMaxStops"):
+            if old_meta.get(key) != report["meta"][key]:
+                print(f"주의: baseline과 {key}가 다릅니다 ({old_meta.get(key)} → {report['meta'][key]})")
+
+    print(format_report(report, baseline))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ FastAPI 메인 엔트리포인트
 """
 
 import os
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -16,6 +17,9 @@ from api.generate import router as generate_router
 from api.chat import router as chat_router
 from api.checklist import router as checklist_router
 from api.weather import router as weather_router
+from api.places import router as places_router
+from api.schedule import router as schedule_router
+from api.optimize import router as optimize_router
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -42,6 +46,33 @@ app.include_router(generate_router, prefix="/api", tags=["generate"])
 app.include_router(chat_router, prefix="/api", tags=["chat"])
 app.include_router(checklist_router, prefix="/api", tags=["checklist"])
 app.include_router(weather_router, prefix="/api", tags=["weather"])
+app.include_router(places_router, prefix="/api", tags=["places"])
+app.include_router(schedule_router, prefix="/api", tags=["schedule"])
+app.include_router(optimize_router, prefix="/api", tags=["optimize"])
+
+
+@app.on_event("startup")
+async def start_workers():
+    """시작 시 동선 최적화 프로세스 풀 생성 (forkserver 작업 프로세스 준비)"""
+    from services.worker_pool import start_process_pool
+
+    await asyncio.to_thread(start_process_pool)
+
+
+@app.on_event("shutdown")
+def shutdown_workers():
+    """종료 시 동선 최적화 프로세스 풀 정리"""
+    from services.worker_pool import shutdown_process_pool
+
+    shutdown_process_pool()
+
+
+@app.on_event("shutdown")
+async def close_openai():
+    """종료 시 공유 OpenAI 클라이언트 커넥션 풀 정리"""
+    from services.openai_client import close_openai_client
+
+    await close_openai_client()
 
 
 @app.get("/")
@@ -58,6 +89,12 @@ async def root():
 async def health_check():
     """상세 헬스체크"""
     # Pinecone 연결 테스트
+    from services.pinecone_client import VECTOR_INDEX_BACKEND
+    from services.embedding_cache import get_embedding_cache
+    from services.rag_search import expansion_cache
+    from api.generate import rag_filter_cache
+    from services.generation_cache import get_generation_cache
+
     pinecone_ok = False
     try:
         from services.pinecone_client import get_pinecone_client
@@ -72,6 +109,14 @@ async def health_check():
             "api": True,
             "openai": bool(os.getenv("OPENAI_API_KEY")),
             "pinecone": pinecone_ok,
+            "vectorIndex": VECTOR_INDEX_BACKEND,
+        },
+        "caches": {
+            # 디스크 COUNT 조회는 이벤트 루프 밖에서
+            "embedding": await asyncio.to_thread(get_embedding_cache().stats),
+            "queryExpansion": expansion_cache.stats(),
+            "ragFilter": rag_filter_cache.stats(),
+            "generation": get_generation_cache().stats(),
         },
     }
 
@@ -176,3 +176,61 @@ class RAGSearchResult(BaseModel):
     vectorScore: float
     keywordScore: float
     matchedVectorType: str = ""
+
+
+# 주변 장소 검색 결과
+class NearbyPlace(BaseModel):
+    place: Place
+    distance: float  # km
+
+
+# 일정 단일 편집 (삽입/삭제/교체/이동)
+class ScheduleEdit(BaseModel):
+    type: Literal["insert", "remove", "replace", "move"]
+    day: int  # 편집할 일자 (move는 출발 일자)
+    index: Optional[int] = None  # remove/replace/move: 대상 위치, insert: 삽입 위치 (없으면 최소 비용 위치)
+    place: Optional[SchedulePlace] = None  # insert/replace: 새 장소
+    placeId: Optional[str] = None  # place 대신 장소 ID만 주면 장소 저장소에서 조회
+    toDay: Optional[int] = None  # move: 도착 일자 (없으면 같은 일자)
+    toIndex: Optional[int] = None  # move: 도착 위치 (없으면 최소 비용 위치)
+    repair: bool = True  # 편집 후 해당 일자 로컬 서치 (위치를 직접 지정한 삽입/이동에는 미적용)
+
+
+# 일정 편집 요청
+class SchedulePatchRequest(BaseModel):
+    schedule: list[DaySchedule]
+    edit: ScheduleEdit
+    hasRentcar: bool = True
+
+
+# 일정 편집 결과
+class SchedulePatchResponse(BaseModel):
+    schedule: list[DaySchedule]
+    changedDays: list[int]
+    changedFrom: dict[int, int]  # 일자 → 시간이 다시 계산된 첫 위치
+    patchMs: float
+
+
+# 일괄 최적화 대상 일정
+class OptimizePlan(BaseModel):
+    id: Optional[str] = None  # 호출 측 식별자 (결과에 그대로 반환)
+    schedule: list[DaySchedule]
+    hasRentcar: bool = True
+
+
+# 일괄 최적화 요청
+class OptimizeBatchRequest(BaseModel):
+    plans: list[OptimizePlan]
+
+
+# 일괄 최적화 결과 (일정별 plan 또는 error)
+class OptimizeBatchResult(BaseModel):
+    id: Optional[str] = None
+    plan: Optional[TripPlan] = None
+    error: Optional[str] = None
+
+
+# 일괄 최적화 응답
+class OptimizeBatchResponse(BaseModel):
+    results: list[OptimizeBatchResult]
+    batchMs: float
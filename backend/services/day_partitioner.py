@@ -0,0 +1,135 @@
+"""
+여행 전체 일자 재배치 (용량 제약 지리 클러스터링)
+LLM이 정한 일자 배정을 지역 단위로 다시 묶어 하루 안의 섬 횡단 이동을 줄임
+
+- 시드: 일자별 대표 지역(숙소 지역, 없으면 최다 지역)의 JEJU_REGIONS 중심
+- 고정: 각 일자의 첫 장소(출발/도착 일정)와 숙소는 원래 일자에 유지
+- 용량: 일자별 카테고리 개수 유지 (식사 슬롯 = 맛집 수, 카페 수 등 그대로)
+- 배정: 카테고리별 regret 그리디 (1순위와 2순위 일자 거리 차가 큰 장소부터)
+- 반복: 중심 = 고정 장소 + 배정 장소 평균, 배정이 바뀌지 않을 때까지
+
+결과 채택 여부(총 이동거리 감소)는 호출하는 쪽에서 경로 최적화 후 판단
+"""
+
+from collections import Counter
+
+import numpy as np
+
+from .jeju_regions import JEJU_REGIONS, haversine_distances
+
+LODGING_CATEGORY = "숙소"
+PARTITION_MAX_ITERATIONS = 10
+
+
+def lodging_index(categories: list[str]) -> int | None:
+    """하루 일정 내 마지막에 고정할 숙소 위치 (첫 장소인 숙소는 제외)"""
+    for i in range(len(categories) - 1, 0, -1):
+        if categories[i] == LODGING_CATEGORY:
+            return i
+    return None
+
+
+def _seed(rows: list[int], anchors: list[int], regions: list[str], lat, lng) -> tuple[float, float]:
+    """일자 시드 중심 - 숙소 지역 또는 최다 지역의 중심 좌표"""
+    lodging = [i for i in anchors if i != rows[0]]
+    region = regions[lodging[-1]] if lodging else Counter(regions[i] for i in rows).most_common(1)[0][0]
+    info = JEJU_REGIONS.get(region)
+    if info is None:
+        return float(np.mean(lat[rows])), float(np.mean(lng[rows]))
+    return info.center_lat, info.center_lng
+
+
+def _assign(
+    movable: np.ndarray,
+    categories: list[str],
+    capacity: list[Counter],
+    cost: np.ndarray,
+) -> np.ndarray:
+    """카테고리별 용량을 지키며 regret 그리디 배정 → 장소별 일자 번호"""
+    assigned = np.full(len(movable), -1, dtype=np.int64)
+    remaining = [c.copy() for c in capacity]
+
+    if cost.shape[1] >= 2:
+        best_two = np.partition(cost, 1, axis=1)[:, :2]
+        regret = best_two[:, 1] - best_two[:, 0]
+    else:
+        regret = np.zeros(len(movable))
+
+    for k in np.argsort(-regret, kind="stable"):
+        category = categories[movable[k]]
+        for day in np.argsort(cost[k], kind="stable"):
+            if remaining[day][category] > 0:
+                remaining[day][category] -= 1
+                assigned[k] = day
+                break
+
+    return assigned
+
+
+def partition_days(
+    lat: np.ndarray,
+    lng: np.ndarray,
+    categories: list[str],
+    regions: list[str],
+    days: list[list[int]],
+) -> list[list[int]]:
+    """장소 번호로 된 일자별 일정 → 재배치된 일자별 일정 (첫 장소 유지, 숙소는 마지막)"""
+    n_days = len(days)
+    anchors: list[list[int]] = []
+    movable_list: list[int] = []
+    original_day: list[int] = []
+    capacity: list[Counter] = []
+
+    for d, rows in enumerate(days):
+        if not rows:
+            anchors.append([])
+            capacity.append(Counter())
+            continue
+
+        lodging = lodging_index([categories[i] for i in rows])
+        fixed = [rows[0]] + ([rows[lodging]] if lodging is not None else [])
+        anchors.append(fixed)
+
+        rest = [i for i in rows if i not in fixed]
+        movable_list.extend(rest)
+        original_day.extend([d] * len(rest))
+        capacity.append(Counter(categories[i] for i in rest))
+
+    if not movable_list:
+        return [list(rows) for rows in days]
+
+    movable = np.asarray(movable_list, dtype=np.int64)
+    centers = np.array(
+        [
+            _seed(rows, anchors[d], regions, lat, lng) if rows else (np.nan, np.nan)
+            for d, rows in enumerate(days)
+        ]
+    )
+
+    assigned = np.asarray(original_day, dtype=np.int64)
+    for _ in range(PARTITION_MAX_ITERATIONS):
+        cost = haversine_distances(
+            lat[movable][:, None], lng[movable][:, None], centers[None, :, 0], centers[None, :, 1]
+        )
+        # 빈 일자에는 배정하지 않음
+        cost = np.where(np.isnan(cost), np.inf, cost)
+
+        new_assigned = _assign(movable, categories, capacity, cost)
+        if np.array_equal(new_assigned, assigned):
+            break
+        assigned = new_assigned
+
+        for d in range(n_days):
+            members = list(anchors[d]) + movable[assigned == d].tolist()
+            if members:
+                centers[d] = (float(np.mean(lat[members])), float(np.mean(lng[members])))
+
+    result = []
+    for d in range(n_days):
+        if not anchors[d]:
+            result.append([])
+            continue
+        first, *lodging = anchors[d]
+        result.append([first] + movable[assigned == d].tolist() + lodging)
+
+    return result
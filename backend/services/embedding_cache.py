@@ -0,0 +1,242 @@
+"""
+쿼리 임베딩 캐시 (2단계)
+- 1단계: 메모리 LRU (TTLCache)
+- 2단계: SQLite 디스크 저장소 (프로세스 재시작 후에도 유지)
+
+키: 임베딩 모델명 + 정규화된 텍스트
+
+비동기 경로(aget_many / set_many)는 디스크 단계를 이벤트 루프 밖에서 처리
+- 조회: 메모리 miss만 스레드에서 한 번의 SELECT로 조회
+- 저장: 메모리는 즉시, 디스크는 백그라운드 스레드에서 기록 (응답을 기다리게 하지 않음)
+- 용량 정리: 삽입마다가 아니라 DISK_TRIM_EVERY건마다 오래된 순으로 삭제
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+
+from .cache import TTLCache
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / ".cache" / "embeddings.sqlite3"
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+EMBEDDING_CACHE_DISK_SIZE = int(os.getenv("EMBEDDING_CACHE_DISK_SIZE", "50000"))
+EMBEDDING_CACHE_TTL = float(os.getenv("EMBEDDING_CACHE_TTL", str(7 * 24 * 3600)))
+# 빈 문자열이면 디스크 캐시 비활성화
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", str(DEFAULT_CACHE_PATH))
+# 디스크 용량 정리 주기 (삽입 건수) - 그 사이에는 disk_size를 이만큼 넘을 수 있음
+DISK_TRIM_EVERY = 256
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화 (유니코드 NFC + 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_key(model: str, text: str) -> str:
+    """모델명 + 정규화 텍스트 → 캐시 키"""
+    raw = f"{model}\0{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+class EmbeddingCache:
+    """메모리 LRU + SQLite 2단계 임베딩 캐시"""
+
+    def __init__(
+        self,
+        path: str | None = EMBEDDING_CACHE_PATH,
+        memory_size: int = EMBEDDING_CACHE_SIZE,
+        disk_size: int = EMBEDDING_CACHE_DISK_SIZE,
+        ttl: float | None = EMBEDDING_CACHE_TTL,
+    ):
+        self.memory = TTLCache(max_size=memory_size, ttl=ttl)
+        self.disk_size = disk_size
+        self.ttl = ttl
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._inserts_since_trim = 0
+        # 진행 중인 백그라운드 디스크 기록 (완료 전 GC 방지)
+        self._pending_writes: set[asyncio.Future] = set()
+
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_created ON embeddings(created_at)"
+            )
+            self._conn.commit()
+            self._trim()
+
+    def get(self, model: str, text: str) -> list[float] | None:
+        """캐시 조회 (메모리 → 디스크 순)"""
+        key = make_key(model, text)
+
+        vector = self.memory.get(key)
+        if vector is not None:
+            return vector
+
+        vector = self._disk_get(key)
+        if vector is not None:
+            self.disk_hits += 1
+            self.memory.set(key, vector)
+            return vector
+
+        self.misses += 1
+        return None
+
+    def set(self, model: str, text: str, vector: list[float]) -> None:
+        """캐시 저장 (메모리 + 디스크)"""
+        key = make_key(model, text)
+        self.memory.set(key, vector)
+        self._disk_set(key, model, vector)
+
+    async def aget_many(self, model: str, texts: list[str]) -> list[list[float] | None]:
+        """여러 텍스트 캐시 조회 (메모리 → 디스크, 디스크는 스레드에서 한 번에)"""
+        keys = [make_key(model, t) for t in texts]
+        vectors: list[list[float] | None] = [self.memory.get(key) for key in keys]
+
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing and self._conn is not None:
+            found = await asyncio.to_thread(self._disk_get_many, [keys[i] for i in missing])
+            for i in missing:
+                vector = found.get(keys[i])
+                if vector is not None:
+                    self.disk_hits += 1
+                    self.memory.set(keys[i], vector)
+                    vectors[i] = vector
+
+        self.misses += sum(1 for v in vectors if v is None)
+        return vectors
+
+    def set_many(self, model: str, items: list[tuple[str, list[float]]]) -> None:
+        """여러 임베딩 저장 - 메모리는 즉시, 디스크는 백그라운드 기록 (이벤트 루프에서 호출)"""
+        rows = []
+        for text, vector in items:
+            key = make_key(model, text)
+            self.memory.set(key, vector)
+            rows.append((key, model, vector))
+
+        if self._conn is None or self.disk_size <= 0 or not rows:
+            return
+        future = asyncio.get_running_loop().run_in_executor(None, self._disk_set_many, rows)
+        self._pending_writes.add(future)
+        future.add_done_callback(self._write_done)
+
+    def _write_done(self, future: asyncio.Future) -> None:
+        self._pending_writes.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            print(f"임베딩 캐시 디스크 기록 실패: {future.exception()}")
+
+    def _disk_get(self, key: str) -> list[float] | None:
+        return self._disk_get_many([key]).get(key)
+
+    def _disk_get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        if self._conn is None or not keys:
+            return {}
+
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, vector, created_at FROM embeddings WHERE key IN ({placeholders})",
+                keys,
+            ).fetchall()
+
+            now = time.time()
+            expired = [key for key, _, created_at in rows
+                       if self.ttl is not None and now - created_at >= self.ttl]
+            if expired:
+                self._conn.executemany("DELETE FROM embeddings WHERE key = ?", [(k,) for k in expired])
+                self._conn.commit()
+
+        expired_keys = set(expired)
+        return {
+            key: np.frombuffer(blob, dtype=np.float32).tolist()
+            for key, blob, _ in rows
+            if key not in expired_keys
+        }
+
+    def _disk_set(self, key: str, model: str, vector: list[float]) -> None:
+        self._disk_set_many([(key, model, vector)])
+
+    def _disk_set_many(self, rows: list[tuple[str, str, list[float]]]) -> None:
+        if self._conn is None or self.disk_size <= 0 or not rows:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (key, model, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                    for key, model, vector in rows
+                ],
+            )
+            self._conn.commit()
+            self._inserts_since_trim += len(rows)
+            due = self._inserts_since_trim >= DISK_TRIM_EVERY
+
+        if due:
+            self._trim()
+
+    def _trim(self) -> None:
+        """용량 초과분을 오래된 순으로 삭제"""
+        if self._conn is None or self.disk_size <= 0:
+            return
+        with self._lock:
+            self._inserts_since_trim = 0
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN ("
+                "SELECT key FROM embeddings ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.disk_size,),
+            )
+            self._conn.commit()
+
+    def disk_count(self) -> int:
+        if self._conn is None:
+            return 0
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def stats(self) -> dict:
+        """캐시 통계 (메모리 hit / 디스크 hit / miss)"""
+        memory_hits = self.memory.hits
+        total = memory_hits + self.disk_hits + self.misses
+        return {
+            "memorySize": len(self.memory),
+            "diskSize": self.disk_count(),
+            "memoryHits": memory_hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "hitRate": round((memory_hits + self.disk_hits) / total, 3) if total else 0.0,
+        }
+
+
+_embedding_cache: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """임베딩 캐시 싱글톤"""
+    global _embedding_cache
+
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache()
+
+    return _embedding_cache
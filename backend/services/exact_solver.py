@@ -0,0 +1,59 @@
+"""
+소규모 경로 정확해 (Held-Karp 비트마스크 DP)
+
+시작점 고정, 끝점 자유(또는 고정)인 경로의 최단 순서
+- 상태: (방문 집합 mask, 마지막 장소 j) → 최소 거리
+- 방문 개수(popcount) 층 단위로 NumPy 벡터화
+- 시간/메모리 O(2^n · n²) / O(2^n · n) → 하루 10~12곳 이하에서만 사용
+"""
+
+import numpy as np
+
+
+def held_karp_path(dist: np.ndarray, route: list[int], end: int | None = None) -> list[int]:
+    """route[0]을 시작점으로 고정한 최단 경로 순서 (dist는 전체 행렬, route는 인덱스)
+
+    end가 있으면 route 밖의 그 장소에서 끝나는 경로 (결과 마지막에 포함)
+    """
+    if len(route) <= 2:
+        return list(route) + ([end] if end is not None else [])
+
+    start, others = route[0], list(route[1:])
+    n = len(others)
+    full = (1 << n) - 1
+
+    d = dist[np.ix_(others, others)]
+    dp = np.full((1 << n, n), np.inf)
+    parent = np.full((1 << n, n), -1, dtype=np.int8)
+
+    bits = 1 << np.arange(n)
+    dp[bits, np.arange(n)] = dist[start, others]
+
+    # mask별 포함 여부 / popcount
+    masks = np.arange(1 << n)
+    member = (masks[:, None] & bits[None, :]) != 0
+    popcount = member.sum(axis=1)
+
+    for size in range(2, n + 1):
+        layer = masks[popcount == size]
+        for j in range(n):
+            sel = layer[member[layer, j]]
+            prev = sel ^ bits[j]
+            # 직전 상태(prev, k) + k → j
+            cand = dp[prev] + d[:, j]
+            best = cand.argmin(axis=1)
+            dp[sel, j] = cand[np.arange(len(sel)), best]
+            parent[sel, j] = best
+
+    # 끝점 자유: 전체 방문 상태 중 최소 / 끝점 고정: 종점까지 거리 포함
+    final = dp[full] if end is None else dp[full] + dist[others, end]
+    last = int(final.argmin())
+    order = []
+    mask = full
+    while last >= 0:
+        order.append(others[last])
+        prev_last = int(parent[mask, last])
+        mask ^= 1 << last
+        last = prev_last
+
+    return [start] + order[::-1] + ([end] if end is not None else [])
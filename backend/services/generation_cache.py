@@ -0,0 +1,177 @@
+"""
+일정 생성 결과 캐시
+같은 조건의 요청은 GPT-4o 호출 없이 이전 생성 결과(최적화 전 LLM 일정)를 재사용
+
+- 1단계: 정규화된 입력 해시 + 계절 + 데이터 버전 정확 일치
+- 2단계 (선택, 기본 꺼짐): 같은 기본 조건에서 customRequest 임베딩 코사인 유사도가 임계값 이상인 항목
+  (짧은 요청은 부정 표현이 있어도 유사도가 높게 나올 수 있으므로 필요할 때만 켬)
+- 저장 값은 LLM 원본 일정 → 꺼낼 때 오늘 기준 날짜로 다시 매기고 동선 최적화/분석은 매번 새로 수행
+- 용량(LRU) / TTL 만료는 TTLCache 설정으로 조절, 정확/유사 hit과 miss는 /health에 노출
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from typing import Awaitable, Callable
+
+import numpy as np
+
+from models.schemas import TripInput
+from .cache import TTLCache
+from .embedding_cache import normalize_text
+
+GENERATION_CACHE_ENABLED = os.getenv("GENERATION_CACHE", "true").lower() == "true"
+GENERATION_CACHE_SIZE = int(os.getenv("GENERATION_CACHE_SIZE", "256"))
+GENERATION_CACHE_TTL = float(os.getenv("GENERATION_CACHE_TTL", str(24 * 3600)))
+# customRequest 유사 요청 재사용 (opt-in, 임베딩 코사인 유사도 임계값)
+GENERATION_CACHE_SEMANTIC = os.getenv("GENERATION_CACHE_SEMANTIC", "false").lower() == "true"
+GENERATION_CACHE_SIMILARITY = float(os.getenv("GENERATION_CACHE_SIMILARITY", "0.92"))
+
+Embedder = Callable[[str], Awaitable[list[float]]]
+
+
+def base_key(input_data: TripInput, season: str, dataset_version: str) -> str:
+    """customRequest를 뺀 기본 조건 키 (예산은 프롬프트에 그대로 들어가므로 정확한 값)"""
+    raw = json.dumps(
+        [
+            input_data.budget,
+            input_data.nights,
+            input_data.days,
+            input_data.people,
+            sorted(set(input_data.styles)),
+            input_data.hasRentcar,
+            season,
+            dataset_version,
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def exact_key(base: str, custom_request: str) -> str:
+    """기본 조건 키 + 정규화된 customRequest"""
+    raw = f"{base}\0{normalize_text(custom_request)}".encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+class GenerationCache:
+    """LLM 일정 캐시 (정확 일치 + customRequest 유사도)"""
+
+    def __init__(
+        self,
+        max_size: int = GENERATION_CACHE_SIZE,
+        ttl: float | None = GENERATION_CACHE_TTL,
+        semantic: bool = GENERATION_CACHE_SEMANTIC,
+        similarity: float = GENERATION_CACHE_SIMILARITY,
+    ):
+        self.entries = TTLCache(max_size=max_size, ttl=ttl)
+        self.semantic = semantic
+        self.similarity = similarity
+        # 기본 조건 키 → {정확 키: 정규화된 customRequest 임베딩}
+        self._vectors: dict[str, dict[str, np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    async def _embed(self, text: str, embed: Embedder | None) -> np.ndarray | None:
+        if not (self.semantic and embed and text):
+            return None
+        try:
+            vector = np.asarray(await embed(text), dtype=np.float32)
+        except Exception as e:
+            print(f"일정 캐시 임베딩 실패: {e}")
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else None
+
+    def _nearest(self, base: str, vector: np.ndarray) -> tuple[str | None, float]:
+        """같은 기본 조건의 유사 요청 중 가장 가까운 항목 (만료/삭제된 항목은 정리)"""
+        with self._lock:
+            candidates = self._vectors.get(base, {})
+            for key in [k for k in candidates if k not in self.entries]:
+                del candidates[key]
+            if not candidates:
+                self._vectors.pop(base, None)
+                return None, 0.0
+            keys = list(candidates)
+            scores = np.stack([candidates[k] for k in keys]) @ vector
+        best = int(np.argmax(scores))
+        return keys[best], float(scores[best])
+
+    async def lookup(
+        self,
+        input_data: TripInput,
+        season: str,
+        dataset_version: str,
+        embed: Embedder | None = None,
+    ) -> tuple[list[dict] | None, str]:
+        """캐시 조회 → (LLM 일정 복사본 또는 None, "exact" | "semantic" | "miss")"""
+        base = base_key(input_data, season, dataset_version)
+        key = exact_key(base, input_data.customRequest)
+
+        schedule = self.entries.get(key)
+        if schedule is not None:
+            self.exact_hits += 1
+            return copy.deepcopy(schedule), "exact"
+
+        vector = await self._embed(normalize_text(input_data.customRequest), embed)
+        if vector is not None:
+            nearest, score = self._nearest(base, vector)
+            if nearest is not None and score >= self.similarity:
+                schedule = self.entries.get(nearest)
+                if schedule is not None:
+                    print(f"일정 캐시 유사 hit (유사도 {score:.3f})")
+                    self.semantic_hits += 1
+                    return copy.deepcopy(schedule), "semantic"
+
+        self.misses += 1
+        return None, "miss"
+
+    async def store(
+        self,
+        input_data: TripInput,
+        season: str,
+        dataset_version: str,
+        schedule: list[dict],
+        embed: Embedder | None = None,
+    ) -> None:
+        """LLM 일정 저장 (customRequest가 있으면 유사도 조회용 임베딩도 저장)"""
+        if not schedule:
+            return
+        base = base_key(input_data, season, dataset_version)
+        key = exact_key(base, input_data.customRequest)
+        self.entries.set(key, copy.deepcopy(schedule))
+
+        vector = await self._embed(normalize_text(input_data.customRequest), embed)
+        if vector is not None:
+            with self._lock:
+                self._vectors.setdefault(base, {})[key] = vector
+
+    def stats(self) -> dict:
+        """캐시 통계 (정확 hit / 유사 hit / miss)"""
+        total = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "size": len(self.entries),
+            "maxSize": self.entries.max_size,
+            "ttl": self.entries.ttl,
+            "exactHits": self.exact_hits,
+            "semanticHits": self.semantic_hits,
+            "misses": self.misses,
+            "hitRate": round((self.exact_hits + self.semantic_hits) / total, 3) if total else 0.0,
+        }
+
+
+_generation_cache: GenerationCache | None = None
+
+
+def get_generation_cache() -> GenerationCache:
+    """일정 생성 캐시 싱글톤"""
+    global _generation_cache
+
+    if _generation_cache is None:
+        _generation_cache = GenerationCache()
+
+    return _generation_cache
@@ -4,9 +4,12 @@
 """
 
 import math
+from functools import lru_cache
 from typing import TypeVar, Protocol
 from dataclasses import dataclass
 
+import numpy as np
+
 
 @dataclass
 class RegionInfo:
@@ -101,6 +104,17 @@ def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> fl
     return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
 
+def haversine_distances(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """Haversine 거리 계산 (km) - NumPy 브로드캐스팅 버전"""
+    R = 6371
+    lat1 = np.radians(lat1)
+    lat2 = np.radians(lat2)
+    d_lat = lat2 - lat1
+    d_lng = np.radians(np.asarray(lng2) - np.asarray(lng1))
+    a = np.sin(d_lat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(d_lng / 2) ** 2
+    return R * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
 def classify_place_by_region(latitude: float, longitude: float) -> str:
     """장소의 지역 분류"""
     closest_region = "기타"
@@ -123,12 +137,48 @@ def classify_place_by_region(latitude: float, longitude: float) -> str:
     return closest_region
 
 
+def classify_regions(latitudes, longitudes) -> np.ndarray:
+    """지역 분류 (벡터화) → JEJU_REGIONS 순서 기준 지역 번호 배열
+
+    classify_place_by_region과 같은 규칙: 정의 순서상 첫 번째로 반경 안에 드는 지역,
+    없으면 가장 가까운 지역
+    """
+    centers = list(JEJU_REGIONS.values())
+    center_lat = np.array([r.center_lat for r in centers])
+    center_lng = np.array([r.center_lng for r in centers])
+    radius = np.array([r.radius for r in centers])
+
+    lat = np.asarray(latitudes, dtype=np.float64)[:, None]
+    lng = np.asarray(longitudes, dtype=np.float64)[:, None]
+    dist = haversine_distances(lat, lng, center_lat[None, :], center_lng[None, :])
+
+    inside = dist <= radius[None, :]
+    return np.where(inside.any(axis=1), inside.argmax(axis=1), dist.argmin(axis=1))
+
+
+# 좌표 반올림 자릿수 (소수점 5자리 ≈ 1m)
+REGION_LOOKUP_PRECISION = 5
+
+
+@lru_cache(maxsize=8192)
+def _region_at_rounded(latitude: float, longitude: float) -> str:
+    return classify_place_by_region(latitude, longitude)
+
+
+def region_at(latitude: float, longitude: float) -> str:
+    """좌표 → 지역 (반올림 좌표 기준 메모이제이션)"""
+    return _region_at_rounded(
+        round(latitude, REGION_LOOKUP_PRECISION),
+        round(longitude, REGION_LOOKUP_PRECISION),
+    )
+
+
 def group_places_by_region(places: list[dict]) -> dict[str, list[dict]]:
     """장소 배열을 지역별로 그룹핑"""
     groups: dict[str, list[dict]] = {}
 
     for place in places:
-        region = classify_place_by_region(place["latitude"], place["longitude"])
+        region = region_at(place["latitude"], place["longitude"])
         if region not in groups:
             groups[region] = []
         groups[region].append(place)
@@ -0,0 +1,129 @@
+"""
+키워드 검색 엔진 (BM25F)
+- places.json 로드 시 1회 역색인(postings) 구축
+- 한국어 대응 토큰화: 어절 단위 문자 bigram
+- 필드 가중치: 이름(10) > 카테고리(5) > 서브카테고리(4) > 태그(3) > 설명(2)
+- 쿼리 점수: 쿼리 토큰의 postings 배열 합산 (코퍼스 전체 대상)
+"""
+
+import math
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from .place_store import PlaceStore
+
+FIELD_WEIGHTS: dict[str, float] = {
+    "name": 10.0,
+    "category": 5.0,
+    "subcategory": 4.0,
+    "tags": 3.0,
+    "description": 2.0,
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """어절 단위 문자 bigram 토큰화 (1글자 어절은 무시)"""
+    tokens: list[str] = []
+    for word in text.lower().split():
+        if len(word) < 2:
+            continue
+        tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def _place_fields(store: PlaceStore, row: int) -> dict[str, str]:
+    return {
+        "name": store.name[row],
+        "category": store.category_of(row),
+        "subcategory": store.subcategory[row] or "",
+        "tags": " ".join(store.style_tags[row]),
+        "description": store.description[row] or "",
+    }
+
+
+class KeywordIndex:
+    """필드 가중 BM25 역색인"""
+
+    def __init__(self, store: PlaceStore):
+        # 문서 번호 = PlaceStore 행 번호
+        self.place_ids = store.ids
+        self.row_of = store.row_of
+        self.size = len(store)
+
+        field_tokens = [
+            {
+                name: Counter(tokenize(text))
+                for name, text in _place_fields(store, row).items()
+            }
+            for row in range(self.size)
+        ]
+
+        # 필드별 평균 길이 (BM25 길이 정규화)
+        avg_len = {
+            name: max(
+                1.0,
+                sum(sum(doc[name].values()) for doc in field_tokens) / max(1, self.size),
+            )
+            for name in FIELD_WEIGHTS
+        }
+
+        # 문서별 가중 term frequency (BM25F)
+        weighted_tf: dict[str, dict[int, float]] = defaultdict(dict)
+        for doc_id, doc in enumerate(field_tokens):
+            for name, weight in FIELD_WEIGHTS.items():
+                counts = doc[name]
+                if not counts:
+                    continue
+                length = sum(counts.values())
+                norm = 1 - BM25_B + BM25_B * length / avg_len[name]
+                for term, tf in counts.items():
+                    postings = weighted_tf[term]
+                    postings[doc_id] = postings.get(doc_id, 0.0) + weight * tf / norm
+
+        # postings: term → (문서 id 배열, BM25 기여도 배열)
+        self.postings: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for term, docs in weighted_tf.items():
+            df = len(docs)
+            idf = math.log(1 + (self.size - df + 0.5) / (df + 0.5))
+            doc_ids = np.fromiter(docs.keys(), dtype=np.int32, count=df)
+            tf = np.fromiter(docs.values(), dtype=np.float32, count=df)
+            contrib = idf * tf * (BM25_K1 + 1) / (tf + BM25_K1)
+            self.postings[term] = (doc_ids, contrib.astype(np.float32))
+
+    def score(self, queries: list[str]) -> np.ndarray:
+        """코퍼스 전체에 대한 쿼리 점수 배열 (0~1 정규화)"""
+        scores = np.zeros(self.size, dtype=np.float32)
+        term_counts = Counter(t for q in queries for t in tokenize(q))
+
+        for term, count in term_counts.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            doc_ids, contrib = posting
+            scores[doc_ids] += contrib * count
+
+        max_score = scores.max() if self.size else 0
+        if max_score > 0:
+            scores /= max_score
+        return scores
+
+    def top(
+        self, scores: np.ndarray, top_k: int = 20
+    ) -> list[tuple[str, float]]:
+        """점수 배열에서 상위 top_k 장소 (placeId, score), 점수 0 제외"""
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) == 0 or top_k <= 0:
+            return []
+
+        k = min(top_k, len(hits))
+        top = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.place_ids[i], float(scores[i])) for i in top]
+
+    def search(self, queries: list[str], top_k: int = 20) -> list[tuple[str, float]]:
+        """키워드 점수 상위 top_k 장소"""
+        return self.top(self.score(queries), top_k)
@@ -0,0 +1,276 @@
+"""
+로컬 벡터 인덱스 (NumPy)
+Pinecone jeju-places 인덱스를 메모리에 올려 brute-force 코사인 검색
+
+- 벡터: float32 행렬 1개 (L2 정규화)
+- 메타데이터: 컬럼 배열 (placeId, vectorType, category, region, cost, rating)
+- 응답 형태: Pinecone query 결과와 동일 (matches[].id / score / metadata)
+
+인덱스 파일 생성:
+    python -m services.local_index  # Pinecone에서 전체 벡터를 내려받아 저장
+"""
+
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_INDEX_PATH = (
+    Path(__file__).parent.parent.parent / "data" / "place_vectors.npz"
+)
+LOCAL_INDEX_PATH = Path(os.getenv("LOCAL_INDEX_PATH", str(DEFAULT_INDEX_PATH)))
+
+# 컬럼으로 보관하는 메타데이터 필드
+STRING_FIELDS = ("placeId", "vectorType", "category", "region")
+NUMBER_FIELDS = ("cost", "rating")
+
+
+@dataclass
+class LocalMatch:
+    """Pinecone ScoredVector와 같은 형태의 검색 결과"""
+
+    id: str
+    score: float
+    metadata: dict = field(default_factory=dict)
+
+
+@dataclass
+class LocalQueryResponse:
+    """Pinecone QueryResponse와 같은 형태의 응답"""
+
+    matches: list[LocalMatch]
+
+
+class LocalVectorIndex:
+    """메모리 상주 벡터 인덱스 (Pinecone Index.query 호환)"""
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        vectors: np.ndarray,
+        columns: dict[str, np.ndarray],
+    ):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+
+        self.ids = np.asarray(ids, dtype=str)
+        self.vectors = np.ascontiguousarray(vectors / norms)
+        self.columns = columns
+        # 벡터 → 장소 저장소 행 번호 (bind_store에서 메타데이터가 저장소와 일치할 때만 설정)
+        self.place_rows: np.ndarray | None = None
+
+    def store_rows(self, store) -> np.ndarray:
+        """벡터별 장소 저장소 행 번호 (없는 장소는 -1)"""
+        return np.array(
+            [store.row_of.get(pid, -1) for pid in self.columns["placeId"]], dtype=np.int64
+        )
+
+    def bind_store(self, store) -> bool:
+        """장소 저장소 행 번호 연결 - 필터 필드(카테고리/지역/비용/평점)가 모두 일치할 때만
+
+        하나라도 다르면 place_mask(저장소 기준) 대신 인덱스 메타데이터 필터를 쓰도록 연결하지 않음
+        """
+        rows = self.store_rows(store)
+        known = rows >= 0
+        safe_rows = np.maximum(rows, 0)
+
+        category_names = np.array([store.category_of(r) if r >= 0 else "" for r in rows])
+        region_names = np.array([store.region_of(r) if r >= 0 else "" for r in rows])
+        mismatches = {
+            "카테고리": int(np.sum(known & (category_names != self.columns["category"]))),
+            "지역": int(np.sum(known & (region_names != self.columns["region"]))),
+            "비용": int(np.sum(known & (store.avg_cost[safe_rows] != self.columns["cost"]))),
+            "평점": int(np.sum(known & (store.rating[safe_rows] != self.columns["rating"]))),
+            "저장소에 없는 장소": int((~known).sum()),
+        }
+        if any(mismatches.values()):
+            summary = ", ".join(f"{name} {count}개" for name, count in mismatches.items())
+            print(f"로컬 인덱스 메타데이터 불일치 ({summary}) → 인덱스 메타데이터로 필터링")
+            self.place_rows = None
+            return False
+
+        self.place_rows = rows
+        return True
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, path: Path = LOCAL_INDEX_PATH) -> "LocalVectorIndex":
+        """npz 파일에서 인덱스 로드"""
+        with np.load(path, allow_pickle=False) as data:
+            columns = {name: data[name] for name in STRING_FIELDS + NUMBER_FIELDS}
+            return cls(ids=data["ids"], vectors=data["vectors"], columns=columns)
+
+    def save(self, path: Path = LOCAL_INDEX_PATH) -> None:
+        """npz 파일로 인덱스 저장"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, ids=self.ids, vectors=self.vectors, **self.columns)
+
+    def _filter_mask(self, filter: dict | None) -> np.ndarray | None:
+        """Pinecone 필터 dict → 벡터별 boolean mask"""
+        if not filter:
+            return None
+
+        mask = np.ones(len(self), dtype=bool)
+        for key, condition in filter.items():
+            if key == "$and":
+                for sub in condition:
+                    sub_mask = self._filter_mask(sub)
+                    if sub_mask is not None:
+                        mask &= sub_mask
+                continue
+
+            column = self.columns.get(key)
+            if column is None:
+                # 알 수 없는 필드는 Pinecone과 동일하게 매칭 없음
+                return np.zeros(len(self), dtype=bool)
+
+            for op, value in condition.items():
+                if op == "$eq":
+                    mask &= column == value
+                elif op == "$ne":
+                    mask &= column != value
+                elif op == "$in":
+                    mask &= np.isin(column, value)
+                elif op == "$nin":
+                    mask &= ~np.isin(column, value)
+                elif op == "$lte":
+                    mask &= column <= value
+                elif op == "$lt":
+                    mask &= column < value
+                elif op == "$gte":
+                    mask &= column >= value
+                elif op == "$gt":
+                    mask &= column > value
+                else:
+                    raise ValueError(f"지원하지 않는 필터 연산자: {op}")
+
+        return mask
+
+    def _metadata(self, row: int) -> dict:
+        metadata: dict = {name: str(self.columns[name][row]) for name in STRING_FIELDS}
+        for name in NUMBER_FIELDS:
+            metadata[name] = float(self.columns[name][row])
+        return metadata
+
+    def query(
+        self,
+        vector: list[float],
+        top_k: int = 10,
+        include_metadata: bool = True,
+        filter: dict | None = None,
+        place_mask: np.ndarray | None = None,
+        **_: object,
+    ) -> LocalQueryResponse:
+        """코사인 유사도 top-k 검색
+
+        filter: Pinecone 형식 필터 dict
+        place_mask: filter와 같은 조건의 장소 저장소 행 단위 mask (build_filter_mask 결과)
+            bind_store로 저장소와 일치가 확인된 경우에만 filter 대신 사용
+        """
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        # 필터로 후보를 먼저 줄인 뒤 해당 벡터만 점수 계산
+        if place_mask is not None and self.place_rows is not None:
+            mask = place_mask[self.place_rows]
+        else:
+            mask = self._filter_mask(filter)
+
+        if mask is None:
+            candidates = np.arange(len(self))
+            scores = self.vectors @ query
+        else:
+            candidates = np.flatnonzero(mask)
+            scores = self.vectors[candidates] @ query
+
+        if len(candidates) == 0 or top_k <= 0:
+            return LocalQueryResponse(matches=[])
+
+        # argpartition으로 상위 k개만 정렬
+        k = min(top_k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        matches = [
+            LocalMatch(
+                id=str(self.ids[candidates[i]]),
+                score=float(scores[i]),
+                metadata=self._metadata(candidates[i]) if include_metadata else {},
+            )
+            for i in top
+        ]
+        return LocalQueryResponse(matches=matches)
+
+
+_local_index: LocalVectorIndex | None = None
+_local_index_lock = threading.Lock()
+
+
+def get_local_index() -> LocalVectorIndex:
+    """로컬 인덱스 싱글톤"""
+    global _local_index
+
+    # 병렬 검색 스레드에서 동시에 호출되므로 1회만 로드
+    with _local_index_lock:
+        if _local_index is None:
+            if not LOCAL_INDEX_PATH.exists():
+                raise FileNotFoundError(
+                    f"로컬 벡터 인덱스 파일이 없습니다: {LOCAL_INDEX_PATH} "
+                    "(python -m services.local_index 로 생성)"
+                )
+            from .place_store import get_place_store
+
+            _local_index = LocalVectorIndex.load(LOCAL_INDEX_PATH)
+            _local_index.bind_store(get_place_store())
+            print(f"로컬 벡터 인덱스 로드: {len(_local_index)}개 벡터")
+
+    return _local_index
+
+
+def export_from_pinecone(batch_size: int = 100) -> LocalVectorIndex:
+    """Pinecone jeju-places 인덱스 전체를 로컬 인덱스로 변환"""
+    from .pinecone_client import get_pinecone_client, INDEX_NAME
+
+    index = get_pinecone_client().Index(INDEX_NAME)
+
+    ids: list[str] = []
+    for page in index.list():
+        ids.extend(page)
+
+    vectors: list[list[float]] = []
+    rows: list[dict] = []
+    for start in range(0, len(ids), batch_size):
+        fetched = index.fetch(ids=ids[start : start + batch_size]).vectors
+        for vector_id in ids[start : start + batch_size]:
+            record = fetched.get(vector_id)
+            if record is None:
+                continue
+            vectors.append(record.values)
+            rows.append({"id": vector_id, **(record.metadata or {})})
+
+    columns: dict[str, np.ndarray] = {
+        name: np.array([str(r.get(name, "")) for r in rows]) for name in STRING_FIELDS
+    }
+    for name in NUMBER_FIELDS:
+        columns[name] = np.array(
+            [float(r.get(name, 0) or 0) for r in rows], dtype=np.float64
+        )
+
+    return LocalVectorIndex(
+        ids=np.array([r["id"] for r in rows]),
+        vectors=np.array(vectors, dtype=np.float32),
+        columns=columns,
+    )
+
+
+if __name__ == "__main__":
+    local_index = export_from_pinecone()
+    local_index.save(LOCAL_INDEX_PATH)
+    print(f"로컬 벡터 인덱스 저장: {LOCAL_INDEX_PATH} ({len(local_index)}개 벡터)")
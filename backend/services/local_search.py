@@ -0,0 +1,227 @@
+"""
+경로 로컬 서치 엔진 (시작점 고정, 끝점 자유인 경로 TSP)
+
+- 2-opt: 구간 뒤집기
+- Or-opt: 길이 1~3 구간을 다른 위치로 이동 (정/역방향)
+- 모든 이동은 바뀌는 간선만으로 O(1) 증분 평가
+- 후보 이웃 리스트 (가까운 K개) + gain 기준 조기 종료
+- don't-look bit: 주변이 바뀐 노드만 다시 탐색
+- 선택적 시간 제한 (ms)
+
+끝점 자유 경로는 모든 노드와 거리 0인 가상 종점(END)을 마지막에 고정해
+양 끝이 고정된 경로로 바꿔서 처리 (거리 행렬은 대칭 가정)
+종점이 정해진 경우(숙소 등)는 END까지의 거리를 그 종점까지의 거리로 사용
+"""
+
+import time
+from collections import deque
+
+# 거리 행렬 (중첩 리스트) - dist[a][b]
+Matrix = list[list[float]]
+
+MIN_GAIN = 1e-7
+OR_OPT_MAX_SEGMENT = 3
+
+
+class PathLocalSearch:
+    """2-opt + Or-opt 로컬 서치 (route[0] 고정)"""
+
+    def __init__(
+        self,
+        dist: Matrix,
+        route: list[int],
+        neighbor_k: int = 8,
+        time_budget_ms: float | None = None,
+        end: int | None = None,
+    ):
+        self.nodes = list(route)
+        m = len(self.nodes)
+        self.end = m
+
+        # 경로 노드만의 지역 행렬 + 가상 종점 (고정 종점이 있으면 그 거리)
+        end_costs = [dist[a][end] if end is not None else 0.0 for a in self.nodes]
+        self.d: Matrix = [
+            [dist[a][b] for b in self.nodes] + [end_costs[i]]
+            for i, a in enumerate(self.nodes)
+        ] + [end_costs + [0.0]]
+
+        # 가까운 순 이웃 (가상 종점 제외)
+        k = max(1, min(neighbor_k, m - 1))
+        self.neighbors = [
+            sorted((b for b in range(m) if b != a), key=self.d[a].__getitem__)[:k]
+            for a in range(m)
+        ]
+
+        self.route = list(range(m + 1))
+        self.pos = list(range(m + 1))
+        self.deadline = (
+            time.perf_counter() + time_budget_ms / 1000 if time_budget_ms else None
+        )
+        self.moves = 0
+
+    def _reverse(self, i: int, j: int) -> None:
+        """route[i..j] 뒤집기"""
+        route, pos = self.route, self.pos
+        route[i : j + 1] = route[i : j + 1][::-1]
+        for idx in range(i, j + 1):
+            pos[route[idx]] = idx
+
+    def _try_two_opt(self, x: int) -> list[int] | None:
+        """간선 (x, y)를 빼고 (x, c)를 넣는 2-opt 이동"""
+        d, route, pos = self.d, self.route, self.pos
+        p = pos[x]
+        dx = d[x]
+
+        # y = 다음 노드 (이웃 c의 다음 노드 e와 연결)
+        y = route[p + 1]
+        dxy = dx[y]
+        for c in self.neighbors[x]:
+            dxc = dx[c]
+            if dxc >= dxy:
+                break
+            q = pos[c]
+            if q == p + 1 or q == p - 1:
+                continue
+            e = route[q + 1]
+            if dxc + d[y][e] - dxy - d[c][e] < -MIN_GAIN:
+                if q > p:
+                    self._reverse(p + 1, q)
+                else:
+                    self._reverse(q + 1, p)
+                return [x, y, c, e]
+
+        # y = 이전 노드 (이웃 c의 이전 노드 e와 연결)
+        if p == 0:
+            return None
+        y = route[p - 1]
+        dxy = dx[y]
+        for c in self.neighbors[x]:
+            dxc = dx[c]
+            if dxc >= dxy:
+                break
+            q = pos[c]
+            if q == 0 or q == p + 1 or q == p - 1:
+                continue
+            e = route[q - 1]
+            if dxc + d[y][e] - dxy - d[c][e] < -MIN_GAIN:
+                if q > p:
+                    self._reverse(p, q - 1)
+                else:
+                    self._reverse(q, p - 1)
+                return [x, y, c, e]
+
+        return None
+
+    def _try_or_opt(self, x: int) -> list[int] | None:
+        """x가 끝인 구간(1~3개)을 떼어 이웃 c 옆에 다시 끼우는 이동"""
+        d, route, pos = self.d, self.route, self.pos
+        p = pos[x]
+        if p == 0:
+            return None
+        last = self.end  # 가상 종점 위치 (= 노드 수)
+        dx = d[x]
+        neighbors = self.neighbors[x]
+        nearest = dx[neighbors[0]]
+
+        for length in range(1, OR_OPT_MAX_SEGMENT + 1):
+            # x로 시작하는 구간, x로 끝나는 구간 (길이 1은 같은 구간)
+            for i in (p, p - length + 1) if length > 1 else (p,):
+                j = i + length - 1
+                if i < 1 or j >= last:
+                    continue
+                s0, s1 = route[i], route[j]
+                prev, nxt = route[i - 1], route[j + 1]
+                remove_gain = d[prev][s0] + d[s1][nxt] - d[prev][nxt]
+                # 새 간선 (x, c)가 제거 이득보다 짧아야 개선 가능
+                if remove_gain <= nearest:
+                    continue
+
+                d0, d1 = d[s0], d[s1]
+                for c in neighbors:
+                    if dx[c] >= remove_gain:
+                        break
+                    q = pos[c]
+                    if i <= q <= j:
+                        continue
+
+                    # c 뒤/앞 간격 (route[gap], route[gap+1]) - 제자리 간격, 종점 뒤 제외
+                    for gap in (q, q - 1):
+                        if gap < 0 or gap >= last or i - 1 <= gap <= j:
+                            continue
+                        left, right = route[gap], route[gap + 1]
+                        base = d[left][right] + remove_gain - MIN_GAIN
+                        dl = d[left]
+                        forward = dl[s0] + d1[right]
+                        backward = dl[s1] + d0[right]
+                        if forward < base or backward < base:
+                            self._move_segment(i, j, gap, backward < forward)
+                            return [s0, s1, prev, nxt, left, right]
+
+        return None
+
+    def _move_segment(self, i: int, j: int, gap: int, reverse: bool) -> None:
+        """route[i..j]를 떼어 route[gap]과 route[gap+1] 사이에 삽입"""
+        route = self.route
+        segment = route[i : j + 1]
+        if reverse:
+            segment.reverse()
+        if gap < i:
+            route[gap + 1 : j + 1] = segment + route[gap + 1 : i]
+            lo, hi = gap + 1, j
+        else:
+            route[i : gap + 1] = route[j + 1 : gap + 1] + segment
+            lo, hi = i, gap
+        pos = self.pos
+        for idx in range(lo, hi + 1):
+            pos[route[idx]] = idx
+
+    def run(self) -> list[int]:
+        """개선 이동이 없을 때까지 (또는 시간 제한까지) 반복 → 원래 노드 번호 경로"""
+        end = self.end
+        if end > 2:
+            active = deque(range(end))
+            # 가상 종점은 탐색 대상이 아니므로 항상 "큐에 있음"으로 둠
+            in_queue = [True] * (end + 1)
+
+            while active:
+                if self.deadline is not None and time.perf_counter() > self.deadline:
+                    break
+
+                x = active.popleft()
+                in_queue[x] = False
+
+                touched = self._try_two_opt(x) or self._try_or_opt(x)
+                if touched:
+                    self.moves += 1
+                    # 바뀐 간선에 닿은 노드의 don't-look bit 해제
+                    for node in touched + [x]:
+                        if not in_queue[node]:
+                            in_queue[node] = True
+                            active.append(node)
+
+        return [self.nodes[v] for v in self.route[:-1]]
+
+
+def optimize_path(
+    dist: Matrix,
+    route: list[int],
+    neighbor_k: int = 8,
+    time_budget_ms: float | None = None,
+    end: int | None = None,
+) -> list[int]:
+    """경로 개선 (route[0] 고정) - 2-opt + Or-opt
+
+    end가 있으면 route 밖의 그 장소에서 끝난다고 보고 최적화 (결과에는 미포함)
+    """
+    if len(route) <= 2:
+        return list(route)
+    if len(route) == 3 and end is None:
+        # 시작점 뒤 두 곳의 순서만 비교
+        a, b, c = route
+        return [a, c, b] if dist[a][c] + dist[c][b] < dist[a][b] + dist[b][c] - MIN_GAIN else list(route)
+    return PathLocalSearch(dist, route, neighbor_k, time_budget_ms, end).run()
+
+
+def path_length(dist: Matrix, route: list[int]) -> float:
+    """경로 총 길이"""
+    return sum(dist[route[i]][route[i + 1]] for i in range(len(route) - 1))
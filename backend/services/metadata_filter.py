@@ -0,0 +1,47 @@
+"""
+로컬 메타데이터 필터
+SearchFilter → 장소 저장소 행 단위 boolean mask (벡터화)
+
+build_pinecone_filter와 같은 규칙:
+- 값이 비어 있는(falsy) 조건은 무시 (maxCost=0, minRating=0 포함)
+- category/categories, region/regions는 모두 AND 결합
+- styles는 Pinecone 필터로 변환되지 않으므로 여기서도 적용하지 않음
+"""
+
+import numpy as np
+
+from models.schemas import SearchFilter
+from .place_store import PlaceStore, CATEGORIES, REGIONS
+
+
+def _code_mask(codes: np.ndarray, vocabulary: tuple[str, ...], values: list[str]) -> np.ndarray:
+    """문자열 값 목록 → 코드 컬럼 mask (사전에 없는 값은 매칭 없음)"""
+    wanted = [vocabulary.index(v) for v in values if v in vocabulary]
+    return np.isin(codes, wanted)
+
+
+def build_filter_mask(filter: SearchFilter | None, store: PlaceStore) -> np.ndarray | None:
+    """SearchFilter → 행 mask (조건이 없으면 None)"""
+    if filter is None:
+        return None
+
+    mask: np.ndarray | None = None
+
+    def _and(condition: np.ndarray) -> None:
+        nonlocal mask
+        mask = condition if mask is None else mask & condition
+
+    if filter.category:
+        _and(_code_mask(store.category_code, CATEGORIES, [filter.category]))
+    if filter.categories:
+        _and(_code_mask(store.category_code, CATEGORIES, filter.categories))
+    if filter.region:
+        _and(_code_mask(store.region_code, REGIONS, [filter.region]))
+    if filter.regions:
+        _and(_code_mask(store.region_code, REGIONS, filter.regions))
+    if filter.maxCost:
+        _and(store.avg_cost <= filter.maxCost)
+    if filter.minRating:
+        _and(store.rating >= filter.minRating)
+
+    return mask
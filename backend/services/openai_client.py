@@ -1,12 +1,18 @@
 """
 OpenAI API 클라이언트
 GPT-4o를 사용한 AI 생성
+
+- 프로세스당 비동기 클라이언트 1개를 모든 서비스가 공유 (httpx 커넥션 풀)
+- 호출이 이벤트 루프를 막지 않으므로 워커 1개가 여러 생성/채팅 요청을 동시에 처리
 """
 
 import os
 import json
+import threading
 from pathlib import Path
-from openai import OpenAI
+from typing import AsyncIterator
+import httpx
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
 # .env 파일 경로 명시적 지정
@@ -17,22 +23,51 @@ print(f"[DEBUG] OpenAI client loaded from: {__file__}")
 print(f"[DEBUG] .env path: {env_path}")
 print(f"[DEBUG] OPENAI_API_KEY exists: {bool(os.getenv('OPENAI_API_KEY'))}")
 
-_client: OpenAI | None = None
+# 공유 커넥션 풀 / 타임아웃 (초)
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "20"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "10"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+_client: AsyncOpenAI | None = None
+_client_lock = threading.Lock()
 
 
-def get_openai_client() -> OpenAI:
-    """OpenAI 클라이언트 싱글톤"""
+def get_openai_client() -> AsyncOpenAI:
+    """비동기 OpenAI 클라이언트 싱글톤 (커넥션 풀 공유)"""
     global _client
 
-    if _client is None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
-        _client = OpenAI(api_key=api_key)
+    with _client_lock:
+        if _client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
+            _client = AsyncOpenAI(
+                api_key=api_key,
+                max_retries=OPENAI_MAX_RETRIES,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=OPENAI_MAX_CONNECTIONS,
+                        max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+                    ),
+                    timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+                ),
+            )
 
     return _client
 
 
+async def close_openai_client() -> None:
+    """종료 시 커넥션 풀 정리"""
+    global _client
+
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        await client.close()
+
+
 async def generate_with_openai(
     system_prompt: str,
     user_prompt: str,
@@ -43,7 +78,7 @@ async def generate_with_openai(
     """OpenAI API 호출"""
     client = get_openai_client()
 
-    response = client.chat.completions.create(
+    response = await client.chat.completions.create(
         model=model,
         max_tokens=max_tokens,
         temperature=temperature,
@@ -71,7 +106,11 @@ async def generate_json_with_openai(
         model=model
     )
 
-    # JSON 추출
+    return parse_json_response(response)
+
+
+def parse_json_response(response: str) -> dict:
+    """모델 응답 텍스트 → JSON (```json 코드 블록 허용)"""
     try:
         # ```json ... ``` 블록 추출
         if "```json" in response:
@@ -86,3 +125,34 @@ async def generate_json_with_openai(
         print(f"JSON 파싱 오류: {e}")
         print(f"원본 응답: {response[:500]}")
         raise ValueError(f"OpenAI 응답을 JSON으로 파싱할 수 없습니다: {e}")
+
+
+async def stream_with_openai(
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int = 4096,
+    temperature: float = 0.7,
+    model: str = "gpt-4o"
+) -> AsyncIterator[str]:
+    """OpenAI 스트리밍 호출 - 생성되는 텍스트 조각을 순서대로 전달
+
+    호출 측이 중간에 멈추면(aclose/취소) 스트림을 닫아 생성 중단
+    """
+    client = get_openai_client()
+
+    stream = await client.chat.completions.create(
+        model=model,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        stream=True,
+    )
+    try:
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        await stream.close()
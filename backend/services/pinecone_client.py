@@ -13,6 +13,9 @@ load_dotenv(dotenv_path=env_path)
 
 INDEX_NAME = "jeju-places"
 
+# 벡터 인덱스 백엔드: "pinecone" (원격) | "local" (메모리 NumPy 인덱스)
+VECTOR_INDEX_BACKEND = os.getenv("VECTOR_INDEX_BACKEND", "pinecone").lower()
+
 _pinecone_client: Pinecone | None = None
 
 
@@ -30,6 +33,11 @@ def get_pinecone_client() -> Pinecone:
 
 
 def get_jeju_places_index():
-    """제주 장소 인덱스 반환"""
+    """제주 장소 인덱스 반환 (VECTOR_INDEX_BACKEND 설정에 따라 선택)"""
+    if VECTOR_INDEX_BACKEND == "local":
+        from .local_index import get_local_index
+
+        return get_local_index()
+
     client = get_pinecone_client()
     return client.Index(INDEX_NAME)
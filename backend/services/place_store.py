@@ -0,0 +1,183 @@
+"""
+장소 저장소 (컬럼형)
+places.json을 Pydantic 객체 목록 대신 컬럼 배열로 보관
+
+- 수치 컬럼: NumPy 배열 (위도/경도/비용/평점/소요시간)
+- 카테고리/지역: 정수 코드 (intern), 지역은 로드 시 벡터화 분류
+- id → 행 번호 인덱스 (O(1) 조회)
+- 카테고리별/지역별 행 목록 사전 계산
+- 공간 인덱스 (격자 버킷) 사전 구축
+- Place 모델은 API 응답 시점에만 생성
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from models.schemas import Place, WaitingInfo
+from .jeju_regions import JEJU_REGIONS, classify_regions
+from .spatial_index import SpatialGrid
+
+DATA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "data",
+    "places.json",
+)
+
+CATEGORIES: tuple[str, ...] = ("관광지", "맛집", "카페", "숙소")
+REGIONS: tuple[str, ...] = tuple(JEJU_REGIONS.keys()) + ("기타",)
+
+
+class PlaceStore:
+    """컬럼형 장소 저장소"""
+
+    def __init__(self, records: list[dict], version: str = ""):
+        n = len(records)
+        self.version = version
+        self.size = n
+
+        self.ids: list[str] = [r["id"] for r in records]
+        self.row_of: dict[str, int] = {place_id: i for i, place_id in enumerate(self.ids)}
+
+        # 수치 컬럼
+        self.latitude = np.fromiter((r["latitude"] for r in records), np.float64, n)
+        self.longitude = np.fromiter((r["longitude"] for r in records), np.float64, n)
+        self.avg_cost = np.fromiter((r.get("avg_cost", 0) for r in records), np.int32, n)
+        self.avg_time = np.fromiter((r.get("avg_time", 60) for r in records), np.int32, n)
+        self.rating = np.fromiter((r.get("rating", 0.0) for r in records), np.float64, n)
+
+        # 카테고리/지역 코드
+        category_index = {c: i for i, c in enumerate(CATEGORIES)}
+        self.category_code = np.fromiter(
+            (category_index[r["category"]] for r in records), np.int8, n
+        )
+        # 지역은 한 번의 벡터화 계산 (REGIONS 앞부분 = JEJU_REGIONS 순서)
+        self.region_code = (
+            classify_regions(self.latitude, self.longitude).astype(np.int8)
+            if n
+            else np.zeros(0, dtype=np.int8)
+        )
+
+        # 문자열 컬럼 (응답 생성 시에만 사용)
+        self.name: list[str] = [r["name"] for r in records]
+        self.subcategory: list[str] = [r.get("subcategory", "") for r in records]
+        self.description: list[str] = [r.get("description", "") for r in records]
+        self.address: list[str] = [r.get("address", "") for r in records]
+        self.style_tags: list[tuple[str, ...]] = [
+            tuple(r.get("style_tags", [])) for r in records
+        ]
+        self.image_url: list[str] = [r.get("image_url", "") for r in records]
+        self.naver_link: list[str] = [r.get("naver_link", "") for r in records]
+        self.waiting_info: list[dict | None] = [r.get("waitingInfo") for r in records]
+
+        # 카테고리별/지역별 행 목록 (원본 순서 유지)
+        self.rows_by_category: dict[str, np.ndarray] = {
+            c: np.flatnonzero(self.category_code == i) for i, c in enumerate(CATEGORIES)
+        }
+        self.rows_by_region: dict[str, np.ndarray] = {
+            r: np.flatnonzero(self.region_code == i) for i, r in enumerate(REGIONS)
+        }
+
+        # 공간 인덱스 (반경/kNN 검색)
+        self.spatial = SpatialGrid(self.latitude, self.longitude)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, place_id: str) -> bool:
+        return place_id in self.row_of
+
+    def category_of(self, row: int) -> str:
+        return CATEGORIES[self.category_code[row]]
+
+    def region_of(self, row: int) -> str:
+        return REGIONS[self.region_code[row]]
+
+    def place(self, row: int) -> Place:
+        """행 번호 → Place 모델 (API 응답용)"""
+        waiting_info = self.waiting_info[row]
+        return Place(
+            id=self.ids[row],
+            name=self.name[row],
+            category=self.category_of(row),
+            subcategory=self.subcategory[row],
+            description=self.description[row],
+            address=self.address[row],
+            latitude=float(self.latitude[row]),
+            longitude=float(self.longitude[row]),
+            avg_cost=int(self.avg_cost[row]),
+            avg_time=int(self.avg_time[row]),
+            style_tags=list(self.style_tags[row]),
+            image_url=self.image_url[row],
+            naver_link=self.naver_link[row],
+            rating=float(self.rating[row]),
+            waitingInfo=WaitingInfo(**waiting_info) if waiting_info else None,
+        )
+
+    def nearby(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float | None = None,
+        k: int | None = None,
+        category: str | None = None,
+        min_rating: float | None = None,
+        exclude_ids: list[str] | None = None,
+    ) -> list[tuple[int, float]]:
+        """주변 장소 검색 → [(행 번호, 거리 km)] 가까운 순
+
+        k가 있으면 kNN (radius_km는 최대 거리), 없으면 반경 검색
+        """
+        mask = np.ones(self.size, dtype=bool)
+        if category:
+            mask &= self.category_code == (
+                CATEGORIES.index(category) if category in CATEGORIES else -1
+            )
+        if min_rating:
+            mask &= self.rating >= min_rating
+        for place_id in exclude_ids or []:
+            row = self.row_of.get(place_id)
+            if row is not None:
+                mask[row] = False
+
+        if k is not None:
+            rows, dist = self.spatial.nearest(lat, lng, k, mask, max_radius_km=radius_km)
+        else:
+            rows, dist = self.spatial.within_radius(lat, lng, radius_km or 3.0, mask)
+
+        return [(int(r), float(d)) for r, d in zip(rows, dist)]
+
+    def get(self, place_id: str) -> Place | None:
+        """id → Place 모델 (없으면 None)"""
+        row = self.row_of.get(place_id)
+        return self.place(row) if row is not None else None
+
+    def places(self, rows) -> list[Place]:
+        """행 번호 목록 → Place 모델 목록"""
+        return [self.place(int(row)) for row in rows]
+
+
+_place_store: PlaceStore | None = None
+_place_store_lock = threading.Lock()
+
+
+def load_place_store(path: str = DATA_PATH) -> PlaceStore:
+    """places.json → PlaceStore (버전: 파일 내용 해시)"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    version = hashlib.sha1(raw).hexdigest()[:12]
+    return PlaceStore(json.loads(raw.decode("utf-8")), version=version)
+
+
+def get_place_store() -> PlaceStore:
+    """장소 저장소 싱글톤"""
+    global _place_store
+
+    with _place_store_lock:
+        if _place_store is None:
+            _place_store = load_place_store()
+
+    return _place_store
@@ -75,6 +75,7 @@ def build_system_prompt(input: TripInput, season: dict) -> str:
 4. 각 장소의 소요 시간과 이동 시간을 고려하세요
 5. 아침/점심/저녁 식사 시간을 적절히 배치하세요
 6. 마지막 날은 공항 이동 시간을 고려하세요
+7. 장소는 목록의 ID(placeId)로만 지정하고 time, duration 외 정보(이름, 좌표, 비용 등)는 쓰지 마세요
 
 ## 카테고리별 배치 가이드
 - 관광지: 오전/오후에 배치 (체력 소모 고려)
@@ -88,19 +89,8 @@ def build_system_prompt(input: TripInput, season: dict) -> str:
   "schedule": [
     {{
       "day": 1,
-      "date": "1월 15일 (월)",
       "places": [
-        {{
-          "time": "09:00",
-          "placeId": "spot-1",
-          "name": "장소명",
-          "category": "관광지|맛집|카페|숙소",
-          "description": "설명",
-          "cost": 10000,
-          "duration": 60,
-          "latitude": 33.xxxx,
-          "longitude": 126.xxxx
-        }}
+        {{"placeId": "spot-1", "time": "09:00", "duration": 60}}
       ]
     }}
   ]
@@ -108,6 +98,17 @@ def build_system_prompt(input: TripInput, season: dict) -> str:
 ```"""
 
 
+def get_trip_dates(days: int) -> list[str]:
+    """오늘부터 days일의 표시 날짜 목록 ("1월 15일 (월)")"""
+    start_date = datetime.now()
+    dates = []
+    weekdays = ["월", "화", "수", "목", "금", "토", "일"]
+    for i in range(days):
+        d = start_date + timedelta(days=i)
+        dates.append(f"{d.month}월 {d.day}일 ({weekdays[d.weekday()]})")
+    return dates
+
+
 def build_user_prompt(
     input: TripInput,
     places: list[Place],
@@ -138,12 +139,7 @@ def build_user_prompt(
             weather_text += f"- {w.date} ({w.dayOfWeek}): {w.condition}, {w.temperature['min']}~{w.temperature['max']}°C, 강수확률 {w.precipitation['chance']}%\n"
 
     # 날짜 계산
-    start_date = datetime.now()
-    dates = []
-    weekdays = ["월", "화", "수", "목", "금", "토", "일"]
-    for i in range(input.days):
-        d = start_date + timedelta(days=i)
-        dates.append(f"{d.month}월 {d.day}일 ({weekdays[d.weekday()]})")
+    dates = get_trip_dates(input.days)
 
     return f"""## 여행 조건
 - 예산: {input.budget:,}원
@@ -160,7 +156,7 @@ def build_user_prompt(
 {places_text}
 
 위 조건과 장소 목록을 바탕으로 최적의 여행 일정을 JSON 형식으로 생성해주세요.
-각 장소의 placeId, latitude, longitude를 정확히 포함해주세요."""
+각 장소는 목록에 있는 ID를 placeId로 정확히 쓰고 time, duration만 포함해주세요."""
 
 
 def build_chat_prompt(
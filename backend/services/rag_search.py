@@ -1,58 +1,107 @@
 """
 RAG 검색 모듈
-- 쿼리 확장 (Query Expansion)
-- 하이브리드 검색 (Vector + Keyword)
+- 쿼리 확장 (Query Expansion) - 템플릿 쿼리별 확장 결과 캐시
+  (확장 결과가 매번 같아야 결합 쿼리 임베딩도 캐시에 hit)
+- 하이브리드 검색 (Vector + Keyword BM25)
+- 멀티 쿼리 검색 (배치 임베딩 + Reciprocal Rank Fusion)
 - 메타데이터 필터링
 """
 
 import os
 import json
+import asyncio
+import numpy as np
 from typing import Optional
 from pathlib import Path
-from openai import OpenAI
 from dotenv import load_dotenv
 
-from .pinecone_client import get_jeju_places_index
+from .pinecone_client import get_jeju_places_index, VECTOR_INDEX_BACKEND
+from .cache import TTLCache, SingleFlight
+from .embedding_cache import get_embedding_cache, normalize_text
+from .keyword_index import KeywordIndex
+from .place_store import get_place_store
+from .metadata_filter import build_filter_mask
+from .openai_client import get_openai_client
 from models.schemas import Place, SearchFilter, RAGSearchResult
 
 # .env 파일 경로 명시적 지정
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 EMBEDDING_MODEL = "text-embedding-3-small"
 
-# 장소 데이터 로드
-_places_cache: list[Place] | None = None
+# 멀티 쿼리 모드: 확장 쿼리별로 따로 검색 후 장소 단위로 결과 융합
+RAG_MULTI_QUERY = os.getenv("RAG_MULTI_QUERY", "false").lower() == "true"
+RAG_FUSION = os.getenv("RAG_FUSION", "rrf")  # "rrf" | "max"
+RRF_K = 60
 
+# 쿼리 확장 결과 캐시 (정규화된 원본 쿼리 키, 실패한 확장은 저장하지 않음)
+expansion_cache = TTLCache(
+    max_size=int(os.getenv("QUERY_EXPANSION_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("QUERY_EXPANSION_CACHE_TTL", str(24 * 3600))),
+)
+expansion_flight = SingleFlight()
 
-def load_places() -> list[Place]:
-    """places.json 로드 (캐싱)"""
-    global _places_cache
+_keyword_index: KeywordIndex | None = None
 
-    if _places_cache is None:
-        # backend 폴더 기준으로 상위의 data 폴더 참조
-        data_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-            "data",
-            "places.json",
+
+def get_keyword_index() -> KeywordIndex:
+    """장소 저장소 기반 키워드 역색인 (로드 시 1회 구축)"""
+    global _keyword_index
+
+    if _keyword_index is None:
+        _keyword_index = KeywordIndex(get_place_store())
+
+    return _keyword_index
+
+
+async def embed_query(text: str) -> list[float]:
+    """쿼리 임베딩 생성 (임베딩 캐시 우선 조회)"""
+    return (await embed_queries([text]))[0]
+
+
+async def embed_queries(texts: list[str]) -> list[list[float]]:
+    """여러 쿼리 임베딩을 한 번의 배치 호출로 생성 (캐시 miss만 요청)"""
+    cache = get_embedding_cache()
+    vectors = await cache.aget_many(EMBEDDING_MODEL, texts)
+
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    if missing:
+        embedding_response = await get_openai_client().embeddings.create(
+            model=EMBEDDING_MODEL, input=[texts[i] for i in missing]
         )
-        with open(data_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            _places_cache = [Place(**p) for p in data]
+        for i, item in zip(missing, embedding_response.data):
+            vectors[i] = item.embedding
+        cache.set_many(EMBEDDING_MODEL, [(texts[i], vectors[i]) for i in missing])
 
-    return _places_cache
+    return vectors
 
 
 async def expand_query(query: str) -> list[str]:
-    """쿼리 확장: 사용자 쿼리를 LLM으로 확장"""
+    """쿼리 확장: 사용자 쿼리를 LLM으로 확장 (같은 쿼리는 캐시된 확장 결과 재사용)"""
+    key = normalize_text(query)
+    expanded = expansion_cache.get(key)
+    if expanded is not None:
+        return list(expanded)
+
     try:
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """당신은 제주도 여행 검색 쿼리 확장 전문가입니다.
+        expanded = await expansion_flight.do(key, lambda: _expand_query_llm(query))
+    except Exception as e:
+        print(f"쿼리 확장 실패: {e}")
+        return [query]
+
+    expansion_cache.set(key, expanded)
+    return list(expanded)
+
+
+async def _expand_query_llm(query: str) -> list[str]:
+    """gpt-4o-mini 쿼리 확장 호출 (JSON 배열이 없으면 ValueError)"""
+    response = await get_openai_client().chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {
+                "role": "system",
+                "content": """당신은 제주도 여행 검색 쿼리 확장 전문가입니다.
 사용자의 검색어를 받아서 의미적으로 유사한 다양한 표현으로 확장합니다.
 
 규칙:
@@ -64,28 +113,23 @@ async def expand_query(query: str) -> list[str]:
 예시:
 입력: "조용한 카페"
 출력: ["조용한 카페", "한적한 카페", "여유로운 카페", "붐비지 않는 카페", "힐링 카페"]""",
-                },
-                {"role": "user", "content": f'검색어: "{query}"'},
-            ],
-            temperature=0.7,
-            max_tokens=200,
-        )
-
-        content = response.choices[0].message.content or "[]"
-
-        # JSON 추출
-        import re
+            },
+            {"role": "user", "content": f'검색어: "{query}"'},
+        ],
+        temperature=0.7,
+        max_tokens=200,
+    )
 
-        json_match = re.search(r"\[[\s\S]*\]", content)
-        if json_match:
-            expanded = json.loads(json_match.group())
-            return [query] + [q for q in expanded if q != query]
+    content = response.choices[0].message.content or "[]"
 
-        return [query]
+    # JSON 추출
+    import re
 
-    except Exception as e:
-        print(f"쿼리 확장 실패: {e}")
-        return [query]
+    json_match = re.search(r"\[[\s\S]*\]", content)
+    if not json_match:
+        raise ValueError(f"JSON 배열 없음: {content[:50]}")
+    expanded = json.loads(json_match.group())
+    return [query] + [q for q in expanded if q != query]
 
 
 def build_pinecone_filter(filter: SearchFilter) -> dict | None:
@@ -112,36 +156,6 @@ def build_pinecone_filter(filter: SearchFilter) -> dict | None:
     return {"$and": conditions}
 
 
-def calculate_keyword_score(place: Place, queries: list[str]) -> float:
-    """키워드 매칭 점수 계산"""
-    score = 0
-    name_lower = place.name.lower()
-    category_lower = place.category.lower()
-    subcategory_lower = (place.subcategory or "").lower()
-    desc_lower = (place.description or "").lower()
-    tags = [t.lower() for t in (place.style_tags or [])]
-
-    for query in queries:
-        keywords = query.lower().split()
-
-        for keyword in keywords:
-            if len(keyword) < 2:
-                continue
-
-            if keyword in name_lower:
-                score += 10
-            if keyword in category_lower:
-                score += 5
-            if keyword in subcategory_lower:
-                score += 4
-            if any(keyword in t for t in tags):
-                score += 3
-            if keyword in desc_lower:
-                score += 2
-
-    return min(score / 30, 1)
-
-
 def extract_filter_from_query(query: str) -> SearchFilter:
     """쿼리에서 필터 추출"""
     filter = SearchFilter()
@@ -177,6 +191,101 @@ def extract_filter_from_query(query: str) -> SearchFilter:
     return filter
 
 
+def aggregate_matches(matches) -> dict[str, dict]:
+    """장소별로 집계 (같은 장소의 여러 벡터 → 최고 점수 사용)"""
+    place_scores: dict[str, dict] = {}
+
+    for match in matches or []:
+        place_id = match.metadata.get("placeId", "")
+        vector_score = match.score or 0
+        vector_type = match.metadata.get("vectorType", "")
+
+        existing = place_scores.get(place_id)
+        if not existing or vector_score > existing["vectorScore"]:
+            place_scores[place_id] = {
+                "vectorScore": vector_score,
+                "vectorType": vector_type,
+                "metadata": match.metadata,
+            }
+
+    return place_scores
+
+
+def vector_search(
+    query_vector: list[float],
+    top_k: int,
+    pinecone_filter: dict | None,
+    place_mask: np.ndarray | None = None,
+) -> dict[str, dict]:
+    """단일 벡터 검색 → 장소별 점수
+
+    로컬 인덱스는 메타데이터가 장소 저장소와 일치하면 place_mask, 아니면 pinecone_filter로 후보 제한
+    """
+    index = get_jeju_places_index()
+    if VECTOR_INDEX_BACKEND == "local":
+        search_result = index.query(
+            vector=query_vector,
+            top_k=top_k,
+            include_metadata=True,
+            filter=pinecone_filter,
+            place_mask=place_mask,
+        )
+    else:
+        search_result = index.query(
+            vector=query_vector,
+            top_k=top_k,  # 멀티벡터이므로 호출부에서 더 많이 요청
+            include_metadata=True,
+            filter=pinecone_filter,
+        )
+    return aggregate_matches(search_result.matches)
+
+
+def fuse_place_scores(
+    per_query: list[dict[str, dict]], fusion: str = RAG_FUSION
+) -> dict[str, dict]:
+    """쿼리별 장소 점수 융합 (RRF 또는 max-sim)
+
+    vectorScore는 쿼리 중 최고 코사인 점수, fusedScore는 0~1로 정규화한 융합 점수
+    """
+    fused: dict[str, dict] = {}
+    max_rrf = len(per_query) / (RRF_K + 1)
+
+    for place_scores in per_query:
+        ranked = sorted(
+            place_scores.items(), key=lambda x: x[1]["vectorScore"], reverse=True
+        )
+        for rank, (place_id, data) in enumerate(ranked, start=1):
+            entry = fused.get(place_id)
+            if entry is None:
+                entry = fused[place_id] = {**data, "rrf": 0.0}
+            elif data["vectorScore"] > entry["vectorScore"]:
+                entry.update(data)
+            entry["rrf"] += 1 / (RRF_K + rank)
+
+    for entry in fused.values():
+        rrf = entry.pop("rrf")
+        entry["fusedScore"] = rrf / max_rrf if fusion == "rrf" else entry["vectorScore"]
+
+    return fused
+
+
+async def multi_vector_search(
+    queries: list[str],
+    top_k: int,
+    pinecone_filter: dict | None,
+    place_mask: np.ndarray | None = None,
+) -> dict[str, dict]:
+    """멀티 쿼리 검색: 배치 임베딩 → 쿼리별 병렬 검색 → 결과 융합"""
+    query_vectors = await embed_queries(queries)
+    per_query = await asyncio.gather(
+        *[
+            asyncio.to_thread(vector_search, vector, top_k, pinecone_filter, place_mask)
+            for vector in query_vectors
+        ]
+    )
+    return fuse_place_scores(list(per_query))
+
+
 async def rag_search(
     query: str,
     top_k: int = 5,
@@ -184,8 +293,9 @@ async def rag_search(
     enable_query_expansion: bool = True,
     vector_weight: float = 0.7,
     keyword_weight: float = 0.3,
+    multi_query: Optional[bool] = None,
 ) -> list[RAGSearchResult]:
-    """RAG 검색 메인 함수"""
+    """RAG 검색 메인 함수 (multi_query=None이면 RAG_MULTI_QUERY 설정 사용)"""
 
     # 1. 쿼리에서 필터 자동 추출
     extracted_filter = extract_filter_from_query(query)
@@ -209,66 +319,62 @@ async def rag_search(
         expanded_queries = await expand_query(query)
         print(f"확장된 쿼리: {expanded_queries}")
 
-    # 3. 임베딩 생성
-    combined_query = " ".join(expanded_queries)
-    embedding_response = openai_client.embeddings.create(
-        model=EMBEDDING_MODEL, input=combined_query
-    )
-    query_vector = embedding_response.data[0].embedding
-
-    # 4. Pinecone 검색
-    index = get_jeju_places_index()
+    # 3~5. 벡터 검색 (장소별 최고 점수 집계)
+    store = get_place_store()
     pinecone_filter = build_pinecone_filter(merged_filter)
+    place_mask = build_filter_mask(merged_filter, store)
+    if multi_query is None:
+        multi_query = RAG_MULTI_QUERY
 
-    search_result = index.query(
-        vector=query_vector,
-        top_k=top_k * 4,  # 멀티벡터이므로 더 많이 검색
-        include_metadata=True,
-        filter=pinecone_filter,
-    )
+    if multi_query and len(expanded_queries) > 1:
+        place_scores = await multi_vector_search(
+            expanded_queries, top_k * 4, pinecone_filter, place_mask
+        )
+    else:
+        combined_query = " ".join(expanded_queries)
+        query_vector = await embed_query(combined_query)
+        place_scores = await asyncio.to_thread(
+            vector_search, query_vector, top_k * 4, pinecone_filter, place_mask
+        )
 
-    # 5. 장소별로 집계 (같은 장소의 여러 벡터 → 최고 점수 사용)
-    place_scores: dict[str, dict] = {}
+    # 6. 키워드 검색 (코퍼스 전체 BM25, 필터 적용) → 벡터 검색이 놓친 후보 추가
+    keyword_index = get_keyword_index()
+    keyword_scores = keyword_index.score(expanded_queries)
+    candidate_scores = keyword_scores if place_mask is None else keyword_scores * place_mask
 
-    for match in search_result.matches or []:
-        place_id = match.metadata.get("placeId", "")
-        vector_score = match.score or 0
-        vector_type = match.metadata.get("vectorType", "")
+    added = 0
+    for place_id, _ in keyword_index.top(candidate_scores, top_k * 2):
+        if added >= top_k:
+            break
+        if place_id not in place_scores:
+            place_scores[place_id] = {"vectorScore": 0.0, "vectorType": "keyword"}
+            added += 1
 
-        existing = place_scores.get(place_id)
-        if not existing or vector_score > existing["vectorScore"]:
-            place_scores[place_id] = {
-                "vectorScore": vector_score,
-                "vectorType": vector_type,
-                "metadata": match.metadata,
-            }
-
-    # 6. 하이브리드 점수 계산
-    places = load_places()
-    place_map = {p.id: p for p in places}
-    results: list[RAGSearchResult] = []
+    # 7. 하이브리드 점수 계산
+    scored: list[tuple[float, int, float, dict]] = []
 
     for place_id, data in place_scores.items():
-        place = place_map.get(place_id)
-        if not place:
+        row = store.row_of.get(place_id)
+        if row is None:
             continue
 
-        keyword_score = calculate_keyword_score(place, expanded_queries)
-        hybrid_score = data["vectorScore"] * vector_weight + keyword_score * keyword_weight
-
-        results.append(
-            RAGSearchResult(
-                place=place,
-                score=hybrid_score,
-                vectorScore=data["vectorScore"],
-                keywordScore=keyword_score,
-                matchedVectorType=data["vectorType"],
-            )
+        keyword_score = float(keyword_scores[row])
+        vector_component = data.get("fusedScore", data["vectorScore"])
+        hybrid_score = vector_component * vector_weight + keyword_score * keyword_weight
+        scored.append((hybrid_score, row, keyword_score, data))
+
+    # 8. 정렬 후 상위 N개만 응답 모델 생성
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [
+        RAGSearchResult(
+            place=store.place(row),
+            score=hybrid_score,
+            vectorScore=data["vectorScore"],
+            keywordScore=keyword_score,
+            matchedVectorType=data["vectorType"],
         )
-
-    # 7. 정렬 및 상위 N개 반환
-    results.sort(key=lambda x: x.score, reverse=True)
-    return results[:top_k]
+        for hybrid_score, row, keyword_score, data in scored[:top_k]
+    ]
 
 
 async def simple_rag_search(query: str, top_k: int = 5) -> list[Place]:
@@ -0,0 +1,246 @@
+"""
+도로망 기반 이동 시간
+로컬 도로망 파일(GeoJSON LineString)로 장소 간 자동차 이동 시간(분) 행렬을 미리 계산
+
+- 도로망 → networkx 그래프 (꼭짓점 = 노드, 구간 = 간선, 가중치 = 주행 분)
+- 장소를 가장 가까운 도로 노드에 스냅 (격자 공간 인덱스)
+- 스냅된 노드마다 Dijkstra 1회 → 전체 장소 × 장소 행렬 (float32, 분)
+- 행렬은 .npy로 저장하고 mmap으로 열어 여러 프로세스가 페이지 캐시를 공유
+- 메타 파일(.json)의 데이터 버전이 장소 저장소와 다르면 사용하지 않음 (직선 추정으로 폴백)
+
+빌드: python -m services.road_network [도로망.geojson]
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from .jeju_regions import haversine_distances
+from .place_store import PlaceStore, get_place_store
+from .spatial_index import SpatialGrid
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
+ROAD_NETWORK_PATH = os.getenv("ROAD_NETWORK_PATH", os.path.join(_DATA_DIR, "jeju_roads.geojson"))
+ROAD_TIMES_PATH = os.getenv("ROAD_TIMES_PATH", os.path.join(_DATA_DIR, "road_times.npy"))
+
+# 도로 등급별 기본 속도 (km/h) - maxspeed 속성이 있으면 우선
+HIGHWAY_SPEED_KMH = {
+    "motorway": 80,
+    "trunk": 70,
+    "primary": 60,
+    "secondary": 50,
+    "tertiary": 40,
+    "unclassified": 30,
+    "residential": 30,
+    "service": 20,
+}
+DEFAULT_SPEED_KMH = 35
+# 장소 ↔ 스냅 노드 접근 속도 (km/h, 직선 거리 기준)
+ACCESS_SPEED_KMH = 20
+# 대중교통 환산: 자동차 시간 × (40 / 25) + 대기 10분 (estimate_travel_time과 같은 비율)
+TRANSIT_FACTOR = 40 / 25
+TRANSIT_WAIT_MINUTES = 10
+
+
+def _edge_speed(properties: dict) -> float:
+    maxspeed = properties.get("maxspeed")
+    try:
+        if maxspeed:
+            return float(str(maxspeed).split()[0])
+    except ValueError:
+        pass
+    return HIGHWAY_SPEED_KMH.get(properties.get("highway"), DEFAULT_SPEED_KMH)
+
+
+def load_road_graph(path: str = ROAD_NETWORK_PATH):
+    """GeoJSON 도로망 → (networkx 무방향 그래프, 노드 위도, 노드 경도)
+
+    좌표는 소수점 6자리로 반올림해 같은 교차점을 하나의 노드로 합침
+    """
+    import networkx as nx
+
+    with open(path, "r", encoding="utf-8") as f:
+        features = json.load(f).get("features", [])
+
+    node_of: dict[tuple[float, float], int] = {}
+    node_lat: list[float] = []
+    node_lng: list[float] = []
+
+    def _node(lng: float, lat: float) -> int:
+        key = (round(lat, 6), round(lng, 6))
+        node = node_of.get(key)
+        if node is None:
+            node = node_of[key] = len(node_lat)
+            node_lat.append(key[0])
+            node_lng.append(key[1])
+        return node
+
+    graph = nx.Graph()
+    for feature in features:
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") == "LineString":
+            lines = [geometry["coordinates"]]
+        elif geometry.get("type") == "MultiLineString":
+            lines = geometry["coordinates"]
+        else:
+            continue
+
+        speed = _edge_speed(feature.get("properties") or {})
+        for line in lines:
+            nodes = [_node(c[0], c[1]) for c in line]
+            for a, b in zip(nodes, nodes[1:]):
+                if a == b:
+                    continue
+                km = float(haversine_distances(node_lat[a], node_lng[a], node_lat[b], node_lng[b]))
+                minutes = km / speed * 60
+                # 같은 두 노드 사이 여러 도로는 가장 빠른 것만
+                if not graph.has_edge(a, b) or graph[a][b]["minutes"] > minutes:
+                    graph.add_edge(a, b, minutes=minutes)
+
+    return graph, np.asarray(node_lat), np.asarray(node_lng)
+
+
+def build_road_times(store: PlaceStore, road_path: str = ROAD_NETWORK_PATH) -> np.ndarray:
+    """장소 × 장소 자동차 이동 시간 행렬 (분, float32)
+
+    도로로 연결되지 않은 쌍은 직선 거리 추정치(40km/h)로 채움
+    """
+    import networkx as nx
+
+    graph, node_lat, node_lng = load_road_graph(road_path)
+    node_ids = np.asarray(sorted(graph.nodes), dtype=np.int64)
+    print(f"도로망 로드: 노드 {len(node_ids)}개, 간선 {graph.number_of_edges()}개")
+
+    # 장소 → 가장 가까운 도로 노드
+    grid = SpatialGrid(node_lat[node_ids], node_lng[node_ids])
+    snapped = np.empty(store.size, dtype=np.int64)
+    access = np.empty(store.size, dtype=np.float64)
+    for row in range(store.size):
+        rows, dist = grid.nearest(float(store.latitude[row]), float(store.longitude[row]), 1)
+        snapped[row] = node_ids[rows[0]]
+        access[row] = dist[0] / ACCESS_SPEED_KMH * 60
+
+    # 스냅 노드별 Dijkstra (같은 노드에 스냅된 장소는 결과 공유)
+    unique_nodes, inverse = np.unique(snapped, return_inverse=True)
+    road = np.full((len(unique_nodes), len(unique_nodes)), np.nan, dtype=np.float64)
+    column_of = {int(node): i for i, node in enumerate(unique_nodes)}
+
+    started = time.time()
+    for i, source in enumerate(unique_nodes):
+        lengths = nx.single_source_dijkstra_path_length(graph, int(source), weight="minutes")
+        for target, minutes in lengths.items():
+            j = column_of.get(target)
+            if j is not None:
+                road[i, j] = minutes
+        if (i + 1) % 200 == 0:
+            print(f"  Dijkstra {i + 1}/{len(unique_nodes)} ({time.time() - started:.0f}s)")
+
+    times = road[np.ix_(inverse, inverse)] + access[:, None] + access[None, :]
+    np.fill_diagonal(times, 0.0)
+
+    # 도로로 닿지 않는 쌍 → 직선 거리 40km/h 추정
+    unreachable = np.isnan(times)
+    if unreachable.any():
+        straight = haversine_distances(
+            store.latitude[:, None], store.longitude[:, None],
+            store.latitude[None, :], store.longitude[None, :],
+        ) / 40 * 60
+        times[unreachable] = straight[unreachable]
+        print(f"도로 미연결 쌍 {int(unreachable.sum())}개는 직선 추정으로 대체")
+
+    return times.astype(np.float32)
+
+
+def save_road_times(times: np.ndarray, store: PlaceStore, path: str = ROAD_TIMES_PATH) -> None:
+    """행렬(.npy) + 메타(.json: 장소 데이터 버전, 크기) 저장"""
+    np.save(path, times)
+    with open(os.path.splitext(path)[0] + ".json", "w", encoding="utf-8") as f:
+        json.dump({"version": store.version, "size": store.size}, f)
+
+
+class RoadTimes:
+    """장소 간 자동차 이동 시간 행렬 (mmap, 장소 저장소 행 번호 기준)"""
+
+    def __init__(self, minutes: np.ndarray, store: PlaceStore):
+        self.minutes = minutes
+        self.store = store
+
+    def rows_for(self, place_ids: list[str | None]) -> np.ndarray | None:
+        """장소 id 목록 → 행 번호 (하나라도 모르는 장소가 있으면 None)"""
+        rows = []
+        for place_id in place_ids:
+            row = self.store.row_of.get(place_id)
+            if row is None:
+                return None
+            rows.append(row)
+        return np.asarray(rows, dtype=np.int64)
+
+    def matrix(self, rows: np.ndarray) -> np.ndarray:
+        """행 번호 목록 → 부분 행렬 (분)"""
+        return np.asarray(self.minutes[np.ix_(rows, rows)], dtype=np.float64)
+
+    def between(self, place_id_a: str, place_id_b: str) -> float | None:
+        """두 장소 간 자동차 이동 시간 (분, O(1))"""
+        a = self.store.row_of.get(place_id_a)
+        b = self.store.row_of.get(place_id_b)
+        if a is None or b is None:
+            return None
+        return float(self.minutes[a, b])
+
+
+def road_travel_minutes(car_minutes: np.ndarray, has_rentcar: bool) -> np.ndarray:
+    """자동차 이동 시간 → 이동 수단별 이동 시간 (분, 정수)"""
+    if has_rentcar:
+        return np.rint(car_minutes).astype(np.int64)
+    return np.rint(car_minutes * TRANSIT_FACTOR + TRANSIT_WAIT_MINUTES).astype(np.int64)
+
+
+_road_times: RoadTimes | None = None
+_road_times_loaded = False
+_road_times_lock = threading.Lock()
+
+
+def load_road_times(path: str = ROAD_TIMES_PATH) -> RoadTimes | None:
+    """저장된 행렬을 mmap으로 로드 (없거나 장소 데이터와 버전이 다르면 None)"""
+    meta_path = os.path.splitext(path)[0] + ".json"
+    if not os.path.exists(path) or not os.path.exists(meta_path):
+        return None
+
+    store = get_place_store()
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != store.version or meta.get("size") != store.size:
+        print(f"도로 이동시간 행렬이 장소 데이터와 다릅니다 (재빌드 필요): {path}")
+        return None
+
+    minutes = np.load(path, mmap_mode="r")
+    if minutes.shape != (store.size, store.size):
+        print(f"도로 이동시간 행렬 크기 불일치: {minutes.shape}")
+        return None
+
+    print(f"도로 이동시간 행렬 로드: {path}")
+    return RoadTimes(minutes, store)
+
+
+def get_road_times() -> RoadTimes | None:
+    """도로 이동시간 싱글톤 (행렬이 없으면 None → 직선 거리 추정 사용)"""
+    global _road_times, _road_times_loaded
+
+    with _road_times_lock:
+        if not _road_times_loaded:
+            _road_times = load_road_times()
+            _road_times_loaded = True
+
+    return _road_times
+
+
+if __name__ == "__main__":
+    road_path = sys.argv[1] if len(sys.argv) > 1 else ROAD_NETWORK_PATH
+    place_store = get_place_store()
+    road_times = build_road_times(place_store, road_path)
+    save_road_times(road_times, place_store)
+    print(f"저장 완료: {ROAD_TIMES_PATH} ({road_times.shape[0]}×{road_times.shape[1]})")
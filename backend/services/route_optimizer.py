@@ -1,22 +1,46 @@
 """
-동선 최적화 모듈 - TSP with 2-opt + 지역 클러스터링
+동선 최적화 모듈 - TSP with 2-opt/Or-opt + 지역 클러스터링
 
 최적화 전략:
 1. 지역별 그룹핑 (제주시, 서귀포, 동부, 서부, 중산간)
 2. 최적 지역 순서 결정 (역주행 방지)
-3. 지역 내 Nearest Neighbor + 2-opt
+3. 지역 내 Nearest Neighbor + 로컬 서치 (2-opt + Or-opt, local_search.py)
 4. 효율성 점수 계산
+
+하루 장소 수가 ROUTE_EXACT_MAX_STOPS 이하이면 Held-Karp 정확해를 사용하고
+휴리스틱 결과와의 거리 차이(gap)를 함께 기록
+
+하루 일정마다 거리/이동시간 행렬을 NumPy로 한 번만 계산하고,
+모든 최적화 단계는 행렬 인덱스로 거리를 조회
+
+도로 이동시간 행렬(road_network.py)이 있으면 이동 시간은 도로 기준으로 조회하고,
+하루 장소가 모두 행렬에 있으면 경로 최적화도 도로 이동 시간(분)을 비용으로 사용
 """
 
+import os
+import time
 from typing import Any
+
+import numpy as np
+
 from .jeju_regions import (
-    haversine_distance,
-    classify_place_by_region,
-    group_places_by_region,
+    haversine_distances,
+    region_at,
     get_optimal_region_order,
     calculate_region_order_score,
 )
-from models.schemas import SchedulePlace, DaySchedule, RouteEfficiency
+from .local_search import optimize_path
+from .exact_solver import held_karp_path
+from .place_store import get_place_store
+from .road_network import get_road_times, road_travel_minutes
+from models.schemas import RouteEfficiency
+
+# 로컬 서치 설정 (시간 제한 0 = 수렴할 때까지)
+ROUTE_SEARCH_BUDGET_MS = float(os.getenv("ROUTE_SEARCH_BUDGET_MS", "0"))
+ROUTE_SEARCH_NEIGHBORS = int(os.getenv("ROUTE_SEARCH_NEIGHBORS", "8"))
+
+# 정확해(Held-Karp) 사용 최대 장소 수 (0이면 항상 휴리스틱)
+ROUTE_EXACT_MAX_STOPS = int(os.getenv("ROUTE_EXACT_MAX_STOPS", "10"))
 
 
 def estimate_travel_time(dist_km: float, has_rentcar: bool) -> int:
@@ -27,28 +51,90 @@ def estimate_travel_time(dist_km: float, has_rentcar: bool) -> int:
     return round(base_minutes if has_rentcar else base_minutes + 10)
 
 
-def reorder_places_nearest_neighbor(places: list[dict]) -> list[dict]:
-    """Nearest-neighbor로 장소 재배열 (첫 번째 장소 고정)"""
-    if len(places) <= 2:
-        return places
+def estimate_travel_times(dist: np.ndarray, has_rentcar: bool) -> np.ndarray:
+    """이동 시간 추정 (분) - 거리 행렬 전체에 대해 한 번에 계산"""
+    speed_kmh = 40 if has_rentcar else 25
+    base_minutes = dist / speed_kmh * 60
+    # 대중교통은 대기시간 10분 추가
+    return np.rint(base_minutes if has_rentcar else base_minutes + 10).astype(np.int64)
+
+
+def leg_travel_times(
+    place_ids: list[str | None], legs_km: np.ndarray, has_rentcar: bool
+) -> np.ndarray:
+    """연속 구간 이동 시간 (분) - 도로 행렬에 있는 구간은 O(1) 조회, 나머지는 직선 추정"""
+    travel_times = estimate_travel_times(legs_km, has_rentcar)
+    road = get_road_times()
+    if road is None or len(place_ids) < 2:
+        return travel_times
+
+    row_of = road.store.row_of
+    rows = [row_of.get(place_id) for place_id in place_ids]
+    for i, (a, b) in enumerate(zip(rows, rows[1:])):
+        if a is not None and b is not None:
+            travel_times[i] = road_travel_minutes(road.minutes[a, b], has_rentcar)
+    return travel_times
+
+
+def travel_time_matrix(
+    place_ids: list[str | None], dist: np.ndarray, has_rentcar: bool
+) -> np.ndarray:
+    """장소 간 이동 시간 행렬 (분) - 도로 행렬에 있는 장소 쌍은 조회, 나머지는 직선 추정"""
+    times = estimate_travel_times(dist, has_rentcar)
+    road = get_road_times()
+    if road is None:
+        return times
+
+    row_of = road.store.row_of
+    known = [(i, row_of[place_id]) for i, place_id in enumerate(place_ids) if place_id in row_of]
+    if len(known) >= 2:
+        idx = np.asarray([i for i, _ in known], dtype=np.int64)
+        rows = np.asarray([r for _, r in known], dtype=np.int64)
+        times[np.ix_(idx, idx)] = road_travel_minutes(road.matrix(rows), has_rentcar)
+    return times
+
 
-    result = [places[0]]
-    remaining = places[1:]
+def day_cost_matrix(place_ids: list[str | None], dist: np.ndarray) -> np.ndarray:
+    """경로 최적화 비용 행렬 - 모든 장소가 도로 행렬에 있으면 자동차 이동 시간(분), 아니면 거리(km)"""
+    road = get_road_times()
+    rows = road.rows_for(place_ids) if road is not None else None
+    if rows is None:
+        return dist
+    return road.matrix(rows)
+
+
+def build_distance_matrix(places: list[dict]) -> np.ndarray:
+    """장소 간 거리 행렬 (km)"""
+    lat = np.array([p["latitude"] for p in places], dtype=np.float64)
+    lng = np.array([p["longitude"] for p in places], dtype=np.float64)
+    return coordinate_distance_matrix(lat, lng)
+
+
+def coordinate_distance_matrix(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    """위경도 배열 → 거리 행렬 (km)"""
+    return haversine_distances(lat[:, None], lng[:, None], lat[None, :], lng[None, :])
+
+
+# 내부 탐색 루프는 NumPy 스칼라 인덱싱보다 빠른 중첩 리스트(dist.tolist())를 사용
+Matrix = list[list[float]]
+
+
+def _nearest_neighbor_order(dist: Matrix, indices: list[int]) -> list[int]:
+    """Nearest-neighbor 순서 (첫 번째 인덱스 고정)"""
+    if len(indices) <= 2:
+        return list(indices)
+
+    result = [indices[0]]
+    remaining = list(indices[1:])
 
     while remaining:
-        last = result[-1]
+        row = dist[result[-1]]
         nearest_idx = 0
         nearest_dist = float("inf")
 
-        for i, place in enumerate(remaining):
-            dist = haversine_distance(
-                last["latitude"],
-                last["longitude"],
-                place["latitude"],
-                place["longitude"],
-            )
-            if dist < nearest_dist:
-                nearest_dist = dist
+        for i, idx in enumerate(remaining):
+            if row[idx] < nearest_dist:
+                nearest_dist = row[idx]
                 nearest_idx = i
 
         result.append(remaining.pop(nearest_idx))
@@ -56,80 +142,49 @@ def reorder_places_nearest_neighbor(places: list[dict]) -> list[dict]:
     return result
 
 
-def two_opt_optimize(places: list[dict]) -> list[dict]:
-    """2-opt 알고리즘으로 경로 개선"""
-    if len(places) <= 3:
-        return places
+def _two_opt_order(dist: Matrix, order: list[int], end: int | None = None) -> list[int]:
+    """2-opt + Or-opt 로컬 서치 (행렬 인덱스 기반, 첫 번째 인덱스 고정, end: 고정 종점)"""
+    return optimize_path(
+        dist,
+        order,
+        neighbor_k=ROUTE_SEARCH_NEIGHBORS,
+        time_budget_ms=ROUTE_SEARCH_BUDGET_MS or None,
+        end=end,
+    )
+
+
+def _path_length(dist: np.ndarray, order: list[int]) -> float:
+    """순서대로 방문할 때의 총 거리 (km)"""
+    if len(order) < 2:
+        return 0.0
+    idx = np.asarray(order)
+    return float(dist[idx[:-1], idx[1:]].sum())
 
-    route = places.copy()
-    improved = True
-    iterations = 0
-    max_iterations = 100
-
-    while improved and iterations < max_iterations:
-        improved = False
-        iterations += 1
-
-        for i in range(1, len(route) - 2):
-            for j in range(i + 1, len(route) - 1):
-                # 현재 거리
-                current_dist = haversine_distance(
-                    route[i - 1]["latitude"],
-                    route[i - 1]["longitude"],
-                    route[i]["latitude"],
-                    route[i]["longitude"],
-                ) + haversine_distance(
-                    route[j]["latitude"],
-                    route[j]["longitude"],
-                    route[j + 1]["latitude"],
-                    route[j + 1]["longitude"],
-                )
-
-                # 뒤집었을 때 거리
-                new_dist = haversine_distance(
-                    route[i - 1]["latitude"],
-                    route[i - 1]["longitude"],
-                    route[j]["latitude"],
-                    route[j]["longitude"],
-                ) + haversine_distance(
-                    route[i]["latitude"],
-                    route[i]["longitude"],
-                    route[j + 1]["latitude"],
-                    route[j + 1]["longitude"],
-                )
-
-                # 개선되면 구간 뒤집기
-                if new_dist < current_dist - 0.1:
-                    route[i : j + 1] = reversed(route[i : j + 1])
-                    improved = True
-
-    return route
-
-
-def calculate_total_distance(places: list[dict]) -> float:
-    """총 이동거리 계산 (km)"""
-    if len(places) < 2:
-        return 0
-
-    total = 0
-    for i in range(len(places) - 1):
-        total += haversine_distance(
-            places[i]["latitude"],
-            places[i]["longitude"],
-            places[i + 1]["latitude"],
-            places[i + 1]["longitude"],
+
+def region_for_place(store, place_id: str | None, latitude: float, longitude: float) -> str:
+    """장소 지역 - 저장소에 있는 장소는 사전 계산된 지역 컬럼, 나머지는 좌표 조회"""
+    row = store.row_of.get(place_id)
+    return store.region_of(row) if row is not None else region_at(latitude, longitude)
+
+
+def place_regions(places: list[dict]) -> list[str]:
+    """장소별 지역 목록"""
+    store = get_place_store()
+    return [
+        region_for_place(
+            store, p.get("placeId") or p.get("id"), p["latitude"], p["longitude"]
         )
-    return total
+        for p in places
+    ]
 
 
-def detect_backtracking(places: list[dict]) -> dict:
-    """역주행 감지"""
+def backtracking_in_regions(regions: list[str]) -> dict:
+    """방문 순서의 지역 목록 → 역주행 (이미 떠난 지역으로 복귀) 목록"""
     details = []
 
-    if len(places) < 3:
+    if len(regions) < 3:
         return {"count": 0, "details": details}
 
-    regions = [classify_place_by_region(p["latitude"], p["longitude"]) for p in places]
     visited_regions: set[str] = set()
     last_region = regions[0]
     visited_regions.add(last_region)
@@ -149,39 +204,24 @@ def detect_backtracking(places: list[dict]) -> dict:
     return {"count": len(details), "details": details}
 
 
-def calculate_efficiency(places: list[dict], has_rentcar: bool) -> RouteEfficiency:
-    """동선 효율성 점수 계산"""
-    if not places:
-        return RouteEfficiency(
-            totalDistance=0,
-            totalTravelTime=0,
-            regionScore=100,
-            backtrackCount=0,
-            efficiencyScore=100,
-        )
-
-    total_distance = calculate_total_distance(places)
-    total_travel_time = sum(p.get("travelTime", 0) for p in places)
-
-    regions = [classify_place_by_region(p["latitude"], p["longitude"]) for p in places]
+def score_efficiency(
+    total_distance: float,
+    total_travel_time: int,
+    regions: list[str],
+    direct_distance: float | None,
+) -> RouteEfficiency:
+    """방문 순서 지역 + 거리 합계 → 효율성 점수 (direct_distance: 첫 장소 → 마지막 장소)"""
     region_score = calculate_region_order_score(regions)
 
-    backtrack_info = detect_backtracking(places)
+    backtrack_info = backtracking_in_regions(regions)
     backtrack_count = backtrack_info["count"]
     backtrack_penalty = min(backtrack_count * 10, 30)
 
     # 거리 효율성
     distance_efficiency = 100
-    if len(places) >= 2:
-        direct_distance = haversine_distance(
-            places[0]["latitude"],
-            places[0]["longitude"],
-            places[-1]["latitude"],
-            places[-1]["longitude"],
-        )
-        if direct_distance > 0:
-            ratio = total_distance / direct_distance
-            distance_efficiency = max(0, 100 - max(0, ratio - 2) * 20)
+    if direct_distance is not None and direct_distance > 0:
+        ratio = total_distance / direct_distance
+        distance_efficiency = max(0, 100 - max(0, ratio - 2) * 20)
 
     efficiency_score = round(
         region_score * 0.5 + (100 - backtrack_penalty) * 0.3 + distance_efficiency * 0.2
@@ -196,60 +236,143 @@ def calculate_efficiency(places: list[dict], has_rentcar: bool) -> RouteEfficien
     )
 
 
-def optimize_with_regions(places: list[dict]) -> list[dict]:
-    """지역 기반 최적화"""
+def _region_optimized_order(
+    places: list[dict], dist_matrix: np.ndarray, regions: list[str] | None = None
+) -> list[int]:
+    """지역 기반 최적화 순서 (행렬 인덱스)"""
+    indices = list(range(len(places)))
     if len(places) <= 2:
-        return places
+        return indices
 
-    grouped = group_places_by_region(places)
-    regions = list(grouped.keys())
+    dist = dist_matrix.tolist()
 
-    if len(regions) <= 1:
-        nn_result = reorder_places_nearest_neighbor(places)
-        return two_opt_optimize(nn_result)
+    if regions is None:
+        regions = place_regions(places)
+    grouped: dict[str, list[int]] = {}
+    for i, region in enumerate(regions):
+        grouped.setdefault(region, []).append(i)
+    region_names = list(grouped.keys())
 
-    start_region = classify_place_by_region(places[0]["latitude"], places[0]["longitude"])
-    optimal_order = get_optimal_region_order(start_region, regions)
+    if len(region_names) <= 1:
+        return _two_opt_order(dist, _nearest_neighbor_order(dist, indices))
 
-    result: list[dict] = []
+    optimal_order = get_optimal_region_order(regions[0], region_names)
+
+    result: list[int] = []
 
     for region in optimal_order:
         if region in grouped and grouped[region]:
-            region_places = grouped[region]
+            region_indices = grouped[region]
 
             if result:
-                last_place = result[-1]
-                nearest_idx = 0
-                nearest_dist = float("inf")
-
-                for i, place in enumerate(region_places):
-                    dist = haversine_distance(
-                        last_place["latitude"],
-                        last_place["longitude"],
-                        place["latitude"],
-                        place["longitude"],
-                    )
-                    if dist < nearest_dist:
-                        nearest_dist = dist
-                        nearest_idx = i
-
-                nearest = region_places[nearest_idx]
-                region_places = [nearest] + [
-                    p for i, p in enumerate(region_places) if i != nearest_idx
-                ]
-
-            nn_result = reorder_places_nearest_neighbor(region_places)
-            optimized = two_opt_optimize(nn_result)
-            result.extend(optimized)
+                # 직전 장소에서 가장 가까운 장소로 지역 진입
+                row = dist[result[-1]]
+                nearest = min(region_indices, key=row.__getitem__)
+                region_indices = [nearest] + [i for i in region_indices if i != nearest]
+
+            nn_result = _nearest_neighbor_order(dist, region_indices)
+            result.extend(_two_opt_order(dist, nn_result))
 
     # 포함되지 않은 지역 추가
-    for region in regions:
+    for region in region_names:
         if region not in optimal_order and region in grouped:
             result.extend(grouped[region])
 
     return result
 
 
+def optimize_with_regions(
+    places: list[dict], dist: np.ndarray | None = None, regions: list[str] | None = None
+) -> list[dict]:
+    """지역 기반 최적화"""
+    if len(places) <= 2:
+        return places
+    if dist is None:
+        dist = build_distance_matrix(places)
+
+    order = _region_optimized_order(places, dist, regions)
+    return [places[i] for i in order]
+
+
+def _heuristic_order(
+    places: list[dict],
+    dist: np.ndarray,
+    regions: list[str] | None = None,
+    end: int | None = None,
+) -> list[int]:
+    """휴리스틱 순서 - 지역 기반 순서와 전체 NN + 로컬 서치 중 짧은 쪽
+
+    지역 기반 순서는 지역 경계를 넘는 개선을 하지 못해 정확해보다 크게 길어질 수 있으므로
+    전체 장소를 한 번에 로컬 서치한 경로와 비교
+    """
+    n = len(places)
+    if n <= 2:
+        return list(range(n))
+
+    dist_list = dist.tolist()
+    if end is None:
+        regional = _region_optimized_order(places, dist, regions)
+        greedy = _two_opt_order(dist_list, _nearest_neighbor_order(dist_list, list(range(n))))
+    else:
+        if regions is None:
+            regions = place_regions(places)
+        # 종점을 뺀 나머지를 지역 기반으로 정렬 → 종점까지 포함해 로컬 서치
+        keep = [i for i in range(n) if i != end]
+        sub_order = _region_optimized_order(
+            keep, dist[np.ix_(keep, keep)], [regions[i] for i in keep]
+        )
+        regional = _two_opt_order(dist_list, [keep[i] for i in sub_order], end) + [end]
+        greedy = _two_opt_order(dist_list, _nearest_neighbor_order(dist_list, keep), end) + [end]
+
+    return min((regional, greedy), key=lambda order: _path_length(dist, order))
+
+
+def solve_day_order(
+    places: list[dict],
+    dist: np.ndarray,
+    regions: list[str] | None = None,
+    end: int | None = None,
+) -> tuple[list[int], dict]:
+    """하루 방문 순서 결정 - 장소 수에 따라 정확해 / 휴리스틱 선택
+
+    end: 마지막에 고정할 장소 인덱스 (숙소 등, 0이 아니어야 함)
+    반환: (순서, 솔버 정보 {solver, stops, solveMs, heuristicGap})
+    heuristicGap은 정확해 대비 휴리스틱 경로가 더 긴 비율(%)
+    """
+    n = len(places)
+    started = time.perf_counter()
+    heuristic = _heuristic_order(places, dist, regions, end)
+    heuristic_ms = (time.perf_counter() - started) * 1000
+
+    if n <= 2 or n > ROUTE_EXACT_MAX_STOPS:
+        return heuristic, {
+            "solver": "trivial" if n <= 2 else "heuristic",
+            "stops": n,
+            "solveMs": round(heuristic_ms, 2),
+            "heuristicGap": None,
+        }
+
+    started = time.perf_counter()
+    exact = (
+        held_karp_path(dist, list(range(n)))
+        if end is None
+        else held_karp_path(dist, [i for i in range(n) if i != end], end)
+    )
+    exact_ms = (time.perf_counter() - started) * 1000
+
+    optimal = _path_length(dist, exact)
+    heuristic_length = _path_length(dist, heuristic)
+    gap = (heuristic_length - optimal) / optimal * 100 if optimal > 0 else 0.0
+
+    return exact, {
+        "solver": "exact",
+        "stops": n,
+        "solveMs": round(exact_ms, 2),
+        "heuristicMs": round(heuristic_ms, 2),
+        "heuristicGap": round(max(gap, 0.0), 2),
+    }
+
+
 def parse_time(time_str: str) -> int:
     """시간 문자열 파싱 → 분"""
     parts = time_str.split(":")
@@ -263,83 +386,18 @@ def format_time(minutes: int) -> str:
     return f"{h:02d}:{m:02d}"
 
 
-def recalculate_times(places: list[dict], has_rentcar: bool) -> list[dict]:
-    """재배열 후 시간 재계산 + travelTime 설정"""
-    if not places:
-        return places
-
-    result = [p.copy() for p in places]
-    current_end = parse_time(result[0]["time"]) + result[0].get("duration", 60)
-
-    for i in range(len(result) - 1):
-        dist = haversine_distance(
-            result[i]["latitude"],
-            result[i]["longitude"],
-            result[i + 1]["latitude"],
-            result[i + 1]["longitude"],
-        )
-        travel = estimate_travel_time(dist, has_rentcar)
-        result[i]["travelTime"] = travel
-
-        next_start = current_end + travel
-        result[i + 1]["time"] = format_time(next_start)
-        current_end = next_start + result[i + 1].get("duration", 60)
-
-    return result
-
-
-def optimize_route(schedule: list[dict], has_rentcar: bool) -> list[dict]:
-    """메인 함수: 전체 스케줄 최적화"""
-    optimized_schedule = []
-
-    for day in schedule:
-        places = day.get("places", [])
-
-        # dict로 변환 (Pydantic 모델인 경우)
-        places_dicts = []
-        for p in places:
-            if hasattr(p, "model_dump"):
-                places_dicts.append(p.model_dump())
-            elif isinstance(p, dict):
-                places_dicts.append(p)
-            else:
-                places_dicts.append(dict(p))
-
-        # 지역 기반 최적화
-        optimized_order = optimize_with_regions(places_dicts)
-
-        # 시간 재계산
-        with_times = recalculate_times(optimized_order, has_rentcar)
-
-        optimized_schedule.append({
-            "day": day.get("day"),
-            "date": day.get("date"),
-            "places": with_times,
-        })
-
-    return optimized_schedule
-
-
-def analyze_schedule_efficiency(
-    schedule: list[dict], has_rentcar: bool
-) -> dict:
-    """전체 스케줄의 효율성 분석"""
-    days = []
-
-    for day in schedule:
-        places = day.get("places", [])
-        places_dicts = []
-        for p in places:
-            if hasattr(p, "model_dump"):
-                places_dicts.append(p.model_dump())
-            elif isinstance(p, dict):
-                places_dicts.append(p)
-            else:
-                places_dicts.append(dict(p))
+def format_solver_summary(days: list[tuple[Any, dict]]) -> str:
+    """일자별 솔버 정보 → 로그 한 줄"""
+    return "동선 최적화: " + ", ".join(
+        f"Day{day} {info['solver']}({info['stops']}곳"
+        + (f", gap {info['heuristicGap']}%" if info["heuristicGap"] is not None else "")
+        + f", {info['solveMs']}ms)"
+        for day, info in days
+    )
 
-        efficiency = calculate_efficiency(places_dicts, has_rentcar)
-        days.append(efficiency.model_dump())
 
+def summarize_efficiency(days: list[dict]) -> dict:
+    """일자별 효율성 → 전체 요약"""
     if not days:
         return {"days": [], "overall": RouteEfficiency().model_dump()}
 
@@ -0,0 +1,339 @@
+"""
+일정 분석 (단일 패스)
+LLM 일정 → 동선 최적화 + 시간 재계산 + 비용 breakdown + 효율성 분석
+
+- 하루마다 거리 행렬 1회 계산, 최적화/이동시간/효율성이 모두 공유
+- 장소는 SchedulePlace로 한 번만 검증하고 중간 dict 복사 없이 응답 모델 생성
+- (선택) 일자 재배치: 여행 전체를 일자별로 다시 묶은 후보가 더 짧을 때만 채택,
+  이때 숙소는 하루의 마지막에 고정
+- 일자별 경로 최적화는 프로세스 풀에서 병렬 실행
+- 도로 이동시간 행렬이 있고 여행의 모든 장소가 포함되면 경로 비용은 도로 이동 시간(분)
+- (선택) 시간 창 배치: 최적화된 순서를 식사 시간 창/혼잡 시간에 맞게 조정 (time_windows.py)
+"""
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from models.schemas import SchedulePlace, DaySchedule, CostBreakdown, TripPlan
+from .day_partitioner import lodging_index, partition_days
+from .place_store import get_place_store
+from .road_network import get_road_times
+from .route_optimizer import (
+    coordinate_distance_matrix,
+    format_solver_summary,
+    leg_travel_times,
+    format_time,
+    parse_time,
+    region_for_place,
+    score_efficiency,
+    solve_day_order,
+    summarize_efficiency,
+    travel_time_matrix,
+)
+from .time_windows import ROUTE_TIME_WINDOWS, build_day_windows
+from .worker_pool import map_tasks
+
+# 일자 재배치 + 숙소 마지막 고정 (false면 LLM이 정한 일자/순서 기준 최적화만)
+ROUTE_PARTITION_DAYS = os.getenv("ROUTE_PARTITION_DAYS", "true").lower() == "true"
+# 재배치 후보 채택 최소 개선 (거리 비용 km / 도로 이동시간 비용 분)
+PARTITION_MIN_GAIN_KM = 0.5
+PARTITION_MIN_GAIN_MINUTES = 1.0
+
+# 카테고리 → CostBreakdown 필드 (그 외는 etc)
+COST_FIELDS = {
+    "숙소": "accommodation",
+    "맛집": "food",
+    "관광지": "activity",
+    "카페": "cafe",
+}
+
+
+@dataclass
+class TripAnalytics:
+    schedule: list[DaySchedule]
+    cost_breakdown: CostBreakdown
+    route_efficiency: dict
+
+    @property
+    def total_cost(self) -> int:
+        b = self.cost_breakdown
+        return b.accommodation + b.food + b.activity + b.cafe + b.transport + b.etc
+
+    def to_trip_plan(self) -> TripPlan:
+        return TripPlan(
+            totalCost=self.total_cost,
+            costBreakdown=self.cost_breakdown,
+            schedule=self.schedule,
+            routeEfficiency=self.route_efficiency,
+        )
+
+
+def _to_schedule_place(place) -> SchedulePlace:
+    """일정 장소 (하이드레이션된 SchedulePlace 또는 dict) → SchedulePlace
+
+    SchedulePlace는 다시 검증하지 않고 얕은 복사만 (분석이 time/travelTime을 갱신하므로)
+    """
+    if isinstance(place, SchedulePlace):
+        return place.model_copy()
+    if hasattr(place, "model_dump"):
+        return SchedulePlace.model_validate(place.model_dump())
+    return SchedulePlace.model_validate(place)
+
+
+def route_day(
+    lat: list[float],
+    lng: list[float],
+    regions: list[str],
+    end: int | None = None,
+    road_rows: list[int] | None = None,
+) -> tuple[list[int], dict, float]:
+    """하루 경로 최적화 (프로세스 풀 작업 단위) → (순서, 솔버 정보, 총 비용)
+
+    road_rows(장소 저장소 행 번호)가 있으면 도로 이동 시간(분), 없으면 거리(km)가 비용
+    (도로 행렬은 작업 프로세스마다 mmap으로 열어 페이지 캐시 공유)
+    """
+    if road_rows is not None:
+        dist = get_road_times().matrix(np.asarray(road_rows, dtype=np.int64))
+    else:
+        dist = coordinate_distance_matrix(
+            np.asarray(lat, dtype=np.float64), np.asarray(lng, dtype=np.float64)
+        )
+    # solve_day_order는 regions가 주어지면 장소 개수만 사용
+    order, solver_info = solve_day_order(list(range(len(lat))), dist, regions, end)
+    idx = np.asarray(order, dtype=np.int64)
+    length = float(dist[idx[:-1], idx[1:]].sum()) if len(idx) >= 2 else 0.0
+    return order, solver_info, length
+
+
+def _road_rows(days_places: list[list[SchedulePlace]]) -> list[list[int]] | None:
+    """일자별 도로 행렬 행 번호 (도로 행렬이 없거나 모르는 장소가 하나라도 있으면 None)
+
+    여행 전체가 같은 비용 단위를 써야 일자 재배치 후보와 총 비용을 비교할 수 있음
+    """
+    road = get_road_times()
+    if road is None:
+        return None
+
+    days_rows = []
+    for places in days_places:
+        rows = road.rows_for([p.placeId for p in places])
+        if rows is None:
+            return None
+        days_rows.append(rows.tolist())
+    return days_rows
+
+
+def _route_days(
+    days_places: list[list[SchedulePlace]],
+    days_regions: list[list[str]],
+    lodging_last: bool,
+    use_road: bool = False,
+) -> list[tuple[list[int], dict, float]]:
+    """일자별 경로 최적화 (프로세스 풀에서 병렬 실행)"""
+    days_rows = _road_rows(days_places) if use_road else None
+    tasks = [
+        (
+            [p.latitude for p in places],
+            [p.longitude for p in places],
+            regions,
+            lodging_index([p.category for p in places]) if lodging_last else None,
+            days_rows[d] if days_rows is not None else None,
+        )
+        for d, (places, regions) in enumerate(zip(days_places, days_regions))
+    ]
+    return map_tasks(route_day, tasks)
+
+
+def _partition_trip(
+    days_places: list[list[SchedulePlace]], days_regions: list[list[str]], use_road: bool
+) -> tuple[list[list[SchedulePlace]], list[list[str]], list[tuple]]:
+    """일자 재배치 후보를 만들고 원래 배정과 함께 경로 최적화 → 총 비용이 작은 쪽 선택"""
+    flat = [p for places in days_places for p in places]
+    flat_regions = [r for regions in days_regions for r in regions]
+    days: list[list[int]] = []
+    offset = 0
+    for places in days_places:
+        days.append(list(range(offset, offset + len(places))))
+        offset += len(places)
+
+    candidate = partition_days(
+        np.fromiter((p.latitude for p in flat), np.float64, len(flat)),
+        np.fromiter((p.longitude for p in flat), np.float64, len(flat)),
+        [p.category for p in flat],
+        flat_regions,
+        days,
+    )
+    if candidate == days:
+        return days_places, days_regions, _route_days(days_places, days_regions, True, use_road)
+
+    candidate_places = [[flat[i] for i in rows] for rows in candidate]
+    candidate_regions = [[flat_regions[i] for i in rows] for rows in candidate]
+
+    # 원래 배정과 후보를 한 번에 병렬 최적화
+    routes = _route_days(
+        days_places + candidate_places, days_regions + candidate_regions, True, use_road
+    )
+    original_routes, candidate_routes = routes[: len(days)], routes[len(days):]
+    original_cost = sum(r[2] for r in original_routes)
+    candidate_cost = sum(r[2] for r in candidate_routes)
+    min_gain, unit = (PARTITION_MIN_GAIN_MINUTES, "분") if use_road else (PARTITION_MIN_GAIN_KM, "km")
+
+    if candidate_cost < original_cost - min_gain:
+        print(f"일자 재배치 적용: 총 이동비용 {original_cost:.1f}{unit} → {candidate_cost:.1f}{unit}")
+        return candidate_places, candidate_regions, candidate_routes
+
+    print(f"일자 재배치 유지: 후보 {candidate_cost:.1f}{unit} ≥ 원래 {original_cost:.1f}{unit}")
+    return days_places, days_regions, original_routes
+
+
+def analyze_day(
+    day: dict,
+    places: list[SchedulePlace],
+    regions: list[str],
+    order: list[int],
+    solver_info: dict,
+    has_rentcar: bool,
+    costs: dict[str, int],
+) -> tuple[DaySchedule, dict]:
+    """정해진 방문 순서로 하루 분석 → (DaySchedule, 효율성 dict), costs에 비용 누적"""
+    n = len(places)
+
+    lat = np.fromiter((p.latitude for p in places), np.float64, n)
+    lng = np.fromiter((p.longitude for p in places), np.float64, n)
+    dist = coordinate_distance_matrix(lat, lng)
+
+    # 시간 창 배치: 순서 조정 + 대기 반영 시작 시각
+    starts = None
+    time_windows = None
+    if ROUTE_TIME_WINDOWS and n >= 2:
+        travel = travel_time_matrix([p.placeId for p in places], dist, has_rentcar).tolist()
+        fixed_end = places[order[-1]].category == "숙소"
+        times = build_day_windows(places, travel).sequence(
+            order, parse_time(places[order[0]].time), fixed_end
+        )
+        time_windows = {
+            "waitMinutes": times.wait_minutes,
+            "lateMinutes": times.late_minutes,
+            "reordered": times.order != order,
+        }
+        order, starts = times.order, times.starts
+
+    ordered = [places[i] for i in order]
+    ordered_regions = [regions[i] for i in order]
+
+    # 연속 구간 거리/이동시간
+    idx = np.asarray(order, dtype=np.int64)
+    legs = dist[idx[:-1], idx[1:]] if n >= 2 else np.zeros(0)
+    if starts is not None:
+        travel_times = [travel[a][b] for a, b in zip(order, order[1:])]
+    else:
+        travel_times = leg_travel_times([p.placeId for p in ordered], legs, has_rentcar).tolist()
+
+    # 한 번의 순회로 시간 재계산 + 비용 + 이동시간 합계
+    total_travel_time = 0
+    current_end = 0
+    for i, place in enumerate(ordered):
+        if starts is not None:
+            place.time = format_time(starts[i])
+        elif i == 0:
+            current_end = parse_time(place.time) + place.duration
+        else:
+            start = current_end + travel_times[i - 1]
+            place.time = format_time(start)
+            current_end = start + place.duration
+
+        if i < n - 1:
+            place.travelTime = travel_times[i]
+        total_travel_time += place.travelTime or 0
+
+        field = COST_FIELDS.get(place.category, "etc")
+        costs[field] += place.cost
+
+    efficiency = score_efficiency(
+        float(legs.sum()),
+        total_travel_time,
+        ordered_regions,
+        float(dist[order[0], order[-1]]) if n >= 2 else None,
+    ).model_dump()
+    efficiency["routeSolver"] = solver_info
+    if time_windows is not None:
+        efficiency["timeWindows"] = time_windows
+
+    return DaySchedule(day=day.get("day"), date=day.get("date"), places=ordered), efficiency
+
+
+def analyze_trip(schedule: list[dict], has_rentcar: bool) -> TripAnalytics:
+    """LLM 일정 전체 → (일자 재배치) → 최적화된 일정 + 비용 + 효율성
+
+    schedule: 일자 dict 목록 (places는 hydrate_schedule의 SchedulePlace 또는 dict)
+    """
+    store = get_place_store()
+    costs = new_costs()
+
+    days_places = [
+        [_to_schedule_place(p) for p in day.get("places", [])] for day in schedule
+    ]
+    days_regions = [
+        [region_for_place(store, p.placeId, p.latitude, p.longitude) for p in places]
+        for places in days_places
+    ]
+
+    # 모든 장소가 도로 행렬에 있는 여행만 도로 이동 시간으로 최적화
+    use_road = _road_rows(days_places) is not None
+
+    if ROUTE_PARTITION_DAYS and len(schedule) >= 2:
+        days_places, days_regions, routes = _partition_trip(days_places, days_regions, use_road)
+    else:
+        routes = _route_days(days_places, days_regions, ROUTE_PARTITION_DAYS, use_road)
+
+    days: list[DaySchedule] = []
+    efficiencies: list[dict] = []
+
+    for day, places, regions, (order, solver_info, _) in zip(
+        schedule, days_places, days_regions, routes
+    ):
+        day_schedule, efficiency = analyze_day(
+            day, places, regions, order, solver_info, has_rentcar, costs
+        )
+        days.append(day_schedule)
+        efficiencies.append(efficiency)
+
+    return summarize_trip(days, efficiencies, costs)
+
+
+def new_costs() -> dict[str, int]:
+    """CostBreakdown 필드별 비용 누적용 dict"""
+    return dict.fromkeys(("accommodation", "food", "activity", "cafe", "transport", "etc"), 0)
+
+
+def summarize_trip(
+    days: list[DaySchedule], efficiencies: list[dict], costs: dict[str, int]
+) -> TripAnalytics:
+    """일자별 분석 결과 → 여행 전체 결과"""
+    print(format_solver_summary([(d.day, e["routeSolver"]) for d, e in zip(days, efficiencies)]))
+
+    return TripAnalytics(
+        schedule=days,
+        cost_breakdown=CostBreakdown(**costs),
+        route_efficiency=summarize_efficiency(efficiencies),
+    )
+
+
+def analyze_single_day(
+    day: dict, has_rentcar: bool, costs: dict[str, int]
+) -> tuple[DaySchedule, dict]:
+    """하루 일정만으로 최적화 + 분석 (스트리밍 - 다른 일자를 기다리지 않으므로 일자 재배치 없음)"""
+    store = get_place_store()
+    places = [_to_schedule_place(p) for p in day.get("places", [])]
+    regions = [region_for_place(store, p.placeId, p.latitude, p.longitude) for p in places]
+
+    use_road = _road_rows([places]) is not None
+    (order, solver_info, _), = _route_days([places], [regions], ROUTE_PARTITION_DAYS, use_road)
+    return analyze_day(day, places, regions, order, solver_info, has_rentcar, costs)
+
+
+def analyze_trip_task(schedule: list[dict], has_rentcar: bool) -> TripPlan:
+    """일정 1개 분석 (프로세스 풀 작업 단위, 모델은 pickle로 그대로 전달) → TripPlan"""
+    return analyze_trip(schedule, has_rentcar).to_trip_plan()
@@ -0,0 +1,129 @@
+"""
+LLM 일정 하이드레이션
+모델은 장소 ID / 시각 / 체류 시간만 출력하고 나머지(이름, 카테고리, 설명, 비용, 좌표 등)는
+장소 저장소에서 ID로 O(1) 조회해 채움
+
+- 요청에 장소 목록이 직접 들어온 경우 그 목록을 먼저 조회
+- 모르는 ID 수리: 표기 정규화 ("Spot_007" → "spot-7") → 모델이 이름을 같이 준 경우 이름 일치
+- 수리하지 못한 장소는 제외 (좌표까지 모두 들어 있는 이전 형식 장소는 그대로 검증해 사용)
+- 결과 장소는 SchedulePlace 모델 그대로 analyze_trip에 전달 (dict 왕복 없음)
+"""
+
+import re
+
+from pydantic import ValidationError
+
+from models.schemas import Place, SchedulePlace
+from .embedding_cache import normalize_text
+from .place_store import PlaceStore, get_place_store
+from .prompt_engine import get_trip_dates
+
+_ID_PATTERN = re.compile(r"^([a-z]+)[\s_-]*0*(\d+)$")
+# 이전(전체 필드) 응답 형식 장소로 볼 최소 필드
+_FULL_FIELDS = ("name", "category", "latitude", "longitude")
+
+_name_index: tuple[str, dict[str, int]] | None = None
+
+
+def normalize_place_id(place_id: str) -> str:
+    """장소 ID 표기 정규화 ("Spot_007" → "spot-7")"""
+    text = str(place_id).strip().lower()
+    match = _ID_PATTERN.match(text)
+    return f"{match.group(1)}-{match.group(2)}" if match else text
+
+
+def _rows_by_name(store: PlaceStore) -> dict[str, int]:
+    """정규화된 장소명 → 행 번호 (데이터 버전별 1회 구축, 동명 장소는 첫 행)"""
+    global _name_index
+
+    if _name_index is None or _name_index[0] != store.version:
+        index: dict[str, int] = {}
+        for row, name in enumerate(store.name):
+            index.setdefault(normalize_text(name), row)
+        _name_index = (store.version, index)
+
+    return _name_index[1]
+
+
+class PlaceResolver:
+    """LLM 장소 ID → Place (요청 장소 목록 → 장소 저장소 순서)"""
+
+    def __init__(self, extra_places: list[Place] | None = None):
+        self.store = get_place_store()
+        self.extra = {p.id: p for p in extra_places or []}
+        self.repaired = 0
+        self.dropped = 0
+
+    def resolve(self, place_id: str | None, name: str | None = None) -> Place | None:
+        if place_id:
+            place = self.extra.get(place_id) or self.store.get(place_id)
+            if place is not None:
+                return place
+
+            normalized = normalize_place_id(place_id)
+            place = self.extra.get(normalized) or self.store.get(normalized)
+            if place is not None:
+                self.repaired += 1
+                return place
+
+        if name:
+            row = _rows_by_name(self.store).get(normalize_text(name))
+            if row is not None:
+                self.repaired += 1
+                return self.store.place(row)
+
+        return None
+
+
+def hydrate_entry(entry: dict, place: Place) -> SchedulePlace:
+    """LLM 장소 항목 + Place → SchedulePlace (시각/체류 시간은 모델 값 우선)"""
+    return SchedulePlace(
+        time=entry.get("time") or "00:00",
+        placeId=place.id,
+        name=place.name,
+        category=place.category,
+        description=place.description,
+        cost=place.avg_cost,
+        duration=entry.get("duration") or place.avg_time,
+        latitude=place.latitude,
+        longitude=place.longitude,
+        image_url=place.image_url or None,
+        naver_link=place.naver_link or None,
+        waitingInfo=place.waitingInfo,
+    )
+
+
+def hydrate_day(day: dict, resolver: PlaceResolver, date: str | None = None) -> dict:
+    """LLM 일자 1개 하이드레이션 → places가 SchedulePlace 목록인 일자 dict (날짜가 없으면 date로 채움)"""
+    places: list[SchedulePlace] = []
+    for entry in day.get("places", []):
+        if not isinstance(entry, dict):
+            resolver.dropped += 1
+            continue
+
+        place = resolver.resolve(entry.get("placeId"), entry.get("name"))
+        if place is not None:
+            places.append(hydrate_entry(entry, place))
+        elif all(entry.get(field) is not None for field in _FULL_FIELDS):
+            try:
+                places.append(SchedulePlace.model_validate(entry))
+            except ValidationError as e:
+                print(f"장소 형식 오류로 제외: {entry.get('placeId')} ({e.error_count()}건)")
+                resolver.dropped += 1
+        else:
+            print(f"알 수 없는 장소 제외: {entry.get('placeId')}")
+            resolver.dropped += 1
+
+    return {**day, "date": day.get("date") or date or "", "places": places}
+
+
+def hydrate_schedule(
+    schedule: list[dict], extra_places: list[Place] | None = None
+) -> list[dict]:
+    """LLM 일정 전체 하이드레이션"""
+    resolver = PlaceResolver(extra_places)
+    dates = get_trip_dates(len(schedule))
+    days = [hydrate_day(day, resolver, date) for day, date in zip(schedule, dates)]
+    if resolver.repaired or resolver.dropped:
+        print(f"일정 하이드레이션: ID 수리 {resolver.repaired}곳, 제외 {resolver.dropped}곳")
+    return days
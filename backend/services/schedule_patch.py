@@ -0,0 +1,221 @@
+"""
+일정 단일 편집 증분 재최적화
+삽입/삭제/교체/이동 한 번에 대해 영향받는 일자만 다시 계산
+
+- 삽입: 최소 비용 삽입 (a → x → b 추가 비용이 가장 작은 구간, 첫 장소 앞과 마지막 숙소 뒤는 제외)
+- 수리: 편집된 일자만 로컬 서치 (2-opt + Or-opt, 첫 장소 고정, 마지막 숙소 고정)
+- 시간: 방문 순서가 처음 달라진 위치부터만 재계산 (그 앞 장소의 시간은 그대로)
+- 사용자가 위치를 직접 지정한 삽입/이동은 그 위치를 유지 (로컬 서치 생략)
+- 시간 창 배치가 켜져 있으면 재계산 구간의 식사 시간 창/혼잡 대기를 반영 (순서는 유지)
+"""
+
+import numpy as np
+
+from models.schemas import DaySchedule, ScheduleEdit, SchedulePlace
+from .day_partitioner import lodging_index
+from .local_search import optimize_path
+from .place_store import get_place_store
+from .schedule_hydration import hydrate_entry
+from .route_optimizer import (
+    ROUTE_SEARCH_BUDGET_MS,
+    ROUTE_SEARCH_NEIGHBORS,
+    coordinate_distance_matrix,
+    day_cost_matrix,
+    format_time,
+    leg_travel_times,
+    parse_time,
+)
+from .time_windows import MEAL_CATEGORY, ROUTE_TIME_WINDOWS, build_day_windows, meal_windows_used
+
+# 빈 일자에 처음 넣은 장소의 시작 시각
+DEFAULT_DAY_START = "09:00"
+
+
+def hydrate_place(place_id: str) -> SchedulePlace:
+    """장소 ID → 일정 장소 (장소 저장소 기본 비용/소요 시간, 시간은 재계산 시 채움)"""
+    store = get_place_store()
+    row = store.row_of.get(place_id)
+    if row is None:
+        raise ValueError(f"장소를 찾을 수 없습니다: {place_id}")
+
+    return hydrate_entry({}, store.place(row))
+
+
+def _new_place(edit: ScheduleEdit) -> SchedulePlace:
+    if edit.place is not None:
+        return edit.place.model_copy()
+    if edit.placeId:
+        return hydrate_place(edit.placeId)
+    raise ValueError(f"{edit.type} 편집에는 place 또는 placeId가 필요합니다.")
+
+
+def _cost_matrix(places: list[SchedulePlace]) -> np.ndarray:
+    """하루 경로 비용 행렬 (도로 이동시간 행렬이 있으면 분, 아니면 km)"""
+    n = len(places)
+    lat = np.fromiter((p.latitude for p in places), np.float64, n)
+    lng = np.fromiter((p.longitude for p in places), np.float64, n)
+    return day_cost_matrix([p.placeId for p in places], coordinate_distance_matrix(lat, lng))
+
+
+def _ends_at_lodging(places: list[SchedulePlace]) -> bool:
+    return len(places) >= 2 and lodging_index([p.category for p in places]) == len(places) - 1
+
+
+def cheapest_insertion(cost: np.ndarray, n: int, end_fixed: bool) -> int:
+    """행렬의 마지막 장소(인덱스 n)를 기존 n곳 경로에 넣을 위치 (1 ~ n)"""
+    if n == 0:
+        return 0
+
+    a = np.arange(n - 1)
+    deltas = (cost[a, n] + cost[n, a + 1] - cost[a, a + 1]).tolist()
+    if not end_fixed:
+        # 맨 뒤에 붙이기
+        deltas.append(float(cost[n - 1, n]))
+    return int(np.argmin(deltas)) + 1
+
+
+def repair_day(places: list[SchedulePlace]) -> list[SchedulePlace]:
+    """하루 경로 로컬 서치 (첫 장소 고정, 마지막 숙소 고정)"""
+    if len(places) <= 2:
+        return places
+
+    cost = _cost_matrix(places).tolist()
+    end = len(places) - 1 if _ends_at_lodging(places) else None
+    route = list(range(end if end is not None else len(places)))
+    order = optimize_path(
+        cost,
+        route,
+        neighbor_k=ROUTE_SEARCH_NEIGHBORS,
+        time_budget_ms=ROUTE_SEARCH_BUDGET_MS or None,
+        end=end,
+    )
+    if end is not None:
+        order.append(end)
+    return [places[i] for i in order]
+
+
+def insert_place(
+    places: list[SchedulePlace], place: SchedulePlace, index: int | None, repair: bool
+) -> list[SchedulePlace]:
+    """장소 삽입 - index가 없으면 최소 비용 위치 + 로컬 서치"""
+    if index is not None:
+        if not 0 <= index <= len(places):
+            raise ValueError(f"삽입 위치가 범위를 벗어났습니다: {index}")
+        return places[:index] + [place] + places[index:]
+
+    cost = _cost_matrix(places + [place])
+    position = cheapest_insertion(cost, len(places), _ends_at_lodging(places))
+    result = places[:position] + [place] + places[position:]
+    return repair_day(result) if repair else result
+
+
+def retime_day(
+    old: list[SchedulePlace], new: list[SchedulePlace], has_rentcar: bool
+) -> int:
+    """방문 순서가 처음 달라진 위치부터 시간/이동시간 재계산 → 그 위치"""
+    changed = next(
+        (i for i, (a, b) in enumerate(zip(old, new)) if a is not b),
+        min(len(old), len(new)),
+    )
+    if not new:
+        return changed
+    if changed >= len(new):
+        # 뒤쪽 장소만 삭제됨 → 새 마지막 장소의 이동시간만 비움
+        new[-1].travelTime = None
+        return changed
+
+    # 첫 장소가 바뀌면 원래 출발 시간 유지 (빈 일자였으면 기본 시작 시각)
+    if changed == 0:
+        new[0].time = old[0].time if old else DEFAULT_DAY_START
+
+    start = max(changed - 1, 0)
+    tail = new[start:]
+    n = len(tail)
+    lat = np.fromiter((p.latitude for p in tail), np.float64, n)
+    lng = np.fromiter((p.longitude for p in tail), np.float64, n)
+    idx = np.arange(n)
+    legs = coordinate_distance_matrix(lat, lng)[idx[:-1], idx[1:]]
+    travel_times = leg_travel_times([p.placeId for p in tail], legs, has_rentcar).tolist()
+
+    for i in range(n - 1):
+        tail[i].travelTime = travel_times[i]
+    tail[-1].travelTime = None
+
+    if ROUTE_TIME_WINDOWS and n >= 2:
+        # 구간 이동 시간만 채운 행렬로 순서 고정 평가 (앞부분 식사가 쓴 창은 제외)
+        travel = [[0] * n for _ in range(n)]
+        for i, minutes in enumerate(travel_times):
+            travel[i][i + 1] = minutes
+        windows = build_day_windows(tail, travel)
+        if changed == 0:
+            times = windows.evaluate(list(range(n)), parse_time(tail[0].time))
+        else:
+            used = meal_windows_used(
+                [parse_time(p.time) for p in new[:changed] if p.category == MEAL_CATEGORY]
+            )
+            arrival = parse_time(tail[0].time) + tail[0].duration + travel_times[0]
+            times = windows.evaluate(list(range(1, n)), arrival, used)
+        for i, start_minute in zip(times.order, times.starts):
+            tail[i].time = format_time(start_minute)
+        return changed
+
+    current_end = parse_time(tail[0].time) + tail[0].duration
+    for i in range(n - 1):
+        next_start = current_end + travel_times[i]
+        tail[i + 1].time = format_time(next_start)
+        current_end = next_start + tail[i + 1].duration
+
+    return changed
+
+
+def apply_schedule_edit(
+    schedule: list[DaySchedule], edit: ScheduleEdit, has_rentcar: bool
+) -> tuple[list[DaySchedule], dict[int, int]]:
+    """편집 1건 적용 → (새 일정, 바뀐 일자별 재계산 시작 위치)
+
+    바뀌지 않은 일자는 그대로 두고, 잘못된 편집은 ValueError
+    """
+    day_index = {d.day: i for i, d in enumerate(schedule)}
+    if edit.day not in day_index:
+        raise ValueError(f"일자를 찾을 수 없습니다: {edit.day}")
+    target_day = edit.toDay if edit.type == "move" and edit.toDay is not None else edit.day
+    if target_day not in day_index:
+        raise ValueError(f"일자를 찾을 수 없습니다: {target_day}")
+
+    source = schedule[day_index[edit.day]].places
+    if edit.type != "insert" and (edit.index is None or not 0 <= edit.index < len(source)):
+        raise ValueError(f"편집 위치가 범위를 벗어났습니다: {edit.index}")
+
+    new_places: dict[int, list[SchedulePlace]] = {}
+
+    if edit.type == "insert":
+        new_places[edit.day] = insert_place(list(source), _new_place(edit), edit.index, edit.repair)
+
+    elif edit.type == "remove":
+        result = source[: edit.index] + source[edit.index + 1:]
+        new_places[edit.day] = repair_day(result) if edit.repair else result
+
+    elif edit.type == "replace":
+        result = list(source)
+        result[edit.index] = _new_place(edit)
+        new_places[edit.day] = repair_day(result) if edit.repair else result
+
+    else:  # move
+        moved = source[edit.index]
+        remaining = source[: edit.index] + source[edit.index + 1:]
+        if target_day != edit.day:
+            new_places[edit.day] = repair_day(remaining) if edit.repair else remaining
+            target = list(schedule[day_index[target_day]].places)
+        else:
+            target = remaining
+        new_places[target_day] = insert_place(target, moved, edit.toIndex, edit.repair)
+
+    result_schedule = list(schedule)
+    changed_from: dict[int, int] = {}
+    for day, places in new_places.items():
+        i = day_index[day]
+        old = schedule[i].places
+        changed_from[day] = retime_day(old, places, has_rentcar)
+        result_schedule[i] = DaySchedule(day=day, date=schedule[i].date, places=places)
+
+    return result_schedule, changed_from
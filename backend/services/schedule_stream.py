@@ -0,0 +1,100 @@
+"""
+스트리밍 일정 파서
+모델이 생성 중인 JSON 텍스트에서 "schedule" 배열의 일자 객체가 완성될 때마다 꺼냄
+
+- 텍스트 조각을 받은 만큼만 한 번씩 스캔 (문자열/이스케이프/괄호 깊이 상태 유지)
+- "schedule": [ 뒤 배열의 원소 객체가 닫히는 순간 그 구간만 json.loads
+- ```json 코드 블록 등 JSON 앞뒤의 텍스트는 무시
+- 원소는 배열 안 순번과 함께 전달, 파싱에 실패한 순번은 failed에 기록
+  (emitted / failed로 전체 응답 보충 시 빠진 일자만 정확히 골라낼 수 있음)
+"""
+
+import json
+
+
+class ScheduleStreamParser:
+    """JSON 조각 → 완성된 (순번, 일자 dict) 목록"""
+
+    SCHEDULE_KEY = "schedule"
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: str | None = None
+        self._key_pending = False  # "schedule": 까지 읽음
+        self._array_depth: int | None = None  # schedule 배열 안쪽 깊이
+        self._item_start: int | None = None
+        self._item_index = 0  # schedule 배열 안 다음 객체 원소 순번
+        self.finished = False  # schedule 배열이 닫힘
+        self.emitted: set[int] = set()
+        self.failed: list[int] = []
+
+    def feed(self, chunk: str) -> list[tuple[int, dict]]:
+        """텍스트 조각 추가 → 이번에 완성된 (순번, 일자) 목록"""
+        self.text += chunk
+        days: list[tuple[int, dict]] = []
+        text = self.text
+
+        for pos in range(self._pos, len(text)):
+            c = text[pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start + 1:pos]
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = pos
+                self._key_pending = False
+            elif c == ":":
+                self._key_pending = self._last_string == self.SCHEDULE_KEY and not self.finished
+            elif c in "{[":
+                self._depth += 1
+                if c == "[" and self._key_pending and self._array_depth is None:
+                    self._array_depth = self._depth
+                elif c == "{" and self._array_depth is not None and self._depth == self._array_depth + 1:
+                    self._item_start = pos
+                self._key_pending = False
+            elif c in "}]":
+                if (
+                    c == "}"
+                    and self._item_start is not None
+                    and self._depth == self._array_depth + 1
+                ):
+                    index = self._item_index
+                    self._item_index += 1
+                    day = self._parse_item(text[self._item_start:pos + 1])
+                    if day is not None:
+                        days.append((index, day))
+                        self.emitted.add(index)
+                    else:
+                        self.failed.append(index)
+                    self._item_start = None
+                elif c == "]" and self._array_depth is not None and self._depth == self._array_depth:
+                    self._array_depth = None
+                    self.finished = True
+                self._depth -= 1
+            elif not c.isspace():
+                self._key_pending = False
+
+        self._pos = len(text)
+        return days
+
+    @staticmethod
+    def _parse_item(raw: str) -> dict | None:
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError as e:
+            print(f"스트리밍 일자 파싱 오류: {e}")
+            return None
+        return item if isinstance(item, dict) else None
@@ -0,0 +1,143 @@
+"""
+공간 인덱스 (격자 버킷)
+장소 좌표를 평면(km)으로 투영한 뒤 고정 크기 격자에 배치
+
+- 반경 검색: 반경을 덮는 격자 셀 후보만 Haversine으로 정밀 계산
+- kNN 검색: 가까운 링부터 확장하며 k번째 거리보다 먼 링이 나오면 종료
+"""
+
+import math
+
+import numpy as np
+
+from .jeju_regions import haversine_distances
+
+# 투영 기준점 (제주도 중심) - 위도 1도 ≈ 111.32km
+ORIGIN_LAT = 33.38
+ORIGIN_LNG = 126.55
+KM_PER_DEG_LAT = 111.32
+KM_PER_DEG_LNG = KM_PER_DEG_LAT * math.cos(math.radians(ORIGIN_LAT))
+
+
+def project(lat, lng) -> tuple[np.ndarray, np.ndarray]:
+    """위경도 → 평면 좌표 (km, 등장방형 투영)"""
+    x = (np.asarray(lng) - ORIGIN_LNG) * KM_PER_DEG_LNG
+    y = (np.asarray(lat) - ORIGIN_LAT) * KM_PER_DEG_LAT
+    return x, y
+
+
+class SpatialGrid:
+    """격자 버킷 공간 인덱스 (행 번호 기준)"""
+
+    def __init__(self, latitude: np.ndarray, longitude: np.ndarray, cell_km: float = 1.0):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.cell_km = cell_km
+
+        x, y = project(latitude, longitude)
+        cx = np.floor(x / cell_km).astype(np.int64)
+        cy = np.floor(y / cell_km).astype(np.int64)
+
+        # 셀 키로 정렬한 행 배열 + 셀별 구간 (CSR 형태)
+        self.min_cx, self.min_cy = (int(cx.min()), int(cy.min())) if len(cx) else (0, 0)
+        self.width = int(cx.max()) - self.min_cx + 1 if len(cx) else 1
+        self.height = int(cy.max()) - self.min_cy + 1 if len(cy) else 1
+
+        cell_ids = (cy - self.min_cy) * self.width + (cx - self.min_cx)
+        order = np.argsort(cell_ids, kind="stable")
+        self.rows = order.astype(np.int32)
+        counts = np.bincount(cell_ids, minlength=self.width * self.height)
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    def _cell_of(self, lat: float, lng: float) -> tuple[int, int]:
+        x, y = project(lat, lng)
+        return (
+            int(math.floor(float(x) / self.cell_km)) - self.min_cx,
+            int(math.floor(float(y) / self.cell_km)) - self.min_cy,
+        )
+
+    def _rows_in_box(self, cx0: int, cx1: int, cy0: int, cy1: int) -> np.ndarray:
+        """격자 사각형 범위(포함) 안의 행 번호"""
+        cx0, cx1 = max(cx0, 0), min(cx1, self.width - 1)
+        cy0, cy1 = max(cy0, 0), min(cy1, self.height - 1)
+        if cx0 > cx1 or cy0 > cy1:
+            return np.empty(0, dtype=np.int32)
+
+        chunks = []
+        for cy in range(cy0, cy1 + 1):
+            # 같은 행(cy)의 셀들은 연속 구간
+            start = self.offsets[cy * self.width + cx0]
+            end = self.offsets[cy * self.width + cx1 + 1]
+            if end > start:
+                chunks.append(self.rows[start:end])
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int32)
+
+    def _distances(self, lat: float, lng: float, rows: np.ndarray) -> np.ndarray:
+        return haversine_distances(lat, lng, self.latitude[rows], self.longitude[rows])
+
+    def within_radius(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        mask: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """반경 내 (행 번호, 거리) - 거리 오름차순"""
+        cx, cy = self._cell_of(lat, lng)
+        # 투영 오차 여유로 1셀 더 확장
+        reach = int(math.ceil(radius_km / self.cell_km)) + 1
+        rows = self._rows_in_box(cx - reach, cx + reach, cy - reach, cy + reach)
+        if mask is not None:
+            rows = rows[mask[rows]]
+
+        dist = self._distances(lat, lng, rows)
+        inside = dist <= radius_km
+        rows, dist = rows[inside], dist[inside]
+        order = np.argsort(dist, kind="stable")
+        return rows[order], dist[order]
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int,
+        mask: np.ndarray | None = None,
+        max_radius_km: float | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """가까운 순 k개 (행 번호, 거리)"""
+        if k <= 0:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+
+        cx, cy = self._cell_of(lat, lng)
+        # 가장 먼 셀까지 덮는 링에서 종료 (이 링이면 격자 전체)
+        max_ring = max(abs(cx), abs(cx - (self.width - 1)), abs(cy), abs(cy - (self.height - 1)))
+        # 격자 밖 기준점은 링 경계 추정(투영 오차)이 맞지 않으므로 전체 후보를 바로 계산
+        outside = cx < 0 or cy < 0 or cx >= self.width or cy >= self.height
+        ring = max_ring if outside else 0
+
+        while True:
+            rows = self._rows_in_box(cx - ring, cx + ring, cy - ring, cy + ring)
+            if mask is not None:
+                rows = rows[mask[rows]]
+
+            if len(rows) >= k or ring >= max_ring:
+                found_dist = self._distances(lat, lng, rows)
+                found_rows = rows
+                if len(rows) < k or ring >= max_ring:
+                    break
+                # ring 셀 밖의 점은 최소 ring*cell_km만큼 떨어져 있음
+                # (투영 오차 여유로 1셀 빼고 비교)
+                kth = np.partition(found_dist, k - 1)[k - 1]
+                if kth <= (ring - 1) * self.cell_km:
+                    break
+                # k번째 거리를 덮도록 한 번에 확장
+                ring = min(max_ring, max(ring + 1, int(math.ceil(kth / self.cell_km)) + 1))
+                continue
+            ring += 1
+
+        order = np.argsort(found_dist, kind="stable")[:k]
+        rows, dist = found_rows[order], found_dist[order]
+        if max_radius_km is not None:
+            inside = dist <= max_radius_km
+            rows, dist = rows[inside], dist[inside]
+        return rows, dist
@@ -0,0 +1,11 @@
+"""
+Server-Sent Events 응답 포맷
+스트리밍 엔드포인트(/api/generate/stream, /api/chat/stream) 공용
+"""
+
+import json
+
+
+def sse_event(event: str, data) -> str:
+    """Server-Sent Event 한 건"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
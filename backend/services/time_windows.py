@@ -0,0 +1,277 @@
+"""
+시간 창 기반 일정 배치 (VRPTW 스타일)
+동선 최적화가 정한 방문 순서를 식사 시간 창과 혼잡 시간(peakHours)에 맞게 조정
+
+- 혼잡 시간: 장소별 peakHours를 10분 슬롯 비트맵(int)으로 한 번만 변환
+  → 도착 시각의 혼잡 여부 / 혼잡이 끝나는 시각을 비트 연산으로 O(1) 조회
+- 혼잡 대기: 줄 서기(avgWaitTime)와 혼잡이 끝날 때까지 기다리기 중 짧은 쪽
+- 식사 시간 창: 맛집은 아침/점심/저녁 창 중 아직 쓰지 않은 창 가운데 도착 시각과 가장 가까운 창에 배정
+  (창이 열리기 전 도착 → 대기, 창이 닫힌 뒤 도착 → 그 창의 지각)
+- 순서 조정: 장소 1곳을 다른 위치로 옮기는 이동을 반복 (첫 장소·마지막 숙소 고정)
+  후보 위치는 도착 시각 / 최대 허용 도착 시각(역방향 계산)으로 O(1) 사전 판정 후 평가
+- 비용: 하루 종료 시각 - 시작 시각 (이동 + 대기 + 체류) + 지각 분 × LATE_PENALTY
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .place_store import PlaceStore, get_place_store
+
+# 식사 시간 창 + 혼잡 시간 기반 순서/시각 조정 (false면 체류 + 이동 시간 단순 연결)
+ROUTE_TIME_WINDOWS = os.getenv("ROUTE_TIME_WINDOWS", "true").lower() == "true"
+
+SLOT_MINUTES = 10
+MEAL_CATEGORY = "맛집"
+# 식사 시간 창 (도착 기준, 분) - 아침 / 점심 / 저녁 (prompt_engine 배치 가이드와 동일한 점심·저녁)
+MEAL_WINDOWS: tuple[tuple[int, int], ...] = (
+    (8 * 60, 10 * 60),
+    (12 * 60, 13 * 60 + 30),
+    (18 * 60, 20 * 60),
+)
+LAST_MEAL_CLOSE = max(close_at for _, close_at in MEAL_WINDOWS)
+# 식사 시간 창 지각 1분당 비용 (분 단위)
+LATE_PENALTY = 100
+# 순서 변경 채택 최소 개선 (분)
+MIN_IMPROVEMENT = 1
+SEQUENCE_MAX_PASSES = 20
+
+INF = float("inf")
+
+
+def _parse_clock(text: str) -> int:
+    hours, minutes = text.strip().split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+@lru_cache(maxsize=256)
+def peak_bitmap(peak_hours: tuple[str, ...]) -> int:
+    """["12:00-13:30", ...] → 혼잡 슬롯 비트맵 (bit k = k번째 10분 슬롯)"""
+    bits = 0
+    for interval in peak_hours:
+        try:
+            start, end = (_parse_clock(t) for t in interval.split("-"))
+        except ValueError:
+            continue
+        for slot in range(start // SLOT_MINUTES, -(-end // SLOT_MINUTES)):
+            bits |= 1 << slot
+    return bits
+
+
+def peak_delay(bits: int, avg_wait: int, minute: int) -> int:
+    """minute에 도착했을 때 혼잡 대기 (분) - 줄 서기와 혼잡이 끝날 때까지 기다리기 중 짧은 쪽"""
+    slot = minute // SLOT_MINUTES
+    run = bits >> slot
+    if not run & 1:
+        return 0
+    # 도착 슬롯부터 연속된 혼잡 슬롯 수
+    busy_slots = ((~run) & (run + 1)).bit_length() - 1
+    return min(avg_wait, (slot + busy_slots) * SLOT_MINUTES - minute)
+
+
+class PeakTable:
+    """장소 저장소 전체 혼잡 비트맵 (행 번호 기준)"""
+
+    def __init__(self, store: PlaceStore):
+        self.store = store
+        self.bits: list[int] = []
+        self.avg_wait: list[int] = []
+        for info in store.waiting_info:
+            info = info or {}
+            self.bits.append(peak_bitmap(tuple(info.get("peakHours") or ())))
+            self.avg_wait.append(int(info.get("avgWaitTime") or 0))
+
+    def lookup(self, place_id: str | None, waiting_info=None) -> tuple[int, int]:
+        """장소 → (혼잡 비트맵, 평균 대기 분) - 저장소에 없으면 일정의 waitingInfo 사용"""
+        row = self.store.row_of.get(place_id)
+        if row is not None:
+            return self.bits[row], self.avg_wait[row]
+        if waiting_info is None:
+            return 0, 0
+        if isinstance(waiting_info, dict):
+            return (
+                peak_bitmap(tuple(waiting_info.get("peakHours") or ())),
+                int(waiting_info.get("avgWaitTime") or 0),
+            )
+        return peak_bitmap(tuple(waiting_info.peakHours)), waiting_info.avgWaitTime
+
+
+_peak_table: PeakTable | None = None
+_peak_table_lock = threading.Lock()
+
+
+def get_peak_table() -> PeakTable:
+    """혼잡 비트맵 싱글톤"""
+    global _peak_table
+
+    with _peak_table_lock:
+        if _peak_table is None:
+            _peak_table = PeakTable(get_place_store())
+
+    return _peak_table
+
+
+def nearest_meal_window(minute: int, used: int) -> int:
+    """도착 시각 → 미사용 식사 창 중 가장 가까운 창 (모두 사용했으면 -1)
+
+    거리: 열리기 전이면 대기 분, 닫힌 뒤면 지각 분 (같으면 지각이 없는 창)
+    """
+    best, best_key = -1, None
+    for w, (open_at, close_at) in enumerate(MEAL_WINDOWS):
+        if used >> w & 1:
+            continue
+        late = max(0, minute - close_at)
+        key = (max(0, open_at - minute) + late, late)
+        if best_key is None or key < best_key:
+            best, best_key = w, key
+    return best
+
+
+def meal_windows_used(meal_starts: list[int]) -> int:
+    """이미 배치된 식사 시작 시각들 → 사용한 식사 창 비트마스크 (DayWindows와 같은 규칙)"""
+    used = 0
+    for minute in meal_starts:
+        window = nearest_meal_window(minute, used)
+        if window < 0:
+            break
+        used |= 1 << window
+    return used
+
+
+@dataclass
+class DayTimes:
+    order: list[int]
+    arrivals: list[int]
+    starts: list[int]  # 대기 후 실제 시작 시각
+    wait_minutes: int
+    late_minutes: int
+    end: int  # 마지막 장소 종료 시각
+    cost: float
+
+
+class DayWindows:
+    """하루 장소들의 시간 창 / 혼잡 / 이동 시간 (인덱스 기준)"""
+
+    def __init__(
+        self,
+        categories: list[str],
+        durations: list[int],
+        peaks: list[tuple[int, int]],
+        travel: list[list[int]],
+    ):
+        self.is_meal = [c == MEAL_CATEGORY for c in categories]
+        self.duration = durations
+        self.peak_bits = [p[0] for p in peaks]
+        self.avg_wait = [p[1] for p in peaks]
+        self.travel = travel
+
+    def _begin(self, i: int, arrival: int, used: int) -> tuple[int, int, int]:
+        """도착 → (시작 시각, 지각 분, 사용 식사 창)"""
+        late = 0
+        begin = arrival
+        if self.is_meal[i]:
+            # 가장 가까운 미사용 창 (모두 사용했으면 제약 없음)
+            window = nearest_meal_window(arrival, used)
+            if window >= 0:
+                open_at, close_at = MEAL_WINDOWS[window]
+                begin = max(arrival, open_at)
+                late = max(0, arrival - close_at)
+                used |= 1 << window
+        begin += peak_delay(self.peak_bits[i], self.avg_wait[i], begin)
+        return begin, late, used
+
+    def evaluate(self, order: list[int], start: int, used: int = 0) -> DayTimes:
+        """방문 순서 + 첫 장소 도착 시각 → 시각 계산 (O(n))"""
+        arrivals, starts = [], []
+        wait = late = 0
+        t = start
+        for k, i in enumerate(order):
+            if k > 0:
+                t += self.travel[order[k - 1]][i]
+            begin, late_i, used = self._begin(i, t, used)
+            arrivals.append(t)
+            starts.append(begin)
+            wait += begin - t
+            late += late_i
+            t = begin + self.duration[i]
+        return DayTimes(
+            order=list(order),
+            arrivals=arrivals,
+            starts=starts,
+            wait_minutes=wait,
+            late_minutes=late,
+            end=t,
+            cost=(t - start) + LATE_PENALTY * late,
+        )
+
+    def _latest_arrivals(self, times: DayTimes) -> list[float]:
+        """각 위치의 최대 허용 도착 시각 (식사 창 닫힘 기준, 역방향 계산)
+
+        시작 ≥ 도착이므로 다음 장소의 허용 시각에서 이동/체류 시간을 뺀 값이 상한
+        (혼잡 대기는 무시한 필요조건 - 사전 판정용)
+        """
+        n = len(times.order)
+        latest = [INF] * n
+        for k in range(n - 1, -1, -1):
+            i = times.order[k]
+            bound = INF
+            if self.is_meal[i]:
+                bound = min((c for _, c in MEAL_WINDOWS if c >= times.arrivals[k]), default=INF)
+            if k < n - 1:
+                j = times.order[k + 1]
+                bound = min(bound, latest[k + 1] - self.travel[i][j] - self.duration[i])
+            latest[k] = bound
+        return latest
+
+    def sequence(self, order: list[int], start: int, fixed_end: bool = False) -> DayTimes:
+        """첫 장소(와 마지막 숙소) 고정, 장소 1곳 이동을 반복해 비용 최소화"""
+        best = self.evaluate(order, start)
+        n = len(order)
+        last_movable = n - 2 if fixed_end else n - 1
+        if last_movable < 1 or n < 3:
+            return best
+
+        for _ in range(SEQUENCE_MAX_PASSES):
+            improved = False
+            for k in range(1, last_movable + 1):
+                x = best.order[k]
+                rest = best.order[:k] + best.order[k + 1:]
+                rest_times = self.evaluate(rest, start)
+                latest = self._latest_arrivals(rest_times)
+                depart = [s + self.duration[i] for s, i in zip(rest_times.starts, rest)]
+
+                # 삽입 위치 j: rest[j - 1]과 rest[j] 사이 (fixed_end면 마지막 숙소 앞까지)
+                for j in range(1, (len(rest) if fixed_end else len(rest) + 1)):
+                    if j == k:
+                        continue
+                    # O(1) 사전 판정: 새 장소 도착 → 다음 장소 도착 하한이 허용 시각을 넘으면 제외
+                    arrival_x = depart[j - 1] + self.travel[rest[j - 1]][x]
+                    if not best.late_minutes:
+                        if self.is_meal[x] and arrival_x > LAST_MEAL_CLOSE:
+                            continue
+                        if j < len(rest):
+                            next_arrival = arrival_x + self.duration[x] + self.travel[x][rest[j]]
+                            if next_arrival > latest[j]:
+                                continue
+
+                    candidate = self.evaluate(rest[:j] + [x] + rest[j:], start)
+                    if candidate.cost < best.cost - MIN_IMPROVEMENT:
+                        best = candidate
+                        improved = True
+                        break
+            if not improved:
+                break
+
+        return best
+
+
+def build_day_windows(places: list, travel: list[list[int]]) -> DayWindows:
+    """일정 장소(SchedulePlace) 목록 + 이동 시간 행렬(분) → DayWindows"""
+    table = get_peak_table()
+    return DayWindows(
+        categories=[p.category for p in places],
+        durations=[p.duration for p in places],
+        peaks=[table.lookup(p.placeId, p.waitingInfo) for p in places],
+        travel=travel,
+    )
@@ -0,0 +1,145 @@
+"""
+CPU 작업용 공유 프로세스 풀
+동선 최적화처럼 GIL을 잡는 순수 파이썬 계산을 여러 코어로 분산
+
+- 풀은 앱 시작 시 생성 (start_process_pool), 그 전에 쓰이면 처음 사용할 때 생성 (싱글톤)
+- 작업 프로세스는 forkserver로 시작 (멀티스레드 서버 프로세스를 fork하면 다른 스레드가
+  잡고 있던 락(SQLite 캐시, 인덱스, httpx 등)을 물려받아 교착될 수 있음)
+- 작업 수가 적으면 프로세스 간 전달 비용이 더 크므로 현재 프로세스에서 실행
+  (하루 경로 최적화는 작업당 0.2~1ms, 풀 전달 비용은 작업당 약 0.3ms + 호출당 1ms 내외)
+- 풀이 깨지면(BrokenProcessPool) 재생성하고 이번 호출은 현재 프로세스에서 실행
+- 작업 프로세스는 시작 시 장소 저장소/도로 행렬을 한 번 로드해 모든 작업이 공유
+  (도로 행렬은 mmap이라 프로세스 간 페이지 캐시 공유)
+- 작업 프로세스 안에서는 풀을 다시 만들지 않고 현재 프로세스에서 실행
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+ROUTE_POOL_ENABLED = os.getenv("ROUTE_POOL", "true").lower() == "true"
+ROUTE_POOL_WORKERS = int(os.getenv("ROUTE_POOL_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+# 이보다 작업 수가 적으면 풀을 쓰지 않음 (일자별 경로 최적화 기준 측정값)
+ROUTE_POOL_MIN_TASKS = int(os.getenv("ROUTE_POOL_MIN_TASKS", "32"))
+# 작업 프로세스 시작 방식 (forkserver | spawn)
+ROUTE_POOL_START_METHOD = os.getenv("ROUTE_POOL_START_METHOD", "forkserver")
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+# 작업 프로세스 여부 (중첩 풀 방지)
+_in_worker = False
+
+
+def _init_worker() -> None:
+    """작업 프로세스 초기화 - 읽기 전용 데이터 미리 로드"""
+    global _in_worker
+    _in_worker = True
+
+    from .place_store import get_place_store
+    from .road_network import get_road_times
+
+    get_place_store()
+    get_road_times()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """프로세스 풀 싱글톤"""
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=ROUTE_POOL_WORKERS,
+                mp_context=multiprocessing.get_context(ROUTE_POOL_START_METHOD),
+                initializer=_init_worker,
+            )
+            print(f"프로세스 풀 시작: {ROUTE_POOL_WORKERS} workers ({ROUTE_POOL_START_METHOD})")
+
+    return _pool
+
+
+def _ping() -> None:
+    pass
+
+
+def start_process_pool() -> None:
+    """앱 시작 시 풀 생성 + 작업 프로세스 미리 띄우기 (첫 요청이 시작 비용을 내지 않도록)"""
+    if not ROUTE_POOL_ENABLED or ROUTE_POOL_WORKERS <= 1:
+        return
+
+    pool = get_process_pool()
+    for future in [pool.submit(_ping) for _ in range(ROUTE_POOL_WORKERS)]:
+        future.result()
+
+
+def shutdown_process_pool() -> None:
+    """프로세스 풀 종료 (앱 종료 시)"""
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def map_tasks(fn: Callable[..., Any], tasks: list[tuple]) -> list[Any]:
+    """tasks의 각 인자 튜플로 fn 실행 → 결과 목록 (순서 유지)
+
+    fn과 인자는 pickle 가능해야 함 (모듈 최상위 함수)
+    """
+    if (
+        not ROUTE_POOL_ENABLED
+        or _in_worker
+        or ROUTE_POOL_WORKERS <= 1
+        or len(tasks) < ROUTE_POOL_MIN_TASKS
+    ):
+        return [fn(*args) for args in tasks]
+
+    try:
+        pool = get_process_pool()
+        return list(pool.map(fn, *zip(*tasks)))
+    except BrokenProcessPool as e:
+        print(f"프로세스 풀 오류, 현재 프로세스에서 실행: {e}")
+        shutdown_process_pool()
+        return [fn(*args) for args in tasks]
+
+
+async def run_tasks_async(fn: Callable[..., Any], tasks: list[tuple]) -> list[Any]:
+    """map_tasks의 비동기 버전 - 이벤트 루프를 막지 않음
+
+    풀이 있으면 작업마다 프로세스 풀에 제출, 없으면 스레드에서 실행
+    작업별 예외는 결과 목록에 그대로 담아 반환 (한 작업 실패가 나머지를 막지 않음)
+    """
+    if not ROUTE_POOL_ENABLED or ROUTE_POOL_WORKERS <= 1:
+        return await asyncio.to_thread(_run_inline, fn, tasks)
+
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    results = await asyncio.gather(
+        *[loop.run_in_executor(pool, fn, *args) for args in tasks],
+        return_exceptions=True,
+    )
+
+    broken = [i for i, r in enumerate(results) if isinstance(r, BrokenProcessPool)]
+    if broken:
+        print(f"프로세스 풀 오류, 현재 프로세스에서 실행: {results[broken[0]]}")
+        shutdown_process_pool()
+        retried = await asyncio.to_thread(_run_inline, fn, [tasks[i] for i in broken])
+        for i, result in zip(broken, retried):
+            results[i] = result
+
+    return results
+
+
+def _run_inline(fn: Callable[..., Any], tasks: list[tuple]) -> list[Any]:
+    results = []
+    for args in tasks:
+        try:
+            results.append(fn(*args))
+        except Exception as e:
+            results.append(e)
+    return results
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# backend 디렉토리를 import 경로에 추가 (services, models 패키지)
+sys.path.insert(0, str(Path(__file__).parent.parent))
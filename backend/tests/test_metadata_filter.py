@@ -0,0 +1,148 @@
+"""
+build_filter_mask ↔ Pinecone 필터 동치성 테스트
+같은 SearchFilter를 build_pinecone_filter → LocalVectorIndex._filter_mask(벡터 단위)로
+평가한 결과를 장소 행으로 모은 것과 build_filter_mask(장소 행 단위)가 같아야 함
+
+- places: 내보낸 인덱스 파일(LOCAL_INDEX_PATH)의 메타데이터 기준 (파일이 없으면 건너뜀)
+- edge: 경계값 위주의 작은 저장소 + 저장소 값으로 만든 인덱스
+"""
+
+import numpy as np
+import pytest
+
+from models.schemas import SearchFilter
+from services.local_index import LOCAL_INDEX_PATH, LocalVectorIndex
+from services.metadata_filter import build_filter_mask
+from services.place_store import CATEGORIES, REGIONS, PlaceStore, get_place_store
+from services.rag_search import build_pinecone_filter
+
+VECTOR_TYPES = ("base", "vibe")
+
+
+def _edge_store() -> PlaceStore:
+    """경계값(비용/평점이 임계값과 같음, 0) 위주의 작은 저장소"""
+    records = [
+        {"id": "spot-1", "name": "a", "category": "관광지", "latitude": 33.50, "longitude": 126.50, "avg_cost": 10000, "rating": 4.5},
+        {"id": "food-1", "name": "b", "category": "맛집", "latitude": 33.45, "longitude": 126.30, "avg_cost": 0, "rating": 0.0},
+        {"id": "cafe-1", "name": "c", "category": "카페", "latitude": 33.45, "longitude": 126.90, "avg_cost": 10001, "rating": 4.4},
+        {"id": "stay-1", "name": "d", "category": "숙소", "latitude": 33.25, "longitude": 126.55, "avg_cost": 9999, "rating": 5.0},
+        {"id": "spot-2", "name": "e", "category": "관광지", "latitude": 33.36, "longitude": 126.55, "avg_cost": 10000, "rating": 4.5},
+    ]
+    return PlaceStore(records, version="edge")
+
+
+def _index_for(store: PlaceStore) -> LocalVectorIndex:
+    """장소마다 벡터 여러 개(vectorType별)를 가진 로컬 인덱스 - 메타데이터는 저장소 값"""
+    rows = np.repeat(np.arange(store.size), len(VECTOR_TYPES))
+    columns = {
+        "placeId": np.array([store.ids[r] for r in rows]),
+        "vectorType": np.array([VECTOR_TYPES[i % len(VECTOR_TYPES)] for i in range(len(rows))]),
+        "category": np.array([store.category_of(r) for r in rows]),
+        "region": np.array([store.region_of(r) for r in rows]),
+        "cost": store.avg_cost[rows].astype(np.float64),
+        "rating": store.rating[rows],
+    }
+    ids = np.array([f"{pid}#{vt}" for pid, vt in zip(columns["placeId"], columns["vectorType"])])
+    return LocalVectorIndex(ids=ids, vectors=np.ones((len(rows), 4)), columns=columns)
+
+
+def _exported_index() -> LocalVectorIndex:
+    if not LOCAL_INDEX_PATH.exists():
+        pytest.skip(f"내보낸 인덱스 파일 없음: {LOCAL_INDEX_PATH}")
+    return LocalVectorIndex.load(LOCAL_INDEX_PATH)
+
+
+def _pinecone_rows(index: LocalVectorIndex, store: PlaceStore, filter: SearchFilter) -> np.ndarray | None:
+    """Pinecone 필터 평가 결과 → 장소 행 mask (벡터 하나라도 매칭되면 매칭)"""
+    vector_mask = index._filter_mask(build_pinecone_filter(filter))
+    if vector_mask is None:
+        return None
+    place_rows = index.store_rows(store)
+    rows = np.zeros(store.size, dtype=bool)
+    rows[place_rows[vector_mask & (place_rows >= 0)]] = True
+    return rows
+
+
+FILTERS = [
+    # 단일 조건
+    *[SearchFilter(category=c) for c in CATEGORIES],
+    SearchFilter(categories=["카페", "맛집"]),
+    *[SearchFilter(region=r) for r in REGIONS],
+    SearchFilter(regions=["제주시", "서귀포"]),
+    SearchFilter(maxCost=10000),
+    SearchFilter(maxCost=20000),
+    SearchFilter(minRating=4.5),
+    SearchFilter(minRating=4.0),
+    SearchFilter(styles=["힐링"]),
+    # 조합
+    SearchFilter(category="카페", region="제주시"),
+    SearchFilter(category="관광지", categories=["관광지", "맛집"]),
+    SearchFilter(category="관광지", categories=["맛집"]),
+    SearchFilter(region="서부", regions=["서부", "동부"], maxCost=15000),
+    SearchFilter(categories=["맛집", "카페"], regions=["동부"], minRating=4.2),
+    SearchFilter(category="맛집", maxCost=10000, minRating=4.5, styles=["가성비"]),
+    # 빈 값 / 없는 값
+    SearchFilter(),
+    SearchFilter(category="", categories=[], region="", regions=[], styles=[]),
+    SearchFilter(maxCost=0, minRating=0),
+    SearchFilter(category="없는카테고리"),
+    SearchFilter(categories=["없는카테고리"]),
+    SearchFilter(categories=["없는카테고리", "카페"]),
+    SearchFilter(region="없는지역"),
+    SearchFilter(regions=["없는지역"]),
+    SearchFilter(category="없는카테고리", maxCost=10000),
+]
+
+
+@pytest.fixture(scope="module", params=["places", "edge"])
+def store_and_index(request):
+    if request.param == "places":
+        return get_place_store(), _exported_index()
+    store = _edge_store()
+    return store, _index_for(store)
+
+
+@pytest.mark.parametrize("filter", FILTERS, ids=lambda f: repr(f.model_dump(exclude_none=True)))
+def test_filter_mask_matches_pinecone_filter(store_and_index, filter):
+    store, index = store_and_index
+    expected = _pinecone_rows(index, store, filter)
+    actual = build_filter_mask(filter, store)
+
+    if expected is None:
+        assert actual is None
+    else:
+        assert actual is not None
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_none_filter():
+    assert build_filter_mask(None, get_place_store()) is None
+
+
+def test_edge_thresholds_are_inclusive():
+    store = _edge_store()
+    cost = build_filter_mask(SearchFilter(maxCost=10000), store)
+    rating = build_filter_mask(SearchFilter(minRating=4.5), store)
+    assert [store.ids[r] for r in np.flatnonzero(cost)] == ["spot-1", "food-1", "stay-1", "spot-2"]
+    assert [store.ids[r] for r in np.flatnonzero(rating)] == ["spot-1", "stay-1", "spot-2"]
+
+
+def test_bind_store_falls_back_to_index_metadata_on_mismatch():
+    store = _edge_store()
+    index = _index_for(store)
+    assert index.bind_store(store)
+
+    # 인덱스에는 spot-1이 서부로 기록된 경우 → 저장소 mask 대신 인덱스 메타데이터로 필터링
+    index.columns["region"] = np.where(index.columns["placeId"] == "spot-1", "서부", index.columns["region"])
+    assert not index.bind_store(store)
+    assert index.place_rows is None
+
+    filter = SearchFilter(region="서부")
+    result = index.query(
+        [1.0, 1.0, 1.0, 1.0],
+        top_k=20,
+        filter=build_pinecone_filter(filter),
+        place_mask=build_filter_mask(filter, store),
+    )
+    assert "spot-1" in {m.metadata["placeId"] for m in result.matches}
+    assert all(m.metadata["region"] == "서부" for m in result.matches)
@@ -0,0 +1,30 @@
+from services.time_windows import DayWindows, meal_windows_used
+
+TRAVEL = [[0 if i == j else 15 for j in range(4)] for i in range(4)]
+
+
+def _windows(categories, durations):
+    return DayWindows(categories, durations, [(0, 0)] * len(categories), TRAVEL)
+
+
+def test_meal_after_lunch_close_is_late_lunch():
+    times = _windows(["관광지", "맛집", "카페"], [280, 60, 60]).sequence([0, 1, 2], 540)
+    # 13:55 도착 → 저녁(18:00)까지 기다리지 않고 점심 25분 지각
+    assert times.starts[1] == 13 * 60 + 55
+    assert times.late_minutes == 25
+    assert times.wait_minutes == 0
+
+
+def test_second_meal_takes_dinner():
+    times = _windows(["관광지", "맛집", "카페", "맛집"], [280, 60, 60, 60]).sequence(
+        [0, 1, 2, 3], 540
+    )
+    assert times.late_minutes == 25
+    assert times.starts[times.order.index(3)] == 18 * 60
+
+
+def test_meal_windows_used_matches_begin_rule():
+    # 점심 지각 / 저녁 대기 후 시작 → 점심 + 저녁 창
+    assert meal_windows_used([13 * 60 + 55, 18 * 60]) == 0b110
+    # 11:00은 아침 지각보다 점심 대기를 택함
+    assert meal_windows_used([11 * 60]) == 0b010